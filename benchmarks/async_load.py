@@ -0,0 +1,214 @@
+"""Teste de carga do `AsyncMusicController` atrás de um servidor HTTP local.
+
+O servidor é um substituto mínimo de um serviço web (POST com o texto no
+corpo, resposta com o arquivo MIDI) escrito só com `asyncio`. Os clientes
+disparam requisições concorrentes e o relatório traz requisições/s e as
+latências p50/p99.
+
+Uso:
+    PYTHONPATH=src python -m benchmarks.async_load --requests 200 --clients 16
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+from application.async_controller import (
+    DEFAULT_MAX_CONCURRENT_JOBS,
+    AsyncMusicController,
+    ExecutorKind,
+)
+from benchmarks.corpora import CorpusKind, corpus_mode, generate, parse_size
+from domain.models import PlaybackSettings
+
+DEFAULT_REQUESTS: Final[int] = 200
+DEFAULT_CLIENTS: Final[int] = 16
+DEFAULT_SIZE: Final[str] = '4K'
+HOST: Final[str] = '127.0.0.1'
+
+
+class StandInServer:
+    """Servidor HTTP/1.1 mínimo: `POST /<corpus>` devolve o MIDI do corpo."""
+
+    def __init__(self, controller: AsyncMusicController) -> None:
+        self.controller: AsyncMusicController = controller
+        self.settings: PlaybackSettings = PlaybackSettings()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while request := await self._read_request(reader):
+                mode, body = request
+                midi = await self.controller.export_to_bytes(
+                    body.decode('utf-8'), self.settings, corpus_mode(mode)
+                )
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\n'
+                    b'Content-Type: audio/midi\r\n'
+                    b'Content-Length: %d\r\n\r\n' % len(midi)
+                )
+                writer.write(midi)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[CorpusKind, bytes] | None:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+
+        request_line, *header_lines = head.decode('latin-1').split('\r\n')
+        _method, target, _version = request_line.split(' ', 2)
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (line.partition(':') for line in header_lines)
+            if name
+        }
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+        return CorpusKind(target.lstrip('/')), body
+
+
+async def _client(
+    port: int,
+    kind: CorpusKind,
+    body: bytes,
+    request_count: int,
+    latencies: list[float],
+) -> None:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    request = (
+        b'POST /%s HTTP/1.1\r\nHost: %s\r\nContent-Length: %d\r\n\r\n'
+        % (kind.encode(), HOST.encode(), len(body))
+    ) + body
+    try:
+        for _ in range(request_count):
+            started_at = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started_at)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run(
+    kind: CorpusKind,
+    size: int,
+    requests: int,
+    clients: int,
+    executor_kind: ExecutorKind,
+    max_workers: int | None,
+    max_concurrent_jobs: int,
+) -> dict[str, Any]:
+    body = generate(kind, size).encode('utf-8')
+    controller = AsyncMusicController(
+        executor_kind=executor_kind,
+        max_workers=max_workers,
+        max_concurrent_jobs=max_concurrent_jobs,
+    )
+    async with controller:
+        server = await asyncio.start_server(StandInServer(controller).handle, HOST, 0)
+        port = server.sockets[0].getsockname()[1]
+
+        # Aquecimento: sobe os workers e carrega os módulos antes de medir
+        await asyncio.gather(
+            *(_client(port, kind, body, 1, []) for _ in range(clients))
+        )
+
+        latencies: list[float] = []
+        per_client = [requests // clients] * clients
+        for i in range(requests % clients):
+            per_client[i] += 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(
+            *(_client(port, kind, body, count, latencies) for count in per_client)
+        )
+        elapsed = time.perf_counter() - started_at
+
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    return {
+        'corpus': str(kind),
+        'bytes': size,
+        'requests': len(latencies),
+        'clients': clients,
+        'executor': str(executor_kind),
+        'max_workers': max_workers,
+        'max_concurrent_jobs': max_concurrent_jobs,
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else None,
+        'latency_p50_seconds': _percentile(latencies, 0.50),
+        'latency_p99_seconds': _percentile(latencies, 0.99),
+        'latency_max_seconds': latencies[-1],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description='Teste de carga do AsyncMusicController atrás de um servidor HTTP.'
+    )
+    arg_parser.add_argument('--corpus', default=CorpusKind.MML_DENSE)
+    arg_parser.add_argument(
+        '--size', default=DEFAULT_SIZE, help='tamanho do texto de cada requisição'
+    )
+    arg_parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    arg_parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS)
+    arg_parser.add_argument(
+        '--executor', choices=list(ExecutorKind), default=ExecutorKind.PROCESS
+    )
+    arg_parser.add_argument('--workers', type=int, help='tamanho do pool')
+    arg_parser.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_CONCURRENT_JOBS)
+    arg_parser.add_argument(
+        '--output', type=Path, help='arquivo JSON de resultados (padrão: stdout)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    result = asyncio.run(
+        run(
+            kind=CorpusKind(args.corpus),
+            size=parse_size(args.size),
+            requests=args.requests,
+            clients=max(1, args.clients),
+            executor_kind=ExecutorKind(args.executor),
+            max_workers=args.workers,
+            max_concurrent_jobs=args.max_jobs,
+        )
+    )
+    report = json.dumps(
+        {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'result': result,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        args.output.write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
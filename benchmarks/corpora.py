@@ -0,0 +1,138 @@
+"""Geradores determinísticos de textos sintéticos para os benchmarks."""
+
+import random
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Final
+
+from domain.parser import ParsingMode
+
+DEFAULT_SEED: Final[int] = 2024
+
+MML_NOTES: Final[str] = 'CDEFGAB'
+MML_ACCIDENTALS: Final[tuple[str, ...]] = ('', '', '', '#', '-')
+MML_LENGTHS: Final[tuple[str, ...]] = ('', '', '4', '8', '16', '2', '4.', '8.')
+STANDARD_NOTES: Final[str] = 'ABCDEFGH'
+PROSE_WORDS: Final[tuple[str, ...]] = (
+    'the',
+    'quick',
+    'brown',
+    'fox',
+    'jumps',
+    'over',
+    'lazy',
+    'dog',
+    'rhythm',
+    'sky',
+    'strength',
+    'lymph',
+    'nymphs',
+    'crypts',
+    'music',
+    'text',
+    'parser',
+    'throughput',
+)
+
+
+class CorpusKind(StrEnum):
+    """Perfis de texto que estressam partes diferentes dos parsers."""
+
+    MML_DENSE = 'mml-dense'
+    MML_RESTS = 'mml-rests'
+    MML_CHANGES = 'mml-changes'
+    STANDARD_NOTES = 'standard-notes'
+    STANDARD_PROSE = 'standard-prose'
+
+
+def _mml_note(rng: random.Random) -> str:
+    return rng.choice(MML_NOTES) + rng.choice(MML_ACCIDENTALS) + rng.choice(MML_LENGTHS)
+
+
+def _mml_dense(rng: random.Random) -> str:
+    token = _mml_note(rng)
+    roll = rng.random()
+    if roll < 0.05:
+        token = rng.choice('<>') + token
+    elif roll < 0.07:
+        token = f'O{rng.randint(3, 7)} {token}'
+    return token
+
+
+def _mml_rests(rng: random.Random) -> str:
+    if rng.random() < 0.7:
+        return rng.choice(('R1', 'R2', 'R1.', 'P1', 'R2.'))
+    return _mml_note(rng)
+
+
+def _mml_changes(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.2:
+        return f'T{rng.randint(40, 240)}'
+    if roll < 0.4:
+        return f'I{rng.randint(0, 127)}'
+    if roll < 0.5:
+        return f'V{rng.randint(20, 127)}'
+    if roll < 0.6:
+        return f'L{rng.choice((2, 4, 8, 16))}'
+    return _mml_note(rng)
+
+
+def _standard_notes(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.05:
+        return rng.choice('+-')
+    if roll < 0.08:
+        return ';'
+    if roll < 0.09:
+        return '?'
+    if roll < 0.095:
+        return 'BPM+'
+    if roll < 0.1:
+        return '\n'
+    return rng.choice(STANDARD_NOTES)
+
+
+def _standard_prose(rng: random.Random) -> str:
+    word = rng.choice(PROSE_WORDS)
+    if rng.random() < 0.1:
+        word = word.capitalize()
+    return word + rng.choice(('', '', '', ',', '.'))
+
+
+GENERATORS: Final[dict[CorpusKind, tuple[ParsingMode, Callable[..., str], str]]] = {
+    CorpusKind.MML_DENSE: (ParsingMode.MML, _mml_dense, ' '),
+    CorpusKind.MML_RESTS: (ParsingMode.MML, _mml_rests, ' '),
+    CorpusKind.MML_CHANGES: (ParsingMode.MML, _mml_changes, ' '),
+    CorpusKind.STANDARD_NOTES: (ParsingMode.STANDARD, _standard_notes, ''),
+    CorpusKind.STANDARD_PROSE: (ParsingMode.STANDARD, _standard_prose, ' '),
+}
+
+
+def corpus_mode(kind: CorpusKind) -> ParsingMode:
+    return GENERATORS[kind][0]
+
+
+def generate(kind: CorpusKind, size_bytes: int, seed: int = DEFAULT_SEED) -> str:
+    """Gera um texto de `size_bytes` caracteres ASCII, sempre igual para a semente."""
+    _mode, token_factory, separator = GENERATORS[kind]
+    rng = random.Random(f'{kind}:{seed}')
+
+    parts: list[str] = []
+    length = 0
+    step = len(separator)
+    while length < size_bytes:
+        token = token_factory(rng)
+        parts.append(token)
+        length += len(token) + step
+
+    return separator.join(parts)[:size_bytes]
+
+
+def parse_size(value: str) -> int:
+    """Converte tamanhos como `1K`, `10M` ou `512` em bytes."""
+    units = {'K': 1024, 'M': 1024**2, 'G': 1024**3}
+    value = value.strip().upper().removesuffix('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
@@ -0,0 +1,182 @@
+"""Mede a vazão dos parsers, do exportador e do importador MIDI.
+
+Uso:
+    python -m benchmarks.parser_throughput --sizes 1K,1M,100M --output results.json
+"""
+
+import argparse
+import functools
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Final
+
+from benchmarks.corpora import CorpusKind, corpus_mode, generate, parse_size
+from domain.events import MusicalEvent
+from domain.models import PlaybackSettings
+from domain.parser import MMLParser, MusicParser, ParsingMode, StandardParser
+from infrastructure.midi_exporter import MIDIExporter
+from infrastructure.midi_importer import MIDIImporter
+
+DEFAULT_SIZES: Final[str] = '1K,10K,100K,1M'
+DEFAULT_REPEATS: Final[int] = 3
+
+
+def _measure[T](
+    func: Callable[[], T], repeats: int, track_memory: bool
+) -> tuple[T, float, int | None]:
+    """Executa `func` e retorna (resultado, melhor tempo, pico de memória).
+
+    O pico de memória vem de uma execução extra sob `tracemalloc`, para que
+    o custo do rastreamento não contamine as medidas de tempo.
+    """
+    timings: list[float] = []
+    results: list[T] = []
+    for _ in range(max(1, repeats)):
+        started_at = time.perf_counter()
+        results.append(func())
+        timings.append(time.perf_counter() - started_at)
+
+    peak: int | None = None
+    if track_memory:
+        tracemalloc.start()
+        func()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return results[-1], min(timings), peak
+
+
+def _record(
+    stage: str,
+    kind: CorpusKind,
+    size: int,
+    events: int,
+    seconds: float,
+    peak: int | None,
+) -> dict[str, Any]:
+    return {
+        'stage': stage,
+        'corpus': str(kind),
+        'bytes': size,
+        'events': events,
+        'seconds': seconds,
+        'events_per_second': events / seconds if seconds else None,
+        'bytes_per_second': size / seconds if seconds else None,
+        'peak_memory_bytes': peak,
+    }
+
+
+def run(
+    kinds: list[CorpusKind], sizes: list[int], repeats: int, track_memory: bool
+) -> list[dict[str, Any]]:
+    settings = PlaybackSettings()
+    parsers: dict[ParsingMode, MusicParser] = {
+        ParsingMode.MML: MMLParser(),
+        ParsingMode.STANDARD: StandardParser(),
+    }
+    exporter = MIDIExporter()
+    importer = MIDIImporter()
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        midi_path = Path(tmp_dir) / 'benchmark.mid'
+
+        for kind in kinds:
+            mode = corpus_mode(kind)
+            parser = parsers[mode]
+
+            for size in sizes:
+                text = generate(kind, size)
+
+                events: list[MusicalEvent]
+                events, seconds, peak = _measure(
+                    functools.partial(parser.parse, text, settings),
+                    repeats,
+                    track_memory,
+                )
+                results.append(
+                    _record(f'parse-{mode}', kind, size, len(events), seconds, peak)
+                )
+
+                _, seconds, peak = _measure(
+                    functools.partial(
+                        exporter.save, events=events, file_path=midi_path
+                    ),
+                    repeats,
+                    track_memory,
+                )
+                results.append(
+                    _record('export', kind, size, len(events), seconds, peak)
+                )
+
+                midi_size = midi_path.stat().st_size
+                _, seconds, peak = _measure(
+                    functools.partial(importer.load, midi_path), repeats, track_memory
+                )
+                results.append(
+                    _record('import', kind, midi_size, len(events), seconds, peak)
+                )
+
+                print(
+                    f'{kind:>15} {size:>11,d} B  events={len(events):,d}',
+                    file=sys.stderr,
+                )
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description='Mede a vazão dos parsers, do exportador e do importador MIDI.'
+    )
+    arg_parser.add_argument(
+        '--sizes',
+        default=DEFAULT_SIZES,
+        help='tamanhos dos textos separados por vírgula (ex.: 1K,10M,100M)',
+    )
+    arg_parser.add_argument(
+        '--corpora',
+        default=','.join(CorpusKind),
+        help='perfis de texto separados por vírgula',
+    )
+    arg_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    arg_parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help='não mede o pico de memória (evita a execução extra)',
+    )
+    arg_parser.add_argument(
+        '--output', type=Path, help='arquivo JSON de resultados (padrão: stdout)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    results = run(
+        kinds=[CorpusKind(kind) for kind in args.corpora.split(',')],
+        sizes=[parse_size(size) for size in args.sizes.split(',')],
+        repeats=args.repeats,
+        track_memory=not args.no_memory,
+    )
+    report = json.dumps(
+        {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        args.output.write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
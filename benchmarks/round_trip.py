@@ -0,0 +1,430 @@
+"""Verifica a ida e volta texto → MIDI → texto e mede cada etapa.
+
+Gera partituras MML aleatórias já alinhadas à grade de importação, passa
+cada uma pelo `MIDIExporter` e pelo `MIDIImporter`, analisa o texto
+importado e compara as notas com as originais dentro de uma tolerância.
+Roda sem áudio: só usa o parser, o exportador e o importador.
+
+Sem `--baseline`, compara com a linha de base versionada em
+`benchmarks/round_trip_baseline.json`.
+
+Uso:
+    python -m benchmarks.round_trip --threshold 0.2
+    python -m benchmarks.round_trip --no-baseline \
+        --output benchmarks/round_trip_baseline.json
+"""
+
+import argparse
+import functools
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from benchmarks.corpora import DEFAULT_SEED, parse_size
+from domain.events import InstrumentEvent, MusicalEvent, NoteEvent
+from domain.models import PlaybackSettings
+from domain.parser import MMLParser
+from infrastructure.import_quantizer import QuantizeGrid
+from infrastructure.midi_exporter import MIDIExporter
+from infrastructure.midi_importer import MIDIImporter
+
+DEFAULT_SIZES: Final[str] = '1K,10K'
+DEFAULT_SCORES: Final[int] = 5
+DEFAULT_REPEATS: Final[int] = 3
+DEFAULT_THRESHOLD: Final[float] = 0.25
+DEFAULT_BASELINE: Final[Path] = Path(__file__).with_name('round_trip_baseline.json')
+# Meia unidade da grade padrão, em tempos
+DEFAULT_TOLERANCE: Final[float] = 0.5 / QuantizeGrid().units_per_beat
+
+UNITS_PER_BEAT: Final[int] = QuantizeGrid().units_per_beat
+MML_NOTES: Final[str] = 'CDEFGAB'
+MML_ACCIDENTALS: Final[tuple[str, ...]] = ('', '', '', '#', '-')
+# Comprimentos binários, todos múltiplos da semicolcheia (3 unidades)
+STRAIGHT_LENGTHS: Final[tuple[str, ...]] = (
+    '1',
+    '2',
+    '4',
+    '4',
+    '8',
+    '8',
+    '16',
+    '2.',
+    '4.',
+    '8.',
+)
+TRIPLET_LENGTHS: Final[tuple[str, ...]] = ('3', '6', '12', '24')
+MIN_OCTAVE: Final[int] = 2
+MAX_OCTAVE: Final[int] = 8
+
+STAGES: Final[tuple[str, ...]] = ('parse', 'export', 'import', 'reparse')
+
+
+def _length_units(length: str) -> int:
+    number = length.rstrip('.')
+    dots = len(length) - len(number)
+    units = 4 * UNITS_PER_BEAT // int(number)
+    return units * (2 ** (dots + 1) - 1) // 2**dots
+
+
+def random_score(notes: int, seed: int) -> tuple[str, PlaybackSettings]:
+    """Partitura monofônica com `notes` notas e as configurações iniciais.
+
+    Todos os inícios caem em pontos da grade padrão: as tercinas vêm em
+    grupos completos que começam em múltiplos do próprio grupo, então a
+    ida e volta deve ser exata.
+    """
+    rng = random.Random(f'round-trip:{seed}')
+    settings = PlaybackSettings(
+        bpm=rng.randint(60, 180),
+        volume=rng.randint(40, 127),
+        instrument_id=rng.randint(0, 127),
+    )
+    parts: list[str] = []
+    octave = settings.octave
+    position = 0  # Em unidades da grade
+    written = 0
+
+    def note(length: str) -> None:
+        nonlocal position, written
+        parts.append(rng.choice(MML_NOTES) + rng.choice(MML_ACCIDENTALS) + length)
+        position += _length_units(length)
+        written += 1
+
+    while written < notes:
+        roll = rng.random()
+        if roll < 0.05:
+            parts.append(f'V{rng.randint(1, 127)}')
+        elif roll < 0.08:
+            parts.append(f'I{rng.randint(0, 127)}')
+        elif roll < 0.15:
+            octave = rng.randint(MIN_OCTAVE, MAX_OCTAVE)
+            parts.append(f'O{octave}')
+        elif roll < 0.25:
+            step = rng.choice((-1, 1))
+            if MIN_OCTAVE <= octave + step <= MAX_OCTAVE:
+                octave += step
+                parts.append('>' if step > 0 else '<')
+        elif roll < 0.35:
+            length = rng.choice(STRAIGHT_LENGTHS)
+            parts.append(f'R{length}')
+            position += _length_units(length)
+        elif roll < 0.42:
+            length = rng.choice(TRIPLET_LENGTHS)
+            if position % (3 * _length_units(length)) == 0:
+                for _ in range(3):
+                    note(length)
+        else:
+            note(rng.choice(STRAIGHT_LENGTHS))
+
+    return ' '.join(parts), settings
+
+
+def note_table(events: list[MusicalEvent]) -> dict[str, npt.NDArray[Any]]:
+    """Colunas das notas, com o instrumento ativo em cada uma."""
+    rows: list[tuple[float, float, int, int, int]] = []
+    instrument = 0
+    for event in events:
+        if isinstance(event, InstrumentEvent):
+            instrument = event.instrument_id
+        elif isinstance(event, NoteEvent):
+            rows.append(
+                (event.time, event.duration, event.pitch, event.volume, instrument)
+            )
+    table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    return {
+        'time': table[:, 0],
+        'duration': table[:, 1],
+        'pitch': table[:, 2].astype(np.int64),
+        'volume': table[:, 3].astype(np.int64),
+        'instrument': table[:, 4].astype(np.int64),
+    }
+
+
+@dataclass
+class Fidelity:
+    notes: int = 0
+    matched: int = 0
+    missing: int = 0
+    extra: int = 0
+    # Notas pareadas com altura, volume, instrumento ou duração errados
+    mismatched: int = 0
+    max_onset_error: float = 0.0
+    max_duration_error: float = 0.0
+
+    @property
+    def errors(self) -> int:
+        return self.missing + self.extra + self.mismatched
+
+    def add(self, other: 'Fidelity') -> None:
+        self.notes += other.notes
+        self.matched += other.matched
+        self.missing += other.missing
+        self.extra += other.extra
+        self.mismatched += other.mismatched
+        self.max_onset_error = max(self.max_onset_error, other.max_onset_error)
+        self.max_duration_error = max(self.max_duration_error, other.max_duration_error)
+
+
+def compare(
+    original: list[MusicalEvent], imported: list[MusicalEvent], tolerance: float
+) -> Fidelity:
+    """Pareia as notas pelo início mais próximo e conta as diferenças."""
+    expected, actual = note_table(original), note_table(imported)
+    count = len(expected['time'])
+    if not count or not len(actual['time']):
+        return Fidelity(notes=count, missing=count, extra=len(actual['time']))
+
+    # O importador mantém a ordem dos inícios, então a busca binária basta
+    right = np.clip(np.searchsorted(actual['time'], expected['time']), 1, None)
+    right = np.minimum(right, len(actual['time']) - 1)
+    left = right - 1
+    nearest = np.where(
+        np.abs(actual['time'][left] - expected['time'])
+        <= np.abs(actual['time'][right] - expected['time']),
+        left,
+        right,
+    )
+    onset_error = np.abs(actual['time'][nearest] - expected['time'])
+    found = onset_error <= tolerance
+    # Um mesmo início importado só pode responder por uma nota
+    pairs = np.unique(nearest[found])
+    matched = len(pairs)
+
+    duration_error = np.abs(actual['duration'][nearest] - expected['duration'])
+    wrong = found & (
+        (duration_error > tolerance)
+        | (actual['pitch'][nearest] != expected['pitch'])
+        | (actual['volume'][nearest] != expected['volume'])
+        | (actual['instrument'][nearest] != expected['instrument'])
+    )
+    return Fidelity(
+        notes=count,
+        matched=matched,
+        missing=count - matched,
+        extra=len(actual['time']) - matched,
+        mismatched=int(wrong.sum()),
+        max_onset_error=float(onset_error[found].max(initial=0.0)),
+        max_duration_error=float(duration_error[found].max(initial=0.0)),
+    )
+
+
+def _best_time[T](func: Callable[[], T], repeats: int) -> tuple[T, float]:
+    started_at = time.perf_counter()
+    result = func()
+    best = time.perf_counter() - started_at
+    for _ in range(repeats - 1):
+        started_at = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started_at)
+    return result, best
+
+
+def run(
+    sizes: list[int], scores: int, repeats: int, tolerance: float, seed: int
+) -> list[dict[str, Any]]:
+    parser = MMLParser()
+    exporter = MIDIExporter()
+    importer = MIDIImporter()
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        midi_path = Path(tmp_dir) / 'round_trip.mid'
+
+        for size in sizes:
+            seconds = dict.fromkeys(STAGES, 0.0)
+            fidelity = Fidelity()
+            source_chars = imported_chars = midi_bytes = 0
+
+            for index in range(scores):
+                text, settings = random_score(size, seed + index)
+                events, elapsed = _best_time(
+                    functools.partial(parser.parse, text, settings), repeats
+                )
+                seconds['parse'] += elapsed
+
+                data, elapsed = _best_time(
+                    functools.partial(exporter.to_bytes, events), repeats
+                )
+                seconds['export'] += elapsed
+                midi_path.write_bytes(data)
+
+                conversion, elapsed = _best_time(
+                    functools.partial(importer.load, midi_path), repeats
+                )
+                seconds['import'] += elapsed
+
+                imported_settings = PlaybackSettings(
+                    bpm=conversion.initial_bpm,
+                    volume=conversion.initial_velocity,
+                    instrument_id=conversion.initial_instrument,
+                )
+                imported, elapsed = _best_time(
+                    functools.partial(parser.parse, conversion.text, imported_settings),
+                    repeats,
+                )
+                seconds['reparse'] += elapsed
+
+                fidelity.add(compare(events, imported, tolerance))
+                if conversion.initial_bpm != settings.bpm:
+                    fidelity.mismatched += 1
+                source_chars += len(text)
+                imported_chars += len(conversion.text)
+                midi_bytes += len(data)
+
+            results.append(
+                {
+                    'notes_per_score': size,
+                    'scores': scores,
+                    'source_chars': source_chars,
+                    'imported_chars': imported_chars,
+                    'midi_bytes': midi_bytes,
+                    'fidelity': asdict(fidelity),
+                    'stages': {
+                        stage: {
+                            'seconds': elapsed,
+                            'notes_per_second': (
+                                fidelity.notes / elapsed if elapsed else None
+                            ),
+                        }
+                        for stage, elapsed in seconds.items()
+                    },
+                }
+            )
+            print(
+                f'{size:>9,d} notas x {scores}  erros={fidelity.errors:,d}  '
+                + '  '.join(
+                    f'{stage}={elapsed:.3f}s' for stage, elapsed in seconds.items()
+                ),
+                file=sys.stderr,
+            )
+
+    return results
+
+
+def regressions(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float
+) -> list[str]:
+    """Diferenças em relação à linha de base que devem reprovar a execução.
+
+    Fidelidade não tem folga: qualquer erro além dos da linha de base
+    reprova. A vazão de cada etapa pode cair até `threshold` (fração).
+    Tamanhos ausentes da linha de base só são verificados quanto a erros.
+    """
+    by_size = {entry['notes_per_score']: entry for entry in baseline}
+    failures: list[str] = []
+    for entry in results:
+        size = entry['notes_per_score']
+        reference = by_size.get(size)
+        fidelity = Fidelity(**entry['fidelity'])
+        allowed = Fidelity(**reference['fidelity']).errors if reference else 0
+        if fidelity.errors > allowed:
+            failures.append(
+                f'{size} notas: {fidelity.errors} erros de fidelidade '
+                f'(linha de base: {allowed})'
+            )
+        if reference is None:
+            continue
+        for stage, measured in entry['stages'].items():
+            expected = reference['stages'].get(stage, {}).get('notes_per_second')
+            current = measured['notes_per_second']
+            if (
+                expected
+                and current is not None
+                and current < expected * (1 - threshold)
+            ):
+                failures.append(
+                    f'{size} notas, {stage}: {current:,.0f} notas/s '
+                    f'(linha de base: {expected:,.0f})'
+                )
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description='Verifica a ida e volta texto → MIDI → texto e mede cada etapa.'
+    )
+    arg_parser.add_argument(
+        '--sizes',
+        default=DEFAULT_SIZES,
+        help='notas por partitura, separadas por vírgula (ex.: 1K,100K)',
+    )
+    arg_parser.add_argument(
+        '--scores',
+        type=int,
+        default=DEFAULT_SCORES,
+        help='partituras aleatórias por tamanho',
+    )
+    arg_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    arg_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    arg_parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='erro máximo de início e duração, em tempos',
+    )
+    arg_parser.add_argument(
+        '--baseline',
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help='resultados anteriores (JSON) para comparar',
+    )
+    arg_parser.add_argument(
+        '--no-baseline',
+        action='store_true',
+        help='só verifica a fidelidade (ex.: ao gravar uma nova linha de base)',
+    )
+    arg_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='queda de vazão tolerada em relação à linha de base (fração)',
+    )
+    arg_parser.add_argument(
+        '--output', type=Path, help='arquivo JSON de resultados (padrão: stdout)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    results = run(
+        sizes=[parse_size(size) for size in args.sizes.split(',')],
+        scores=args.scores,
+        repeats=args.repeats,
+        tolerance=args.tolerance,
+        seed=args.seed,
+    )
+    baseline: list[dict[str, Any]] = []
+    if not args.no_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))['results']
+    failures = regressions(results, baseline, args.threshold)
+
+    report = json.dumps(
+        {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tolerance': args.tolerance,
+            'results': results,
+            'failures': failures,
+        },
+        indent=2,
+    )
+    if args.output:
+        args.output.write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+    for failure in failures:
+        print(f'REGRESSÃO: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
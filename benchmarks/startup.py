@@ -0,0 +1,99 @@
+"""Mede o custo de importação na partida a frio com `python -X importtime`.
+
+Uso:
+    python -m benchmarks.startup --module ui.main_window --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+DEFAULT_MODULE: Final[str] = 'ui.main_window'
+DEFAULT_REPEATS: Final[int] = 5
+DEFAULT_TOP: Final[int] = 15
+SRC_DIR: Final[Path] = Path(__file__).resolve().parent.parent / 'src'
+
+# Módulos que não devem ser carregados antes do primeiro uso
+DEFERRED_MODULES: Final[tuple[str, ...]] = (
+    'fluidsynth',
+    'mido',
+    'numpy',
+    'infrastructure.audio_player',
+    'infrastructure.midi_exporter',
+    'infrastructure.midi_importer',
+)
+
+
+def _import_once(module: str) -> tuple[float, dict[str, int]]:
+    """Importa o módulo em um processo novo; retorna (tempo total, cumulativos)."""
+    env = {**os.environ, 'PYTHONPATH': str(SRC_DIR)}
+    started_at = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        cwd=SRC_DIR.parent,
+    )
+    wall = time.perf_counter() - started_at
+
+    cumulative: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+    return wall, cumulative
+
+
+def run(module: str, repeats: int, top: int) -> dict[str, Any]:
+    walls: list[float] = []
+    best: dict[str, int] = {}
+    for _ in range(max(1, repeats)):
+        wall, cumulative = _import_once(module)
+        walls.append(wall)
+        if not best or cumulative.get(module, 0) < best.get(module, 0):
+            best = cumulative
+
+    slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'process_seconds_min': min(walls),
+        'process_seconds_median': sorted(walls)[len(walls) // 2],
+        'import_seconds': best.get(module, 0) / 1e6,
+        'slowest_imports_us': dict(slowest),
+        'deferred_modules_loaded': [name for name in DEFERRED_MODULES if name in best],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description='Mede o custo de importação na partida a frio (-X importtime).'
+    )
+    arg_parser.add_argument('--module', default=DEFAULT_MODULE)
+    arg_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    arg_parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    arg_parser.add_argument(
+        '--output', type=Path, help='arquivo JSON de resultados (padrão: stdout)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    result = run(module=args.module, repeats=args.repeats, top=args.top)
+    report = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+    # Falha se algum backend pesado voltou a ser importado na partida
+    return 1 if result['deferred_modules_loaded'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
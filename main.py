@@ -1,7 +1,10 @@
+import logging
 import sys
 
 from ui.main_window import Application
 
+logging.basicConfig(level=logging.INFO)
+
 if __name__ == '__main__':
     app = Application()
     sys.exit(app.run(sys.argv))
@@ -0,0 +1,179 @@
+import asyncio
+import functools
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Self
+
+from domain.events import MusicalEvent
+from domain.models import PlaybackSettings
+from domain.parser import ParsingMode, TextParser
+
+if TYPE_CHECKING:
+    from domain.columns import EventColumns
+    from domain.transforms import ScoreTransform
+    from infrastructure.audio_renderer import OfflineRenderer
+    from infrastructure.midi_exporter import MIDIExporter
+
+DEFAULT_MAX_CONCURRENT_JOBS: Final[int] = 8
+
+
+class ExecutorKind(StrEnum):
+    """Onde rodam os trabalhos pesados quando nenhum executor é fornecido."""
+
+    PROCESS = 'process'  # Paralelismo real, com custo de serialização
+    THREAD = 'thread'  # Menor latência por trabalho, mas disputa o GIL
+
+
+# Instâncias reaproveitadas por processo (ou thread) de trabalho; parser,
+# exportador e renderizador não guardam estado entre chamadas.
+@functools.cache
+def _parser() -> TextParser:
+    return TextParser()
+
+
+@functools.cache
+def _exporter() -> 'MIDIExporter':
+    from infrastructure.midi_exporter import MIDIExporter
+
+    return MIDIExporter()
+
+
+@functools.cache
+def _renderer() -> 'OfflineRenderer':
+    from infrastructure.audio_renderer import OfflineRenderer
+
+    return OfflineRenderer()
+
+
+def parse_text(
+    text: str,
+    settings: PlaybackSettings,
+    mode: ParsingMode,
+    transform: 'ScoreTransform | None' = None,
+) -> list[MusicalEvent]:
+    """Analisa o texto e aplica as transformações opcionais."""
+    score = _parse_score(text, settings, mode, transform)
+    return score if isinstance(score, list) else score.to_events()
+
+
+def _parse_score(
+    text: str,
+    settings: PlaybackSettings,
+    mode: ParsingMode,
+    transform: 'ScoreTransform | None',
+) -> 'list[MusicalEvent] | EventColumns':
+    score = _parser().parse_score(text=text, settings=settings, mode=mode)
+    if transform is None:
+        return score
+    return transform.apply_to_score(score)
+
+
+def export_text_to_bytes(
+    text: str,
+    settings: PlaybackSettings,
+    mode: ParsingMode,
+    transform: 'ScoreTransform | None' = None,
+) -> bytes:
+    """Analisa o texto e devolve o arquivo MIDI codificado."""
+    return _exporter().to_bytes(_parse_score(text, settings, mode, transform))
+
+
+def render_text_to_bytes(
+    text: str,
+    settings: PlaybackSettings,
+    mode: ParsingMode,
+    soundfont_path: Path,
+    transform: 'ScoreTransform | None' = None,
+) -> bytes:
+    """Analisa o texto e devolve o áudio sintetizado como WAV."""
+    events = parse_text(text, settings, mode, transform)
+    return _renderer().render_to_bytes(events, settings, soundfont_path)
+
+
+class AsyncMusicController:
+    """Fachada assíncrona do núcleo de conversão para serviços `asyncio`.
+
+    O trabalho pesado roda em um executor (por padrão, um pool de processos
+    iniciado com `spawn`) e nunca bloqueia o laço de eventos. Um semáforo
+    limita quantos trabalhos ficam em execução ao mesmo tempo; os demais
+    aguardam a vez sem ocupar o executor. Nada depende do GTK ou do GLib.
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        executor_kind: ExecutorKind = ExecutorKind.PROCESS,
+        max_workers: int | None = None,
+        max_concurrent_jobs: int = DEFAULT_MAX_CONCURRENT_JOBS,
+    ) -> None:
+        if max_concurrent_jobs < 1:
+            raise ValueError('O limite de trabalhos simultâneos deve ser positivo.')
+        self._owns_executor: bool = executor is None
+        self.executor: Executor = executor or self._create_executor(
+            executor_kind, max_workers
+        )
+        self.max_concurrent_jobs: int = max_concurrent_jobs
+        self._jobs: asyncio.Semaphore = asyncio.Semaphore(max_concurrent_jobs)
+
+    @staticmethod
+    def _create_executor(kind: ExecutorKind, max_workers: int | None) -> Executor:
+        if kind == ExecutorKind.THREAD:
+            return ThreadPoolExecutor(max_workers=max_workers)
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    async def parse(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        transform: 'ScoreTransform | None' = None,
+    ) -> list[MusicalEvent]:
+        return await self._run(parse_text, text, settings, mode, transform)
+
+    async def export_to_bytes(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        transform: 'ScoreTransform | None' = None,
+    ) -> bytes:
+        """Converte o texto em um arquivo MIDI em memória."""
+        return await self._run(export_text_to_bytes, text, settings, mode, transform)
+
+    async def render(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        soundfont_path: Path,
+        transform: 'ScoreTransform | None' = None,
+    ) -> bytes:
+        """Converte o texto em áudio WAV em memória (requer o FluidSynth)."""
+        return await self._run(
+            render_text_to_bytes, text, settings, mode, soundfont_path, transform
+        )
+
+    async def _run[**P, T](
+        self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        async with self._jobs:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def close(self) -> None:
+        """Encerra o executor, se ele foi criado por este controlador."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await asyncio.to_thread(self.close)
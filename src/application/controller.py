@@ -1,20 +1,121 @@
-from collections.abc import Callable
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Final
 
+from config import COMPILED_SCORE_MAX_BYTES, COMPILED_SCORE_MIN_CHARS
 from domain.events import MusicalEvent
 from domain.models import PlaybackSettings
 from domain.parser import ParsingMode, TextParser
-from infrastructure.audio_player import FluidSynthPlayer
-from infrastructure.midi_exporter import MIDIExporter
-from infrastructure.midi_importer import MIDIImporter
+from domain.source_map import SourceMap, SourceSpan
+from infrastructure.audio_cache import RenderCache
+from infrastructure.playback_metrics import PlaybackMetrics
+from infrastructure.synth_options import (
+    DEFAULT_LOOKAHEAD_SECONDS,
+    SchedulingMode,
+    SynthSettings,
+)
+
+if TYPE_CHECKING:
+    from application.variant_export import ExportVariant
+    from domain.columns import EventColumns
+    from domain.transforms import ScoreTransform
+    from infrastructure.audio_player import FluidSynthPlayer
+    from infrastructure.cached_player import CachedAudioPlayer
+    from infrastructure.compiled_score import CompiledScoreCache
+    from infrastructure.midi_exporter import MIDIExporter
+    from infrastructure.midi_importer import MIDIImporter
+    from infrastructure.playback_mixer import PlaybackMixer
+
+logger = logging.getLogger(__name__)
+
+# Backends pesados (FluidSynth, GStreamer, mido, NumPy), carregados
+# apenas no primeiro uso ou pelo aquecimento em segundo plano.
+BACKEND_MODULES: Final[tuple[str, ...]] = (
+    'infrastructure.audio_player',
+    'infrastructure.audio_renderer',
+    'infrastructure.cached_player',
+    'infrastructure.midi_exporter',
+    'infrastructure.midi_importer',
+)
+
+
+@dataclass(frozen=True)
+class MixTrack:
+    """Uma partitura tocada junto com outras por `play_mix`."""
+
+    text: str
+    settings: PlaybackSettings
+    mode: ParsingMode
+    gain: float = 1.0
+    on_progress_callback: Callable[[SourceSpan], None] | None = None
+    source_path: Path | None = None
 
 
 class MusicController:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        render_cache: RenderCache | None = None,
+        scheduling_mode: SchedulingMode = SchedulingMode.SEQUENCER,
+        lookahead_seconds: float = DEFAULT_LOOKAHEAD_SECONDS,
+        metrics: PlaybackMetrics | None = None,
+        midi_output_port: str | None = None,
+        compiled_score_dir: Path | None = None,
+    ) -> None:
         self.parser: TextParser = TextParser()
-        self.exporter: MIDIExporter = MIDIExporter()
-        self.importer: MIDIImporter = MIDIImporter()
-        self.current_player: FluidSynthPlayer | None = None
+        self._exporter: MIDIExporter | None = None
+        self._importer: MIDIImporter | None = None
+        self.synth_settings: SynthSettings = SynthSettings()
+        self.render_cache: RenderCache | None = render_cache
+        self.scheduling_mode: SchedulingMode = scheduling_mode
+        self.lookahead_seconds: float = lookahead_seconds
+        self.metrics: PlaybackMetrics | None = metrics
+        self.midi_output_port: str | None = midi_output_port
+        self.compiled_score_dir: Path | None = compiled_score_dir
+        self._score_cache: CompiledScoreCache | None = None
+        self.current_player: FluidSynthPlayer | CachedAudioPlayer | None = None
+        self.current_mixer: PlaybackMixer | None = None
+
+    @property
+    def exporter(self) -> 'MIDIExporter':
+        if self._exporter is None:
+            from infrastructure.midi_exporter import MIDIExporter
+
+            self._exporter = MIDIExporter()
+        return self._exporter
+
+    @property
+    def importer(self) -> 'MIDIImporter':
+        if self._importer is None:
+            from infrastructure.midi_importer import MIDIImporter
+
+            self._importer = MIDIImporter()
+        return self._importer
+
+    @property
+    def score_cache(self) -> 'CompiledScoreCache | None':
+        if self._score_cache is None and self.compiled_score_dir is not None:
+            from infrastructure.compiled_score import CompiledScoreCache
+
+            self._score_cache = CompiledScoreCache(
+                directory=self.compiled_score_dir, max_bytes=COMPILED_SCORE_MAX_BYTES
+            )
+        return self._score_cache
+
+    def warm_up(self) -> None:
+        """Carrega os backends de áudio e MIDI em uma thread em segundo plano."""
+        threading.Thread(target=self._import_backends, daemon=True).start()
+
+    def _import_backends(self) -> None:
+        for module_name in BACKEND_MODULES:
+            try:
+                importlib.import_module(module_name)
+            except (ImportError, ValueError):
+                logger.debug('Backend indisponível: %s', module_name)
 
     def play_music(
         self,
@@ -23,29 +124,213 @@ class MusicController:
         mode: ParsingMode,
         soundfont_path: Path,
         on_finished_callback: Callable[[], None] | None = None,
-        on_progress_callback: Callable[[int, int], None] | None = None,
+        on_progress_callback: Callable[[SourceSpan], None] | None = None,
+        transform: 'ScoreTransform | None' = None,
+        source_path: Path | None = None,
     ) -> None:
-        """Analisa o texto e inicia a reprodução."""
+        """Analisa o texto, aplica as transformações opcionais e inicia a reprodução.
+
+        O progresso chega como trechos em linha e coluna, resolvidos por um
+        `SourceMap` montado junto com a análise.
+        """
         self.stop_music()
+        if self.metrics:
+            self.metrics.start()
 
-        events: list[MusicalEvent] = self.parser.parse(
-            text=text, settings=settings, mode=mode
+        parse_started_at = time.perf_counter()
+        score = self._parse_score(text, settings, mode, source_path)
+        if self.metrics:
+            self.metrics.record_parse(time.perf_counter() - parse_started_at)
+        if transform is not None:
+            score = transform.apply_to_score(score)
+        events = score if isinstance(score, list) else score.to_events()
+        on_progress = (
+            SourceMap(text).span_callback(on_progress_callback)
+            if on_progress_callback
+            else None
         )
+
+        if self.midi_output_port is not None:
+            self._play_on_midi_port(
+                events,
+                settings,
+                soundfont_path,
+                on_finished_callback,
+                on_progress,
+            )
+            return
+
+        cached_player_class = self._cached_player_class()
+        if self.render_cache is not None and cached_player_class is not None:
+            cached_path = self._prepare_cached_audio(
+                score, events, settings, soundfont_path
+            )
+            if cached_path is not None:
+                self.current_player = cached_player_class(
+                    audio_path=cached_path,
+                    events=events,
+                    settings=settings,
+                    on_finished_callback=on_finished_callback,
+                    on_progress_callback=on_progress,
+                    metrics=self.metrics,
+                )
+                self.current_player.start()
+                return
+
+        from infrastructure.audio_player import FluidSynthPlayer
+
+        self.current_player = FluidSynthPlayer(
+            soundfont_path=soundfont_path,
+            events=events,
+            settings=settings,
+            on_finished_callback=on_finished_callback,
+            on_progress_callback=on_progress,
+            synth_settings=self.synth_settings,
+            scheduling_mode=self.scheduling_mode,
+            lookahead_seconds=self.lookahead_seconds,
+            metrics=self.metrics,
+        )
+        self.current_player.start()
+
+    def _play_on_midi_port(
+        self,
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        soundfont_path: Path,
+        on_finished_callback: Callable[[], None] | None,
+        on_progress_callback: Callable[[int, int], None] | None,
+    ) -> None:
+        """Envia a agenda a uma porta MIDI externa, sem sintetizar áudio."""
+        from infrastructure.audio_player import FluidSynthPlayer
+        from infrastructure.midi_port_backend import MidiPortBackend
+
+        assert self.midi_output_port is not None
         self.current_player = FluidSynthPlayer(
             soundfont_path=soundfont_path,
             events=events,
             settings=settings,
             on_finished_callback=on_finished_callback,
             on_progress_callback=on_progress_callback,
+            scheduling_mode=SchedulingMode.PYTHON,
+            metrics=self.metrics,
+            backend=MidiPortBackend(self.midi_output_port),
         )
         self.current_player.start()
 
+    def _prepare_cached_audio(
+        self,
+        score: 'list[MusicalEvent] | EventColumns',
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        soundfont_path: Path,
+    ) -> Path | None:
+        """Retorna o áudio em cache ou agenda a renderização para a próxima vez.
+
+        A renderização só é agendada quando a mesma partitura é pedida pela
+        segunda vez, para não dobrar o trabalho em textos tocados uma vez. A
+        chave sai das colunas da partitura; a estimativa de tamanho e a
+        renderização rodam fora da thread da interface.
+        """
+        assert self.render_cache is not None
+        key = self.render_cache.key_for(
+            score, soundfont_path, self.synth_settings, settings.bank
+        )
+        cached_path = self.render_cache.lookup(key)
+        if cached_path is None and self.render_cache.should_render(key):
+            from infrastructure.audio_renderer import OfflineRenderer
+
+            renderer = OfflineRenderer(self.synth_settings)
+            self.render_cache.store_in_background(
+                key,
+                lambda output: renderer.render(
+                    events, settings, soundfont_path, output
+                ),
+                estimate_bytes=lambda: renderer.estimate_bytes(events, settings),
+            )
+        return cached_path
+
+    def _cached_player_class(self) -> type['CachedAudioPlayer'] | None:
+        try:
+            from infrastructure.cached_player import CachedAudioPlayer
+        except ImportError:  # PyGObject indisponível
+            return None
+        return CachedAudioPlayer if CachedAudioPlayer.is_available() else None
+
+    def play_mix(
+        self,
+        tracks: Sequence[MixTrack],
+        soundfont_path: Path,
+        on_finished_callback: Callable[[], None] | None = None,
+    ) -> None:
+        """Toca várias partituras juntas em um único sintetizador.
+
+        Cada faixa mantém seus próprios canais e seu progresso; o nível de
+        cada uma é ajustado com `set_track_gain`, `set_track_muted` e
+        `set_track_solo` durante a reprodução.
+        """
+        from infrastructure.playback_mixer import MixerStream, PlaybackMixer
+
+        self.stop_music()
+        if self.metrics:
+            self.metrics.start()
+
+        streams: list[MixerStream] = []
+        for track in tracks:
+            events = self.parse(
+                track.text, track.settings, track.mode, track.source_path
+            )
+            streams.append(
+                MixerStream(
+                    events=events,
+                    settings=track.settings,
+                    gain=track.gain,
+                    on_progress_callback=(
+                        SourceMap(track.text).span_callback(track.on_progress_callback)
+                        if track.on_progress_callback
+                        else None
+                    ),
+                )
+            )
+
+        def on_mix_finished() -> None:
+            # O sintetizador já foi liberado: os ajustes de faixa deixam de valer
+            if self.current_mixer is mixer:
+                self.current_mixer = None
+            if on_finished_callback:
+                on_finished_callback()
+
+        mixer = PlaybackMixer(
+            soundfont_path=soundfont_path,
+            streams=streams,
+            on_finished_callback=on_mix_finished,
+            synth_settings=self.synth_settings,
+            scheduling_mode=self.scheduling_mode,
+            lookahead_seconds=self.lookahead_seconds,
+            metrics=self.metrics,
+        )
+        self.current_mixer = mixer
+        self.current_player = mixer
+        mixer.start()
+
+    def set_track_gain(self, index: int, gain: float) -> None:
+        if self.current_mixer:
+            self.current_mixer.set_gain(index, gain)
+
+    def set_track_muted(self, index: int, muted: bool) -> None:
+        if self.current_mixer:
+            self.current_mixer.set_muted(index, muted)
+
+    def set_track_solo(self, index: int, solo: bool) -> None:
+        if self.current_mixer:
+            self.current_mixer.set_solo(index, solo)
+
     def stop_music(self) -> None:
         """Para a reprodução atual se estiver ativa."""
         if self.current_player and self.current_player.is_alive():
             self.current_player.stop()
             self.current_player.join(timeout=1.0)
         self.current_player = None
+        self.current_mixer = None
 
     def export_midi(
         self,
@@ -53,12 +338,151 @@ class MusicController:
         settings: PlaybackSettings,
         mode: ParsingMode,
         file_path: Path,
+        transform: 'ScoreTransform | None' = None,
+        source_path: Path | None = None,
+    ) -> None:
+        """Analisa o texto, aplica as transformações opcionais e exporta o MIDI."""
+        score = self._parse_score(text, settings, mode, source_path)
+        if transform is not None:
+            score = transform.apply_to_score(score)
+        # Colunas vão direto ao exportador, sem recriar os eventos
+        self.exporter.save(events=score, file_path=file_path)
+
+    def export_midi_variants(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        variants: list['ExportVariant'],
+        max_workers: int | None = None,
+        source_path: Path | None = None,
+    ) -> list[Path]:
+        """Analisa o texto uma única vez e exporta cada variante em paralelo."""
+        from application.variant_export import VariantExporter
+
+        columns = self._as_columns(self._parse_score(text, settings, mode, source_path))
+        return VariantExporter(max_workers=max_workers).export(columns, variants)
+
+    def parse(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        source_path: Path | None = None,
+    ) -> list[MusicalEvent]:
+        """Analisa o texto, reaproveitando a partitura compilada quando válida.
+
+        Procura primeiro o arquivo compilado ao lado de `source_path` e depois
+        o cache; se nenhum corresponder ao texto atual, analisa normalmente e
+        grava o resultado no cache em segundo plano.
+        """
+        score = self._parse_score(text, settings, mode, source_path)
+        return score if isinstance(score, list) else score.to_events()
+
+    def _parse_score(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        source_path: Path | None,
+    ) -> 'list[MusicalEvent] | EventColumns':
+        """Como `parse`, mas mantém as colunas de partituras compiladas ou de
+        caminhos vetorizados, para que sejam transformadas antes da conversão.
+        """
+        columns = self._load_compiled_score(text, settings, mode, source_path)
+        if columns is not None:
+            return columns
+
+        score = self.parser.parse_score(text=text, settings=settings, mode=mode)
+        if self.score_cache is not None and self._is_compilable(text, settings, mode):
+            from infrastructure.compiled_score import score_key
+
+            self.score_cache.store_in_background(
+                score_key(text, settings, mode), lambda: self._as_columns(score)
+            )
+        return score
+
+    def compile_score(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        source_path: Path,
+    ) -> None:
+        """Grava a partitura compilada ao lado do texto, em segundo plano."""
+        if not self._is_compilable(text, settings, mode):
+            return
+        threading.Thread(
+            target=self._write_sidecar,
+            args=(text, settings, mode, source_path),
+            daemon=True,
+        ).start()
+
+    def _write_sidecar(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        source_path: Path,
     ) -> None:
-        """Analisa o texto e exporta para arquivo MIDI."""
-        events: list[MusicalEvent] = self.parser.parse(
-            text=text, settings=settings, mode=mode
+        from infrastructure.compiled_score import (
+            score_key,
+            sidecar_path,
+            write_compiled_score,
         )
-        self.exporter.save(events=events, file_path=file_path)
+
+        score = self.parser.parse_score(text=text, settings=settings, mode=mode)
+        try:
+            write_compiled_score(
+                sidecar_path(source_path),
+                score_key(text, settings, mode),
+                self._as_columns(score),
+            )
+        except OSError:
+            logger.exception('Falha ao gravar a partitura compilada')
+
+    def _load_compiled_score(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        mode: ParsingMode,
+        source_path: Path | None,
+    ) -> 'EventColumns | None':
+        if not self._is_compilable(text, settings, mode):
+            return None
+        from infrastructure.compiled_score import (
+            read_compiled_score,
+            score_key,
+            sidecar_path,
+        )
+
+        key = score_key(text, settings, mode)
+        if source_path is not None:
+            columns = read_compiled_score(sidecar_path(source_path), key)
+            if columns is not None:
+                return columns
+        if self.score_cache is not None:
+            return self.score_cache.lookup(key)
+        return None
+
+    @staticmethod
+    def _is_compilable(
+        text: str, settings: PlaybackSettings, mode: ParsingMode
+    ) -> bool:
+        """Confere o tamanho antes de importar o módulo (e o NumPy)."""
+        if len(text) < COMPILED_SCORE_MIN_CHARS:
+            return False
+        from infrastructure.compiled_score import is_compilable
+
+        return is_compilable(text, settings, mode)
+
+    @staticmethod
+    def _as_columns(score: 'list[MusicalEvent] | EventColumns') -> 'EventColumns':
+        if not isinstance(score, list):
+            return score
+        from domain.columns import EventColumns
+
+        return EventColumns.from_events(score)
 
     def import_midi(self, file_path: Path) -> tuple[str, int, int, int]:
         """Importa um arquivo MIDI e converte para sintaxe de texto + configurações."""
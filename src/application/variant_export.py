@@ -0,0 +1,56 @@
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from domain.columns import EventColumns
+from domain.parallel import available_cpu_count
+from domain.transforms import ScoreTransform
+
+
+@dataclass(frozen=True)
+class ExportVariant:
+    """Um arquivo MIDI derivado da partitura base por transformações."""
+
+    file_path: Path
+    transform: ScoreTransform = field(default_factory=ScoreTransform)
+
+
+def export_variant(columns: EventColumns, variant: ExportVariant) -> Path:
+    """Aplica as transformações de uma variante e grava o arquivo MIDI."""
+    from infrastructure.midi_exporter import MIDIExporter
+
+    derived = columns.copy()
+    variant.transform.apply(derived)
+    MIDIExporter().save(events=derived, file_path=variant.file_path)
+    return variant.file_path
+
+
+class VariantExporter:
+    """Gera várias variantes MIDI de uma única análise, em paralelo.
+
+    Os workers são processos iniciados com `spawn`, para não herdar o estado
+    do GTK; as colunas NumPy são baratas de serializar para eles.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers: int | None = max_workers
+
+    def export(
+        self, columns: EventColumns, variants: list[ExportVariant]
+    ) -> list[Path]:
+        if len(variants) <= 1:
+            return [export_variant(columns, variant) for variant in variants]
+
+        with self._create_executor(len(variants)) as executor:
+            futures = [
+                executor.submit(export_variant, columns, variant)
+                for variant in variants
+            ]
+            return [future.result() for future in futures]
+
+    def _create_executor(self, job_count: int) -> Executor:
+        workers = min(job_count, self.max_workers or available_cpu_count())
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+        )
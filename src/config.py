@@ -1,9 +1,27 @@
+import os
 from pathlib import Path
 from typing import Final
 
 # Caminho padrão para o SoundFont
 DEFAULT_SOUNDFONT: Final[Path] = Path('soundfont/SGM-V2.01.sf2')
 
+# Cache de áudio pré-renderizado, opcional (`TXT2MIDI_RENDER_CACHE=1`)
+RENDER_CACHE_ENABLED: Final[bool] = os.environ.get('TXT2MIDI_RENDER_CACHE') == '1'
+CACHE_DIR: Final[Path] = (
+    Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'txt2midi'
+)
+RENDER_CACHE_DIR: Final[Path] = CACHE_DIR / 'render'
+RENDER_CACHE_MAX_BYTES: Final[int] = 512 * 1024 * 1024
+
+# Cache de partituras compiladas (colunas de eventos mapeáveis em memória).
+# Textos menores que o mínimo são analisados mais rápido do que são gravados.
+COMPILED_SCORE_DIR: Final[Path] = CACHE_DIR / 'scores'
+COMPILED_SCORE_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+COMPILED_SCORE_MIN_CHARS: Final[int] = 64 * 1024
+
+# Porta MIDI externa opcional para a reprodução (em vez do FluidSynth)
+MIDI_OUTPUT_PORT: Final[str | None] = os.environ.get('TXT2MIDI_MIDI_PORT') or None
+
 # Mapeamento de notas base (Oitava 5) para números MIDI
 MIDI_BASE_NOTES: Final[dict[str, int]] = {
     'C': 60,
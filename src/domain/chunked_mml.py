@@ -0,0 +1,334 @@
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Final, NamedTuple, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from config import MIDI_BASE_NOTES
+from domain.columns import EventColumns, EventKind
+from domain.mml_tokens import NUMBER_REGEX, TOKEN_REGEX_MML
+from domain.models import PlaybackSettings
+from domain.parallel import available_cpu_count
+
+CHUNKS_PER_WORKER: Final[int] = 4
+
+# Início seguro de bloco: letras que sempre iniciam um token novo. O 'B' fica
+# de fora porque também é acidente ('Cb'), assim como dígitos e pontos.
+CHUNK_BOUNDARY_REGEX: Final[re.Pattern[str]] = re.compile(r'[ACDEFGHPR]', re.IGNORECASE)
+
+# Limites "infinitos" da função de oitava antes de qualquer saturação
+UNBOUNDED: Final[int] = 1 << 30
+
+UNKNOWN_VOLUME: Final[int] = -1
+UNKNOWN_LENGTH: Final[int] = 0
+
+
+class OctaveFunction(NamedTuple):
+    """Oitava como função da oitava de entrada: min(max(o + add, low), high).
+
+    A família é fechada sob composição com `O`, `>` e `<`, o que permite
+    analisar um bloco sem conhecer a oitava em que ele começa.
+    """
+
+    add: int
+    low: int
+    high: int
+
+    @classmethod
+    def identity(cls) -> Self:
+        return cls(add=0, low=-UNBOUNDED, high=UNBOUNDED)
+
+    @classmethod
+    def constant(cls, octave: int) -> Self:
+        return cls(add=0, low=octave, high=octave)
+
+    def shifted(self, steps: int) -> Self:
+        if steps >= 0:
+            return type(self)(
+                add=self.add + steps,
+                low=min(self.low + steps, 10),
+                high=min(self.high + steps, 10),
+            )
+        return type(self)(
+            add=self.add + steps,
+            low=max(self.low + steps, 0),
+            high=max(self.high + steps, 0),
+        )
+
+    def apply(self, octave: int) -> int:
+        return min(max(octave + self.add, self.low), self.high)
+
+
+@dataclass
+class ChunkResult:
+    """Eventos de um bloco com estado de entrada simbólico.
+
+    `volume` e `length` usam `UNKNOWN_VOLUME`/`UNKNOWN_LENGTH` enquanto o
+    bloco ainda não definiu o próprio valor; as oitavas ficam como funções.
+    """
+
+    kind: npt.NDArray[np.uint8]
+    source_index: npt.NDArray[np.int64]
+    source_length: npt.NDArray[np.int32]
+    base_pitch: npt.NDArray[np.int16]
+    octave_add: npt.NDArray[np.int32]
+    octave_low: npt.NDArray[np.int32]
+    octave_high: npt.NDArray[np.int32]
+    volume: npt.NDArray[np.int16]
+    length: npt.NDArray[np.int64]
+    dots: npt.NDArray[np.int16]
+    value: npt.NDArray[np.int32]
+    exit_octave: OctaveFunction
+    exit_volume: int
+    exit_length: int
+
+
+def parse_chunk(segment: str, offset: int) -> ChunkResult:
+    """Analisa um bloco sem conhecer oitava, volume e comprimento de entrada.
+
+    Espelha `MMLParser`, token a token, adiando o que depende do estado de
+    entrada para a fase de costura.
+    """
+    kind: list[int] = []
+    source_index: list[int] = []
+    source_length: list[int] = []
+    base_pitch: list[int] = []
+    octave_add: list[int] = []
+    octave_low: list[int] = []
+    octave_high: list[int] = []
+    volume: list[int] = []
+    length: list[int] = []
+    dots: list[int] = []
+    value: list[int] = []
+
+    octave = OctaveFunction.identity()
+    current_volume = UNKNOWN_VOLUME
+    current_length = UNKNOWN_LENGTH
+
+    pos = 0
+    size = len(segment)
+    while pos < size:
+        match = TOKEN_REGEX_MML.match(segment, pos)
+        if not match:
+            pos += 1
+            continue
+
+        token_type = match.lastgroup
+        start = pos
+        pos = match.end()
+
+        if token_type in ('octave_up', 'octave_down'):
+            steps = len(match.group())
+            octave = octave.shifted(steps if token_type == 'octave_up' else -steps)
+            continue
+
+        number = NUMBER_REGEX.match(segment, pos)
+        number_value = int(number.group()) if number else 0
+        if number:
+            pos = number.end()
+
+        match token_type:
+            case 'note' | 'rest':
+                dot_count = 0
+                while pos < size and segment[pos] == '.':
+                    dot_count += 1
+                    pos += 1
+
+                pitch = 0
+                if token_type == 'note':
+                    token = match.group()
+                    pitch = MIDI_BASE_NOTES.get(token[0].upper(), 60)
+                    accidental = token[1] if len(token) > 1 else None
+                    if accidental in ('#', '+'):
+                        pitch += 1
+                    elif accidental in ('b', '-'):
+                        pitch -= 1
+
+                kind.append(EventKind.NOTE if token_type == 'note' else EventKind.REST)
+                base_pitch.append(pitch)
+                octave_add.append(octave.add)
+                octave_low.append(octave.low)
+                octave_high.append(octave.high)
+                volume.append(current_volume)
+                length.append(number_value if number_value > 0 else current_length)
+                dots.append(dot_count)
+                value.append(0)
+            case 'octave_set':
+                octave = OctaveFunction.constant(max(0, min(number_value, 10)))
+                continue
+            case 'length_set':
+                current_length = max(1, number_value)
+                continue
+            case 'volume':
+                current_volume = max(0, min(number_value, 127))
+                continue
+            case 'tempo' | 'instrument':
+                if token_type == 'tempo':
+                    kind.append(EventKind.TEMPO)
+                    value.append(max(1, number_value))
+                else:
+                    kind.append(EventKind.INSTRUMENT)
+                    value.append(max(0, min(number_value, 127)))
+                base_pitch.append(0)
+                octave_add.append(0)
+                octave_low.append(0)
+                octave_high.append(0)
+                volume.append(0)
+                length.append(1)
+                dots.append(0)
+            case _:
+                continue
+
+        source_index.append(offset + start)
+        source_length.append(pos - start)
+
+    return ChunkResult(
+        kind=np.array(kind, dtype=np.uint8),
+        source_index=np.array(source_index, dtype=np.int64),
+        source_length=np.array(source_length, dtype=np.int32),
+        base_pitch=np.array(base_pitch, dtype=np.int16),
+        octave_add=np.array(octave_add, dtype=np.int32),
+        octave_low=np.array(octave_low, dtype=np.int32),
+        octave_high=np.array(octave_high, dtype=np.int32),
+        volume=np.array(volume, dtype=np.int16),
+        length=np.array(length, dtype=np.int64),
+        dots=np.array(dots, dtype=np.int16),
+        value=np.array(value, dtype=np.int32),
+        exit_octave=octave,
+        exit_volume=current_volume,
+        exit_length=current_length,
+    )
+
+
+class ChunkedMMLParser:
+    """Analisa uma voz MML grande em blocos paralelos e costura o estado.
+
+    Fase 1: cada bloco é analisado em um processo com estado de entrada
+    simbólico. Fase 2: uma varredura de prefixo resolve o estado de entrada
+    de cada bloco, e oitavas, volumes, durações e instantes são corrigidos de
+    forma vetorizada. Os instantes vêm de uma soma acumulada sequencial, com
+    os mesmos arredondamentos do parser serial.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers: int = max_workers or available_cpu_count()
+
+    def parse_columns(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        start: int = 0,
+        end: int | None = None,
+    ) -> EventColumns:
+        end = len(text) if end is None else end
+        bounds = self.chunk_bounds(text, start, end)
+
+        if len(bounds) == 1:
+            chunks = [parse_chunk(text[start:end], start)]
+        else:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(bounds)), mp_context=context
+            ) as executor:
+                futures = [
+                    executor.submit(parse_chunk, text[a:b], a) for a, b in bounds
+                ]
+                chunks = [future.result() for future in futures]
+
+        return self._stitch(chunks, settings, start)
+
+    def chunk_bounds(self, text: str, start: int, end: int) -> list[tuple[int, int]]:
+        """Divide `[start, end)` em blocos que começam sempre em um token novo."""
+        chunk_count = self.max_workers * CHUNKS_PER_WORKER
+        target = max(1, (end - start) // chunk_count)
+
+        bounds: list[tuple[int, int]] = []
+        chunk_start = start
+        while end - chunk_start > target:
+            boundary = CHUNK_BOUNDARY_REGEX.search(text, chunk_start + target, end)
+            if boundary is None:
+                break
+            bounds.append((chunk_start, boundary.start()))
+            chunk_start = boundary.start()
+        bounds.append((chunk_start, end))
+        return bounds
+
+    def _stitch(
+        self,
+        chunks: list[ChunkResult],
+        settings: PlaybackSettings,
+        source_index: int,
+    ) -> EventColumns:
+        octave = settings.octave
+        volume = settings.volume
+        default_length = 4.0
+        resolved: list[EventColumns] = [self._initial_columns(settings, source_index)]
+
+        for chunk in chunks:
+            resolved.append(self._resolve(chunk, octave, volume, default_length))
+            octave = chunk.exit_octave.apply(octave)
+            if chunk.exit_volume != UNKNOWN_VOLUME:
+                volume = chunk.exit_volume
+            if chunk.exit_length != UNKNOWN_LENGTH:
+                default_length = chunk.exit_length
+
+        columns = EventColumns.concatenate(*resolved)
+
+        # Mesma acumulação sequencial do parser serial (event_time += duração)
+        advance = np.where(
+            (columns.kind == EventKind.NOTE) | (columns.kind == EventKind.REST),
+            columns.duration,
+            0.0,
+        )
+        columns.time[1:] = np.cumsum(advance)[:-1]
+        columns.time[0] = 0.0
+        return columns
+
+    def _resolve(
+        self,
+        chunk: ChunkResult,
+        octave: int,
+        volume: int,
+        default_length: float,
+    ) -> EventColumns:
+        columns = EventColumns.empty(len(chunk.kind))
+        columns.kind[:] = chunk.kind
+        columns.source_index[:] = chunk.source_index
+        columns.source_length[:] = chunk.source_length
+        columns.value[:] = chunk.value
+
+        notes = chunk.kind == EventKind.NOTE
+        timed = notes | (chunk.kind == EventKind.REST)
+
+        octaves = np.minimum(
+            np.maximum(octave + chunk.octave_add, chunk.octave_low), chunk.octave_high
+        )
+        pitches = np.clip(chunk.base_pitch + (octaves - 5) * 12, 0, 127)
+        columns.pitch[notes] = pitches[notes]
+        columns.volume[notes] = np.where(
+            chunk.volume == UNKNOWN_VOLUME, volume, chunk.volume
+        )[notes]
+
+        lengths = np.where(
+            chunk.length == UNKNOWN_LENGTH, default_length, chunk.length
+        ).astype(np.float64)
+        duration = 4.0 / lengths
+        add = duration * 0.5
+        for dot in range(int(chunk.dots.max(initial=0))):
+            dotted = chunk.dots > dot
+            duration[dotted] += add[dotted]
+            add[dotted] *= 0.5
+        columns.duration[timed] = duration[timed]
+        return columns
+
+    def _initial_columns(
+        self, settings: PlaybackSettings, source_index: int
+    ) -> EventColumns:
+        columns = EventColumns.empty(2)
+        columns.kind[:] = (EventKind.TEMPO, EventKind.INSTRUMENT)
+        columns.value[:] = (settings.bpm, settings.instrument_id)
+        columns.source_index[:] = source_index
+        return columns
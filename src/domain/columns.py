@@ -0,0 +1,221 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from domain.events import (
+    InstrumentEvent,
+    MusicalEvent,
+    NoteEvent,
+    RestEvent,
+    SpecificNoteEvent,
+    TempoEvent,
+)
+
+
+class EventKind(IntEnum):
+    """Tipo de cada linha da representação colunar."""
+
+    TEMPO = 0
+    INSTRUMENT = 1
+    NOTE = 2
+    SPECIFIC_NOTE = 3
+    REST = 4
+
+
+@dataclass
+class EventColumns:
+    """Representação colunar e compacta de uma lista de eventos musicais.
+
+    Cada atributo é um array NumPy com uma posição por evento. A coluna
+    `value` guarda o BPM dos eventos de tempo e o programa dos eventos de
+    instrumento e de notas com instrumento específico.
+    """
+
+    kind: npt.NDArray[np.uint8]
+    time: npt.NDArray[np.float64]
+    duration: npt.NDArray[np.float64]
+    pitch: npt.NDArray[np.int16]
+    volume: npt.NDArray[np.int16]
+    value: npt.NDArray[np.int32]
+    source_index: npt.NDArray[np.int64]
+    source_length: npt.NDArray[np.int32]
+    voice: npt.NDArray[np.int16]
+
+    @classmethod
+    def empty(cls, size: int) -> Self:
+        return cls(
+            kind=np.zeros(size, dtype=np.uint8),
+            time=np.zeros(size, dtype=np.float64),
+            duration=np.zeros(size, dtype=np.float64),
+            pitch=np.zeros(size, dtype=np.int16),
+            volume=np.zeros(size, dtype=np.int16),
+            value=np.zeros(size, dtype=np.int32),
+            source_index=np.zeros(size, dtype=np.int64),
+            source_length=np.zeros(size, dtype=np.int32),
+            voice=np.zeros(size, dtype=np.int16),
+        )
+
+    @classmethod
+    def from_events(cls, events: list[MusicalEvent]) -> Self:
+        size = len(events)
+        kind = [0] * size
+        time = [0.0] * size
+        duration = [0.0] * size
+        pitch = [0] * size
+        volume = [0] * size
+        value = [0] * size
+
+        for i, event in enumerate(events):
+            time[i] = event.time
+            match event:
+                case TempoEvent():
+                    kind[i] = EventKind.TEMPO
+                    value[i] = event.bpm
+                case InstrumentEvent():
+                    kind[i] = EventKind.INSTRUMENT
+                    value[i] = event.instrument_id
+                case NoteEvent():
+                    kind[i] = EventKind.NOTE
+                    pitch[i] = event.pitch
+                    volume[i] = event.volume
+                    duration[i] = event.duration
+                case SpecificNoteEvent():
+                    kind[i] = EventKind.SPECIFIC_NOTE
+                    pitch[i] = event.pitch
+                    volume[i] = event.volume
+                    duration[i] = event.duration
+                    value[i] = event.instrument_id
+                case RestEvent():
+                    kind[i] = EventKind.REST
+                    duration[i] = event.duration
+
+        return cls(
+            kind=np.array(kind, dtype=np.uint8),
+            time=np.array(time, dtype=np.float64),
+            duration=np.array(duration, dtype=np.float64),
+            pitch=np.array(pitch, dtype=np.int16),
+            volume=np.array(volume, dtype=np.int16),
+            value=np.array(value, dtype=np.int32),
+            source_index=np.fromiter(
+                (event.source_index for event in events), dtype=np.int64, count=size
+            ),
+            source_length=np.fromiter(
+                (event.source_length for event in events), dtype=np.int32, count=size
+            ),
+            voice=np.fromiter(
+                (event.voice for event in events), dtype=np.int16, count=size
+            ),
+        )
+
+    @classmethod
+    def concatenate(cls, *parts: 'EventColumns') -> Self:
+        return cls(
+            **{
+                name: np.concatenate([getattr(part, name) for part in parts])
+                for name in cls.__dataclass_fields__
+            }
+        )
+
+    def to_events(self) -> list[MusicalEvent]:
+        """Reconstrói os eventos, agrupando as linhas por tipo.
+
+        Cada tipo é montado em um laço próprio, com argumentos posicionais,
+        evitando o despacho por linha, que dominava o custo em listas grandes.
+        """
+        events: list[MusicalEvent | None] = [None] * len(self)
+
+        rows, columns = self._rows_of(EventKind.TEMPO, 'value')
+        for row, time, index, length, voice, bpm in columns:
+            events[row] = TempoEvent(time, index, length, bpm, voice=voice)
+
+        rows, columns = self._rows_of(EventKind.INSTRUMENT, 'value')
+        for row, time, index, length, voice, program in columns:
+            events[row] = InstrumentEvent(time, index, length, program, voice=voice)
+
+        rows, columns = self._rows_of(EventKind.NOTE, 'pitch', 'volume', 'duration')
+        for row, time, index, length, voice, pitch, volume, duration in columns:
+            events[row] = NoteEvent(
+                time, index, length, pitch, volume, duration, voice=voice
+            )
+
+        rows, columns = self._rows_of(
+            EventKind.SPECIFIC_NOTE, 'value', 'pitch', 'volume', 'duration'
+        )
+        for (
+            row,
+            time,
+            index,
+            length,
+            voice,
+            program,
+            pitch,
+            volume,
+            duration,
+        ) in columns:
+            events[row] = SpecificNoteEvent(
+                time, index, length, program, pitch, volume, duration, voice=voice
+            )
+
+        rows, columns = self._rows_of(EventKind.REST, 'duration')
+        for row, time, index, length, voice, duration in columns:
+            events[row] = RestEvent(time, index, length, duration, voice=voice)
+
+        return [event for event in events if event is not None]
+
+    def _rows_of(
+        self, kind: EventKind, *names: str
+    ) -> tuple[npt.NDArray[np.int64], Iterator[tuple[Any, ...]]]:
+        """Linhas de um tipo e um iterador sobre as colunas comuns e pedidas."""
+        rows = np.flatnonzero(self.kind == kind)
+        selected = [
+            self.time,
+            self.source_index,
+            self.source_length,
+            self.voice,
+            *(getattr(self, name) for name in names),
+        ]
+        return rows, zip(
+            rows.tolist(), *(column[rows].tolist() for column in selected), strict=True
+        )
+
+    def copy(self) -> Self:
+        return type(self)(
+            kind=self.kind.copy(),
+            time=self.time.copy(),
+            duration=self.duration.copy(),
+            pitch=self.pitch.copy(),
+            volume=self.volume.copy(),
+            value=self.value.copy(),
+            source_index=self.source_index.copy(),
+            source_length=self.source_length.copy(),
+            voice=self.voice.copy(),
+        )
+
+    def slice(self, start: int, end: int) -> Self:
+        """Visão das linhas `[start, end)` (sem cópia)."""
+        return type(self)(
+            **{
+                name: getattr(self, name)[start:end]
+                for name in self.__dataclass_fields__
+            }
+        )
+
+    def take(self, rows: npt.NDArray[np.int64]) -> Self:
+        """Cópia com as linhas na ordem dada por `rows`."""
+        return type(self)(
+            **{name: getattr(self, name)[rows] for name in self.__dataclass_fields__}
+        )
+
+    def mask(self, *kinds: EventKind) -> npt.NDArray[np.bool_]:
+        """Máscara booleana das linhas dos tipos informados."""
+        mask = np.zeros(len(self.kind), dtype=np.bool_)
+        for kind in kinds:
+            mask |= self.kind == kind
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.kind)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -8,6 +8,7 @@ class MusicalEvent:
     time: float
     source_index: int
     source_length: int
+    voice: int = field(default=0, kw_only=True)
 
 
 @dataclass
@@ -0,0 +1,279 @@
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Final, NamedTuple
+
+from domain.events import MusicalEvent
+from domain.models import ContextState, ParsingContext
+
+DEFAULT_LOOP_COUNT: Final[int] = 2
+# Cada nível de repetição ou macro aninhada custa alguns quadros de pilha
+MAX_NESTING_DEPTH: Final[int] = 64
+# Só a lista completa de eventos fica em memória; `iter_events` não tem limite
+MAX_EXPANDED_EVENTS: Final[int] = 1_000_000
+
+STRUCTURE_REGEX: Final[re.Pattern[str]] = re.compile(
+    r"""
+    (?P<open>\[)                       # Início de repetição
+    |\](?P<count>\d*)                  # Fim de repetição: ]3
+    |\$(?P<macro>[A-Za-z_]\w*)         # Uso de macro: $tema
+    """,
+    re.VERBOSE,
+)
+MACRO_DEFINITION_REGEX: Final[re.Pattern[str]] = re.compile(
+    r'^[ \t]*\$(?P<name>[A-Za-z_]\w*)[ \t]*=(?P<body>[^\n]*)$', re.MULTILINE
+)
+
+SpanParser = Callable[[str, int, int, ParsingContext, list[MusicalEvent]], None]
+
+
+class ExpansionLimitError(ValueError):
+    """Repetições e macros gerariam mais eventos do que `MAX_EXPANDED_EVENTS`."""
+
+
+class Span(NamedTuple):
+    """Trecho de MML sem estrutura, analisado diretamente."""
+
+    start: int
+    end: int
+
+
+class Loop(NamedTuple):
+    body: tuple['Node', ...]
+    repeats: int
+
+
+class MacroCall(NamedTuple):
+    name: str
+
+
+type Node = Span | Loop | MacroCall
+
+
+class Repeat(NamedTuple):
+    """Repetição de um bloco já analisado a partir de um deslocamento."""
+
+    block: 'EventBlock'
+    repeats: int
+    offset: float
+
+
+@dataclass
+class EventBlock:
+    """Corpo analisado uma única vez, com tempos relativos ao seu início.
+
+    As partes são listas de eventos ou repetições de outros blocos, de modo
+    que a expansão completa nunca precisa existir em memória.
+    """
+
+    parts: list[list[MusicalEvent] | Repeat] = field(default_factory=list)
+    duration: float = 0.0
+    exit_state: ContextState | None = None
+
+    def iter_events(self, offset: float = 0.0) -> Iterator[MusicalEvent]:
+        """Gera cópias dos eventos deslocadas para o instante `offset`."""
+        for part in self.parts:
+            if isinstance(part, Repeat):
+                start = offset + part.offset
+                for i in range(part.repeats):
+                    yield from part.block.iter_events(start + i * part.block.duration)
+                continue
+
+            for event in part:
+                # Cópia rasa sem passar pelo protocolo de `copy`, bem mais lento
+                shifted = object.__new__(event.__class__)
+                shifted.__dict__.update(event.__dict__)
+                shifted.time += offset
+                yield shifted
+
+
+def collect_events(events: Iterator[MusicalEvent]) -> list[MusicalEvent]:
+    """Materializa a expansão, recusando-a acima de `MAX_EXPANDED_EVENTS`."""
+    collected: list[MusicalEvent] = []
+    for event in events:
+        if len(collected) >= MAX_EXPANDED_EVENTS:
+            raise ExpansionLimitError(
+                f'As repetições geram mais de {MAX_EXPANDED_EVENTS} eventos'
+            )
+        collected.append(event)
+    return collected
+
+
+def has_structure(text: str) -> bool:
+    return '[' in text or '$' in text
+
+
+def find_macro_definitions(text: str) -> dict[str, Span]:
+    """Localiza as linhas `$nome = corpo`; a última definição prevalece."""
+    return {
+        match.group('name'): Span(match.start('body'), match.end('body'))
+        for match in MACRO_DEFINITION_REGEX.finditer(text)
+    }
+
+
+def definition_lines(text: str) -> list[Span]:
+    return [
+        Span(match.start(), match.end())
+        for match in MACRO_DEFINITION_REGEX.finditer(text)
+    ]
+
+
+def build_nodes(text: str, spans: list[Span]) -> tuple[Node, ...]:
+    """Monta a árvore de repetições e macros dos trechos informados.
+
+    Colchetes além de `MAX_NESTING_DEPTH` níveis são ignorados junto com o
+    fechamento correspondente, e o corpo toca uma única vez.
+    """
+    stack: list[list[Node]] = [[]]
+    ignored = 0  # Aberturas ignoradas ainda sem fechamento
+    for start, end in spans:
+        pos = start
+        for match in STRUCTURE_REGEX.finditer(text, start, end):
+            if match.start() > pos:
+                stack[-1].append(Span(pos, match.start()))
+            pos = match.end()
+
+            if match.group('open'):
+                if len(stack) > MAX_NESTING_DEPTH:
+                    ignored += 1
+                else:
+                    stack.append([])
+            elif match.group('macro'):
+                stack[-1].append(MacroCall(match.group('macro')))
+            elif ignored:
+                ignored -= 1
+            elif len(stack) > 1:
+                count = match.group('count')
+                body = tuple(stack.pop())
+                stack[-1].append(
+                    Loop(body, int(count) if count else DEFAULT_LOOP_COUNT)
+                )
+
+        if pos < end:
+            stack[-1].append(Span(pos, end))
+
+    # Colchetes não fechados tocam o corpo uma única vez
+    while len(stack) > 1:
+        body = tuple(stack.pop())
+        stack[-1].append(Loop(body, 1))
+    return tuple(stack[0])
+
+
+def exclude_spans(start: int, end: int, excluded: list[Span]) -> list[Span]:
+    """Recorta de `[start, end)` os trechos excluídos (definições de macro)."""
+    spans: list[Span] = []
+    pos = start
+    for skip_start, skip_end in excluded:
+        if skip_end <= pos or skip_start >= end:
+            continue
+        if skip_start > pos:
+            spans.append(Span(pos, skip_start))
+        pos = max(pos, skip_end)
+    if pos < end:
+        spans.append(Span(pos, end))
+    return spans
+
+
+class BlockExpander:
+    """Expande repetições e macros reaproveitando blocos já analisados.
+
+    Cada corpo é analisado uma vez por estado de entrada (oitava, volume,
+    comprimento, tempo e instrumento); as demais ocorrências reutilizam o
+    bloco com um deslocamento de tempo. Macros chamadas além de
+    `MAX_NESTING_DEPTH` níveis são ignoradas, como as recursivas.
+    """
+
+    def __init__(self, text: str, parse_span: SpanParser) -> None:
+        self.text: str = text
+        self.parse_span: SpanParser = parse_span
+        self.macros: dict[str, Span] = find_macro_definitions(text)
+        self._macro_nodes: dict[str, tuple[Node, ...]] = {}
+        # O corpo compilado depende também das macros que seriam ignoradas
+        self._blocks: dict[
+            tuple[int, ContextState, frozenset[str], int], EventBlock
+        ] = {}
+        self._expanding: set[str] = set()
+        self._depth: int = 0
+
+    def compile(self, nodes: tuple[Node, ...], context: ParsingContext) -> EventBlock:
+        """Analisa os nós a partir do estado atual, que termina no estado de saída."""
+        saved_time = context.event_time
+        context.event_time = 0.0
+        block = EventBlock()
+        flat: list[MusicalEvent] = []
+
+        for node in nodes:
+            match node:
+                case Span(start, end):
+                    self.parse_span(self.text, start, end, context, flat)
+                case Loop(body, repeats):
+                    if flat:
+                        block.parts.append(flat)
+                        flat = []
+                    self._append_repeats(block, body, repeats, context)
+                case MacroCall(name):
+                    body = self._macro_body(name)
+                    if (
+                        body is None
+                        or name in self._expanding
+                        or self._depth >= MAX_NESTING_DEPTH
+                    ):
+                        continue
+                    if flat:
+                        block.parts.append(flat)
+                        flat = []
+                    self._expanding.add(name)
+                    self._append_repeats(block, body, 1, context)
+                    self._expanding.discard(name)
+
+        if flat:
+            block.parts.append(flat)
+        block.duration = context.event_time
+        block.exit_state = context.snapshot()
+        context.event_time = saved_time
+        return block
+
+    def _append_repeats(
+        self,
+        block: EventBlock,
+        body: tuple[Node, ...],
+        repeats: int,
+        context: ParsingContext,
+    ) -> None:
+        remaining = repeats
+        while remaining > 0:
+            entry_state = context.snapshot()
+            self._depth += 1
+            inner = self._block_for(body, context)
+            self._depth -= 1
+            # Ponto fixo: as próximas repetições partem sempre do mesmo estado
+            times = remaining if inner.exit_state == entry_state else 1
+            block.parts.append(Repeat(inner, times, context.event_time))
+            context.event_time += inner.duration * times
+            remaining -= times
+
+    def _block_for(self, body: tuple[Node, ...], context: ParsingContext) -> EventBlock:
+        key = (
+            id(body),
+            context.snapshot(),
+            frozenset(self._expanding),
+            self._depth,
+        )
+        block = self._blocks.get(key)
+        if block is None:
+            block = self.compile(body, context)
+            self._blocks[key] = block
+        else:
+            assert block.exit_state is not None
+            context.restore(block.exit_state)
+        return block
+
+    def _macro_body(self, name: str) -> tuple[Node, ...] | None:
+        nodes = self._macro_nodes.get(name)
+        if nodes is None:
+            span = self.macros.get(name)
+            if span is None:
+                return None
+            nodes = build_nodes(self.text, [span])
+            self._macro_nodes[name] = nodes
+        return nodes
@@ -0,0 +1,19 @@
+import re
+from typing import Final
+
+# Compartilhados pelo parser serial e pelos blocos paralelos de `chunked_mml`
+TOKEN_REGEX_MML: Final[re.Pattern[str]] = re.compile(
+    r"""
+    (?P<note>[A-H][#\+\-b]?)      # Notas: A-H, mais acidentes
+    |(?P<rest>[RP])               # Pausas
+    |(?P<octave_set>O(?=\d))      # Definir oitava: O5
+    |(?P<octave_up>>+)            # Subir oitava
+    |(?P<octave_down><+)          # Descer oitava
+    |(?P<length_set>L(?=\d))      # Comprimento padrão: L4
+    |(?P<tempo>T(?=\d))           # Tempo: T120
+    |(?P<volume>V(?=\d))          # Volume: V100
+    |(?P<instrument>I(?=\d))      # Instrumento: I0
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+NUMBER_REGEX: Final[re.Pattern[str]] = re.compile(r'\d+')
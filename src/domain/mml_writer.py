@@ -0,0 +1,207 @@
+from typing import Final, NamedTuple
+
+from config import MIDI_BASE_NOTES
+
+# Notas e pausas planejadas juntas; o custo do plano cresce linearmente
+PHRASE_MAX_ITEMS: Final[int] = 256
+MAX_RELATIVE_OCTAVE_STEPS: Final[int] = 2  # Até aqui `>>` não é maior que `O7`
+DEFAULT_LENGTH: Final[int] = 4
+DEFAULT_OCTAVE: Final[int] = 5
+MAX_OCTAVE: Final[int] = 10  # O parser limita `O` a 0..10
+
+# Nome de cada classe de altura; as que faltam usam a nota abaixo com `#`
+PITCH_NAMES: Final[dict[int, str]] = {
+    pitch % 12: name for name, pitch in MIDI_BASE_NOTES.items()
+}
+
+
+def pitch_name(pitch_class: int) -> str:
+    name = PITCH_NAMES.get(pitch_class)
+    if name is None:
+        name = f'{PITCH_NAMES.get((pitch_class - 1) % 12, "C")}#'
+    return name
+
+
+def octave_move(current: int, target: int) -> str:
+    """Comando mais curto que leva da oitava `current` à `target`."""
+    steps = target - current
+    if not steps:
+        return ''
+    if abs(steps) <= MAX_RELATIVE_OCTAVE_STEPS:
+        return ('>' if steps > 0 else '<') * abs(steps)
+    return f'O{target}'
+
+
+def spellings(pitch: int) -> list[tuple[int, str]]:
+    """Oitavas e nomes que produzem a altura: dó também é `B#` na oitava de
+    baixo e si é `C-` na de cima."""
+    octave, pitch_class = divmod(pitch, 12)
+    options = [(octave, pitch_name(pitch_class))]
+    if pitch_class == 0 and octave > 0:
+        options.append((octave - 1, 'B#'))
+    elif pitch_class == 11 and octave < MAX_OCTAVE:
+        options.append((octave + 1, 'C-'))
+    return options
+
+
+class _Timed(NamedTuple):
+    """Nota (com altura) ou pausa da frase, com o comprimento separado em
+    número e pontos."""
+
+    pitch: int | None
+    number: int
+    dots: int
+
+
+class MMLWriter:
+    """Monta texto MML compacto a partir de notas e pausas já quantizadas.
+
+    Notas e pausas são agrupadas em frases de até `PHRASE_MAX_ITEMS`
+    itens. Em cada frase, uma programação dinâmica escolhe onde trocar o
+    padrão `L` para que o texto fique o mais curto possível, e as notas e
+    pausas com o comprimento padrão o omitem. Outra escolhe a oitava de
+    cada nota, grafando dó como `B#` ou si como `C-` quando isso poupa
+    mudanças de oitava; as curtas usam `>`/`<`. Os separadores só aparecem
+    onde o parser leria outra coisa: um `B` logo após uma nota sem
+    comprimento seria o bemol dela (`CB` é dó bemol).
+    """
+
+    def __init__(self, volume: int = 100, instrument: int = 0) -> None:
+        self.octave: int = DEFAULT_OCTAVE
+        self.volume: int = volume
+        self.instrument: int = instrument
+        self.default_length: int = DEFAULT_LENGTH
+        self._parts: list[str] = []
+        self._phrase: list[str | _Timed] = []
+        self._phrase_items: int = 0
+
+    def set_instrument(self, instrument: int) -> None:
+        if instrument != self.instrument:
+            self._phrase.append(f'I{instrument}')
+            self.instrument = instrument
+
+    def set_volume(self, volume: int) -> None:
+        if volume != self.volume:
+            self._phrase.append(f'V{volume}')
+            self.volume = volume
+
+    def add_note(self, pitch: int, length: str) -> None:
+        """Acrescenta uma nota; `length` segue a sintaxe MML (ex.: `8.`)."""
+        self._add_timed(pitch, length)
+
+    def add_rest(self, length: str) -> None:
+        self._add_timed(None, length)
+
+    def text(self) -> str:
+        self._flush()
+        return ''.join(self._parts)
+
+    def _add_timed(self, pitch: int | None, length: str) -> None:
+        number = length.rstrip('.')
+        self._phrase.append(_Timed(pitch, int(number), len(length) - len(number)))
+        self._phrase_items += 1
+        if self._phrase_items >= PHRASE_MAX_ITEMS:
+            self._flush()
+
+    def _plan_default_lengths(self, timed: list[_Timed]) -> list[int]:
+        """Padrão `L` em vigor em cada item que minimiza o texto da frase.
+
+        O custo de cada padrão é a soma dos dígitos escritos mais os comandos
+        `L`; como trocar de padrão custa o mesmo vindo de qualquer outro, cada
+        passo só precisa do melhor custo anterior.
+        """
+        candidates = {item.number for item in timed} | {self.default_length}
+        # Começar em outro padrão equivale a trocá-lo antes do primeiro item
+        cost = {
+            length: 0 if length == self.default_length else 1 + len(str(length))
+            for length in candidates
+        }
+        previous: list[dict[int, int]] = []
+        for item in timed:
+            best = min(cost, key=cost.__getitem__)
+            digits = len(str(item.number))
+            step_cost: dict[int, int] = {}
+            step_previous: dict[int, int] = {}
+            for length, stay in cost.items():
+                switch = cost[best] + 1 + len(str(length))
+                if switch < stay:
+                    step_cost[length], step_previous[length] = switch, best
+                else:
+                    step_cost[length], step_previous[length] = stay, length
+                if length != item.number:
+                    step_cost[length] += digits
+            cost = step_cost
+            previous.append(step_previous)
+
+        plan = [0] * len(timed)
+        length = min(cost, key=cost.__getitem__)
+        for position in range(len(timed) - 1, -1, -1):
+            plan[position] = length
+            length = previous[position][length]
+        return plan
+
+    def _plan_octaves(self, pitches: list[int]) -> list[tuple[int, str]]:
+        """Oitava e grafia de cada nota que minimizam as mudanças de oitava.
+
+        Os estados são as oitavas possíveis após cada nota; o custo soma os
+        comandos de oitava e o nome escrito (`B#` e `C-` custam um a mais).
+        """
+        if not pitches:
+            return []
+        cost = {self.octave: 0}
+        previous: list[dict[int, tuple[int, str]]] = []
+        for pitch in pitches:
+            step_cost: dict[int, int] = {}
+            step_previous: dict[int, tuple[int, str]] = {}
+            for octave, name in spellings(pitch):
+                arrival = {
+                    start: total + len(octave_move(start, octave))
+                    for start, total in cost.items()
+                }
+                start = min(arrival, key=arrival.__getitem__)
+                step_cost[octave] = arrival[start] + len(name)
+                step_previous[octave] = (start, name)
+            cost = step_cost
+            previous.append(step_previous)
+
+        plan: list[tuple[int, str]] = [(0, '')] * len(pitches)
+        octave = min(cost, key=cost.__getitem__)
+        for position in range(len(pitches) - 1, -1, -1):
+            start, name = previous[position][octave]
+            plan[position] = (octave, name)
+            octave = start
+        return plan
+
+    def _flush(self) -> None:
+        timed = [item for item in self._phrase if isinstance(item, _Timed)]
+        lengths = iter(self._plan_default_lengths(timed))
+        notes = iter(
+            self._plan_octaves([item.pitch for item in timed if item.pitch is not None])
+        )
+        for item in self._phrase:
+            if isinstance(item, str):
+                self._emit(item)
+                continue
+            name = 'R'
+            if item.pitch is not None:
+                octave, name = next(notes)
+                if move := octave_move(self.octave, octave):
+                    self._emit(move)
+                self.octave = octave
+            default = next(lengths)
+            if default != self.default_length:
+                self._emit(f'L{default}')
+                self.default_length = default
+            number = '' if item.number == default else str(item.number)
+            self._emit(f'{name}{number}{"." * item.dots}')
+        self._phrase.clear()
+        self._phrase_items = 0
+
+    def _emit(self, token: str) -> None:
+        if (
+            token[0] in 'Bb'
+            and self._parts
+            and self._parts[-1][-1] in PITCH_NAMES.values()
+        ):
+            self._parts.append(' ')
+        self._parts.append(token)
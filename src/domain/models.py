@@ -1,4 +1,6 @@
+import random
 from dataclasses import dataclass
+from typing import NamedTuple
 
 
 @dataclass
@@ -9,6 +11,18 @@ class PlaybackSettings:
     volume: int = 100
     octave: int = 5
     instrument_id: int = 0
+    bank: int = 0  # Banco do preset no SoundFont (0 = General MIDI)
+    seed: int | None = None  # Semente dos comandos aleatórios; None = imprevisível
+
+
+class ContextState(NamedTuple):
+    """Parte do contexto que influencia a análise de um trecho (exceto o tempo)."""
+
+    octave: int
+    volume: int
+    bpm: int
+    instrument_id: int
+    default_length: float
 
 
 class ParsingContext:
@@ -21,3 +35,21 @@ class ParsingContext:
         self.instrument_id: int = settings.instrument_id
         self.default_length: float = 4.0  # Default to Quarter note (1/4)
         self.event_time: float = 0.0
+        self.voice: int = 0
+        self.random: random.Random = random.Random(settings.seed)
+
+    def snapshot(self) -> ContextState:
+        return ContextState(
+            octave=self.octave,
+            volume=self.volume,
+            bpm=self.bpm,
+            instrument_id=self.instrument_id,
+            default_length=self.default_length,
+        )
+
+    def restore(self, state: ContextState) -> None:
+        self.octave = state.octave
+        self.volume = state.volume
+        self.bpm = state.bpm
+        self.instrument_id = state.instrument_id
+        self.default_length = state.default_length
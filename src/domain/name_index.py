@@ -0,0 +1,56 @@
+from collections.abc import Hashable, Iterable
+from functools import cached_property
+
+
+class NameIndex[K: Hashable]:
+    """Índice pré-calculado de uma lista de nomes (instrumentos, presets).
+
+    Mantém a ordem de exibição e resolve nome → chave, chave → nome e
+    chave → posição por dicionário. A busca usa a mesma regra do
+    `Gtk.StringFilter` (substring, sem diferenciar maiúsculas): todas as
+    substrings dos nomes são indexadas na primeira busca, e cada consulta
+    custa uma única busca no dicionário.
+    """
+
+    def __init__(self, entries: Iterable[tuple[K, str]]) -> None:
+        pairs = list(entries)
+        self.keys: tuple[K, ...] = tuple(key for key, _name in pairs)
+        self.names: tuple[str, ...] = tuple(name for _key, name in pairs)
+        self._name_by_key: dict[K, str] = dict(pairs)
+        self._key_by_name: dict[str, K] = {name.casefold(): key for key, name in pairs}
+        self._position_by_key: dict[K, int] = {
+            key: position for position, key in enumerate(self.keys)
+        }
+
+    @cached_property
+    def _matches(self) -> dict[str, tuple[int, ...]]:
+        """Posições por substring, montadas na primeira busca."""
+        matches: dict[str, list[int]] = {}
+        for position, name in enumerate(self.names):
+            folded = name.casefold()
+            substrings = {
+                folded[start:end]
+                for start in range(len(folded))
+                for end in range(start + 1, len(folded) + 1)
+            }
+            for substring in substrings:
+                matches.setdefault(substring, []).append(position)
+        return {substring: tuple(found) for substring, found in matches.items()}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def name_of(self, key: K) -> str | None:
+        return self._name_by_key.get(key)
+
+    def key_of(self, name: str) -> K | None:
+        return self._key_by_name.get(name.casefold())
+
+    def position_of(self, key: K) -> int | None:
+        return self._position_by_key.get(key)
+
+    def search(self, query: str) -> tuple[int, ...]:
+        """Posições dos nomes que contêm `query`, em ordem de exibição."""
+        if not query:
+            return tuple(range(len(self.names)))
+        return self._matches.get(query.casefold(), ())
@@ -0,0 +1,50 @@
+import functools
+import math
+import os
+from pathlib import Path
+from typing import Final
+
+# Cota de CPU vista de dentro do próprio cgroup (containers): v2 e v1
+CGROUP_V2_CPU_MAX: Final[Path] = Path('/sys/fs/cgroup/cpu.max')
+CGROUP_V1_CPU_QUOTA: Final[Path] = Path('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+CGROUP_V1_CPU_PERIOD: Final[Path] = Path('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+
+
+def available_cpu_count() -> int:
+    """Núcleos que este processo pode usar, respeitando afinidade e cota de CPU.
+
+    `os.cpu_count()` conta todos os núcleos da máquina, mesmo os que o
+    processo não pode ocupar; onde não há `sched_getaffinity`, é o melhor
+    palpite disponível. Uma cota do cgroup (`cpu.max`, ou `cfs_quota_us` no
+    v1) limita o resultado ao número de núcleos que ela paga, arredondado
+    para cima.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        count = len(os.sched_getaffinity(0)) or 1
+    else:
+        count = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        count = min(count, max(1, math.ceil(quota)))
+    return count
+
+
+@functools.cache
+def _cgroup_cpu_quota() -> float | None:
+    """Cota em núcleos (cota / período), ou None se não houver limite."""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+    except (OSError, ValueError):
+        try:
+            quota = CGROUP_V1_CPU_QUOTA.read_text().strip()
+            period = CGROUP_V1_CPU_PERIOD.read_text().strip()
+        except OSError:
+            return None
+
+    if quota in ('max', '-1'):
+        return None
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
@@ -1,9 +1,12 @@
-import random
+import heapq
+import multiprocessing
 import re
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from enum import StrEnum
-from typing import Final, override
+from operator import attrgetter
+from typing import TYPE_CHECKING, Final, override
 
 from config import MIDI_BASE_NOTES
 from domain.events import (
@@ -13,7 +16,28 @@ from domain.events import (
     RestEvent,
     TempoEvent,
 )
+from domain.mml_blocks import (
+    BlockExpander,
+    Span,
+    build_nodes,
+    collect_events,
+    definition_lines,
+    exclude_spans,
+    has_structure,
+)
+from domain.mml_tokens import NUMBER_REGEX, TOKEN_REGEX_MML
 from domain.models import ParsingContext, PlaybackSettings
+from domain.parallel import available_cpu_count
+
+if TYPE_CHECKING:
+    from domain.columns import EventColumns
+
+# Textos MML com várias vozes a partir deste tamanho são analisados em processos
+PARALLEL_PARSE_MIN_CHARS: Final[int] = 256 * 1024
+# Uma única voz a partir deste tamanho é dividida em blocos paralelos
+CHUNKED_PARSE_MIN_CHARS: Final[int] = 4 * 1024 * 1024
+# Textos no modo Padrão a partir deste tamanho usam o caminho vetorizado
+VECTORIZED_PARSE_MIN_CHARS: Final[int] = 64 * 1024
 
 
 class ParsingMode(StrEnum):
@@ -30,59 +54,218 @@ class MusicParser(ABC):
     def parse(self, text: str, settings: PlaybackSettings) -> list[MusicalEvent]:
         """Converte o texto de entrada em uma lista de eventos musicais."""
 
+    def parse_score(
+        self, text: str, settings: PlaybackSettings
+    ) -> 'list[MusicalEvent] | EventColumns':
+        """Como `parse`, mas devolve as colunas quando o caminho já é colunar.
+
+        Quem transforma ou exporta a partitura evita assim recriar os eventos
+        só para convertê-los de volta em colunas.
+        """
+        return self.parse(text, settings)
+
 
 class MMLParser(MusicParser):
     """Estratégia concreta para o formato MML (Music Macro Language)."""
 
-    TOKEN_REGEX_MML: Final[re.Pattern[str]] = re.compile(
-        r"""
-        (?P<note>[A-H][#\+\-b]?)      # Notas: A-H, mais acidentes
-        |(?P<rest>[RP])               # Pausas
-        |(?P<octave_set>O(?=\d))      # Definir oitava: O5
-        |(?P<octave_up>>+)            # Subir oitava
-        |(?P<octave_down><+)          # Descer oitava
-        |(?P<length_set>L(?=\d))      # Comprimento padrão: L4
-        |(?P<tempo>T(?=\d))           # Tempo: T120
-        |(?P<volume>V(?=\d))          # Volume: V100
-        |(?P<instrument>I(?=\d))      # Instrumento: I0
-        """,
-        re.VERBOSE | re.IGNORECASE,
-    )
+    TOKEN_REGEX_MML: Final[re.Pattern[str]] = TOKEN_REGEX_MML
+    NUMBER_REGEX: Final[re.Pattern[str]] = NUMBER_REGEX
+    VOICE_SEPARATOR_REGEX: Final[re.Pattern[str]] = re.compile(r'[;,]')
 
     @override
     def parse(self, text: str, settings: PlaybackSettings) -> list[MusicalEvent]:
+        score = self.parse_score(text, settings)
+        return score if isinstance(score, list) else score.to_events()
+
+    @override
+    def parse_score(
+        self, text: str, settings: PlaybackSettings
+    ) -> 'list[MusicalEvent] | EventColumns':
+        if has_structure(text):
+            return collect_events(self.iter_events(text, settings))
+
+        voices = self._split_voices(text)
+        if len(voices) == 1:
+            start, end = voices[0]
+            if end - start >= CHUNKED_PARSE_MIN_CHARS and available_cpu_count() > 1:
+                return self._parse_in_chunks(text, settings, start, end)
+            return self.parse_voice(text, settings, voice=0, start=start, end=end)
+
+        workers = min(len(voices), available_cpu_count())
+        if len(text) >= PARALLEL_PARSE_MIN_CHARS and workers > 1:
+            return self._parse_voices_in_parallel(text, settings, voices, workers)
+
+        timelines = [
+            self.parse_voice(text, settings, voice=voice, start=start, end=end)
+            for voice, (start, end) in enumerate(voices)
+        ]
+        # Cada voz já está em ordem temporal; em empates prevalece a ordem das vozes.
+        return list(heapq.merge(*timelines, key=attrgetter('time')))
+
+    def parse_voice(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        voice: int = 0,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[MusicalEvent]:
+        """Analisa o trecho `text[start:end]` como uma voz independente."""
+        end = len(text) if end is None else end
         context = ParsingContext(settings)
-        events = self._initialize_events(context)
+        context.voice = voice
+        events = self._initialize_events(context, start)
+        self._parse_span(text, start, end, context, events)
+        return events
 
-        pos = 0
-        text_len = len(text)
+    def iter_events(
+        self, text: str, settings: PlaybackSettings
+    ) -> Iterator[MusicalEvent]:
+        """Gera os eventos sob demanda, expandindo repetições e macros aos poucos.
+
+        Suporta `[ ... ]n` (repete n vezes, 2 por padrão) e macros definidas em
+        linhas `$nome = corpo` e usadas como `$nome`. Não há limite de tamanho:
+        só `parse` e `parse_score`, que guardam a lista, recusam expansões com
+        mais de `MAX_EXPANDED_EVENTS` eventos.
+        """
+        if not has_structure(text):
+            yield from self.parse(text, settings)
+            return
+
+        definitions = definition_lines(text)
+        voices = self._split_voices(text, definitions)
+        timelines = [
+            self._iter_voice(text, settings, voice, start, end, definitions)
+            for voice, (start, end) in enumerate(voices)
+        ]
+        yield from heapq.merge(*timelines, key=attrgetter('time'))
 
-        while pos < text_len:
-            match = self.TOKEN_REGEX_MML.match(text, pos)
+    def _iter_voice(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        voice: int,
+        start: int,
+        end: int,
+        definitions: list[Span],
+    ) -> Iterator[MusicalEvent]:
+        context = ParsingContext(settings)
+        context.voice = voice
+        yield from self._initialize_events(context, start)
+
+        nodes = build_nodes(text, exclude_spans(start, end, definitions))
+        block = BlockExpander(text, self._parse_span).compile(nodes, context)
+        yield from block.iter_events()
+
+    def _parse_span(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        context: ParsingContext,
+        events: list[MusicalEvent],
+    ) -> None:
+        pos = start
+        while pos < end:
+            match = self.TOKEN_REGEX_MML.match(text, pos, end)
             if not match:
                 pos += 1
                 continue
 
             pos = self._process_token(match, text, pos, context, events)
 
-        return events
+    def _split_voices(
+        self, text: str, excluded: list[Span] | None = None
+    ) -> list[tuple[int, int]]:
+        """Divide o texto nos separadores de voz, ignorando vozes vazias.
+
+        Separadores dentro dos trechos excluídos (definições de macro) não
+        contam.
+        """
+        excluded = excluded or []
+        voices: list[tuple[int, int]] = []
+        start = 0
+        for separator in self.VOICE_SEPARATOR_REGEX.finditer(text):
+            position = separator.start()
+            if any(s <= position < e for s, e in excluded):
+                continue
+            voices.append((start, position))
+            start = separator.end()
+        voices.append((start, len(text)))
+
+        non_empty = [
+            (s, e)
+            for s, e in voices
+            if any(text[a:b].strip() for a, b in exclude_spans(s, e, excluded))
+        ]
+        return non_empty or [(0, len(text))]
 
-    def _initialize_events(self, context: ParsingContext) -> list[MusicalEvent]:
-        """Cria a lista inicial de eventos com configurações padrão."""
-        return [
-            TempoEvent(
-                time=0.0,
-                bpm=context.bpm,
-                source_index=0,
-                source_length=0,
-            ),
+    def _parse_voices_in_parallel(
+        self,
+        text: str,
+        settings: PlaybackSettings,
+        voices: list[tuple[int, int]],
+        workers: int,
+    ) -> 'EventColumns':
+        """Analisa cada voz em um processo e intercala as colunas devolvidas.
+
+        Arrays atravessam o limite entre processos bem mais rápido que listas
+        de objetos.
+        """
+        import numpy as np
+
+        from domain.columns import EventColumns
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _parse_mml_voice, text[start:end], start, settings, voice
+                )
+                for voice, (start, end) in enumerate(voices)
+            ]
+            columns = EventColumns.concatenate(*(future.result() for future in futures))
+
+        # Ordenação estável: em empates prevalece a ordem das vozes, como no merge
+        order = np.argsort(columns.time, kind='stable')
+        return columns.take(order)
+
+    def _parse_in_chunks(
+        self, text: str, settings: PlaybackSettings, start: int, end: int
+    ) -> 'EventColumns':
+        """Analisa uma voz muito grande em blocos paralelos (ver `chunked_mml`)."""
+        from domain.chunked_mml import ChunkedMMLParser
+
+        return ChunkedMMLParser().parse_columns(text, settings, start, end)
+
+    def _initialize_events(
+        self, context: ParsingContext, source_index: int = 0
+    ) -> list[MusicalEvent]:
+        """Cria a lista inicial de eventos com configurações padrão.
+
+        Apenas a primeira voz define o tempo inicial; as demais só precisam do
+        próprio instrumento.
+        """
+        events: list[MusicalEvent] = []
+        if context.voice == 0:
+            events.append(
+                TempoEvent(
+                    time=0.0,
+                    bpm=context.bpm,
+                    source_index=source_index,
+                    source_length=0,
+                )
+            )
+        events.append(
             InstrumentEvent(
                 time=0.0,
                 instrument_id=context.instrument_id,
-                source_index=0,
+                source_index=source_index,
                 source_length=0,
-            ),
-        ]
+                voice=context.voice,
+            )
+        )
+        return events
 
     def _process_token(
         self,
@@ -141,6 +324,7 @@ class MMLParser(MusicParser):
                 duration=duration,
                 source_index=start_idx,
                 source_length=new_pos - start_idx,
+                voice=context.voice,
             )
         )
         context.event_time += duration
@@ -163,6 +347,7 @@ class MMLParser(MusicParser):
                 duration=duration,
                 source_index=start_idx,
                 source_length=new_pos - start_idx,
+                voice=context.voice,
             )
         )
         context.event_time += duration
@@ -194,6 +379,7 @@ class MMLParser(MusicParser):
                         bpm=context.bpm,
                         source_index=start_idx,
                         source_length=length,
+                        voice=context.voice,
                     )
                 )
             case 'volume':
@@ -206,6 +392,7 @@ class MMLParser(MusicParser):
                         instrument_id=context.instrument_id,
                         source_index=start_idx,
                         source_length=length,
+                        voice=context.voice,
                     )
                 )
 
@@ -227,9 +414,9 @@ class MMLParser(MusicParser):
         return match.end()
 
     def _read_number(self, text: str, pos: int) -> tuple[int, int]:
-        match = re.match(r'\d+', text[pos:])
+        match = self.NUMBER_REGEX.match(text, pos)
         if match:
-            return int(match.group()), pos + match.end()
+            return int(match.group()), match.end()
         return 0, pos
 
     def _calculate_duration(
@@ -261,6 +448,7 @@ class StandardParser(MusicParser):
     """Estratégia concreta para o formato Padrão usando Dispatch Table."""
 
     NOTE_DURATION: Final[float] = 1.0
+    RANDOM_NOTE_CHOICES: Final[tuple[int, ...]] = tuple(MIDI_BASE_NOTES.values())
 
     def __init__(self) -> None:
         self.dispatch_table: dict[
@@ -273,6 +461,9 @@ class StandardParser(MusicParser):
 
     @override
     def parse(self, text: str, settings: PlaybackSettings) -> list[MusicalEvent]:
+        if len(text) >= VECTORIZED_PARSE_MIN_CHARS:
+            return self._parse_vectorized(text, settings).to_events()
+
         context = ParsingContext(settings)
         events = self._initialize_events(context)
 
@@ -289,6 +480,24 @@ class StandardParser(MusicParser):
 
         return events
 
+    @override
+    def parse_score(
+        self, text: str, settings: PlaybackSettings
+    ) -> 'list[MusicalEvent] | EventColumns':
+        if len(text) >= VECTORIZED_PARSE_MIN_CHARS:
+            return self._parse_vectorized(text, settings)
+        return self.parse(text, settings)
+
+    def _parse_vectorized(
+        self, text: str, settings: PlaybackSettings
+    ) -> 'EventColumns':
+        """Caminho NumPy para textos grandes (ver `standard_vectorized`)."""
+        from domain.standard_vectorized import VectorizedStandardParser
+
+        return VectorizedStandardParser(self.RANDOM_NOTE_CHOICES).parse_columns(
+            text, settings
+        )
+
     def _initialize_events(self, context: ParsingContext) -> list[MusicalEvent]:
         return [
             TempoEvent(
@@ -482,7 +691,7 @@ class StandardParser(MusicParser):
         events: list[MusicalEvent],
         _last_pitch: int | None,
     ) -> tuple[int, int]:
-        random_note = random.choice(list(MIDI_BASE_NOTES.values()))
+        random_note = context.random.choice(self.RANDOM_NOTE_CHOICES)
         pitch = random_note + ((context.octave - 5) * 12)
         pitch = max(0, min(127, pitch))
 
@@ -507,7 +716,7 @@ class StandardParser(MusicParser):
         events: list[MusicalEvent],
         last_pitch: int | None,
     ) -> tuple[int | None, int]:
-        context.instrument_id = random.randint(0, 127)
+        context.instrument_id = context.random.randint(0, 127)
         events.append(
             InstrumentEvent(
                 time=context.event_time,
@@ -538,16 +747,34 @@ class StandardParser(MusicParser):
         return last_pitch, pos + 1
 
 
+def _parse_mml_voice(
+    segment: str, offset: int, settings: PlaybackSettings, voice: int
+) -> 'EventColumns':
+    """Analisa uma voz em um processo auxiliar e reposiciona seus índices."""
+    from domain.columns import EventColumns
+
+    events = MMLParser().parse_voice(segment, settings, voice=voice)
+    columns = EventColumns.from_events(events)
+    columns.source_index += offset
+    return columns
+
+
 class TextParser:
     """Facade para selecionar a estratégia de parsing apropriada."""
 
     def parse(
         self, text: str, settings: PlaybackSettings, mode: ParsingMode
     ) -> list[MusicalEvent]:
+        return self._strategy(mode).parse(text, settings)
+
+    def parse_score(
+        self, text: str, settings: PlaybackSettings, mode: ParsingMode
+    ) -> 'list[MusicalEvent] | EventColumns':
+        return self._strategy(mode).parse_score(text, settings)
+
+    def _strategy(self, mode: ParsingMode) -> MusicParser:
         match mode:
             case ParsingMode.STANDARD:
-                strategy = StandardParser()
+                return StandardParser()
             case ParsingMode.MML:
-                strategy = MMLParser()
-
-        return strategy.parse(text, settings)
+                return MMLParser()
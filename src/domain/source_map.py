@@ -0,0 +1,59 @@
+import re
+from bisect import bisect_right
+from collections.abc import Callable
+from itertools import accumulate
+from typing import Final, NamedTuple
+
+# Mesmos separadores de linha do `Gtk.TextBuffer`
+LINE_BREAK_REGEX: Final[re.Pattern[str]] = re.compile(r'\r\n|[\n\r\u2029]')
+
+
+class SourcePosition(NamedTuple):
+    line: int
+    column: int
+
+
+class SourceSpan(NamedTuple):
+    """Trecho do texto em linhas e colunas (em caracteres), fim exclusivo."""
+
+    start: SourcePosition
+    end: SourcePosition
+
+
+class SourceMap:
+    """Índice de linhas do texto analisado.
+
+    Guarda o deslocamento de início de cada linha, de modo que converter o
+    `source_index` de um evento em linha e coluna custa uma busca binária,
+    independentemente do tamanho do texto.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.line_starts: list[int]
+        if '\r' in text or '\u2029' in text:
+            self.line_starts = [0]
+            self.line_starts.extend(
+                match.end() for match in LINE_BREAK_REGEX.finditer(text)
+            )
+        else:
+            # Caso comum, só com '\n': somas acumuladas dos tamanhos das linhas
+            lengths = (len(line) + 1 for line in text.split('\n')[:-1])
+            self.line_starts = [0, *accumulate(lengths)]
+
+    def position(self, offset: int) -> SourcePosition:
+        line = bisect_right(self.line_starts, offset) - 1
+        return SourcePosition(line, offset - self.line_starts[line])
+
+    def span(self, index: int, length: int) -> SourceSpan:
+        return SourceSpan(self.position(index), self.position(index + length))
+
+    def span_callback(
+        self, callback: Callable[[SourceSpan], None]
+    ) -> Callable[[int, int], None]:
+        """Adapta um destino de trechos ao progresso (índice, tamanho) dos players."""
+
+        def on_progress(index: int, length: int) -> None:
+            if length > 0:
+                callback(self.span(index, length))
+
+        return on_progress
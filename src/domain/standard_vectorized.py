@@ -0,0 +1,282 @@
+import re
+from enum import IntEnum
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from config import MIDI_BASE_NOTES
+from domain.columns import EventColumns, EventKind
+from domain.models import ParsingContext, PlaybackSettings
+
+BPM_UP_REGEX: Final[re.Pattern[str]] = re.compile(r'BPM\+')
+BPM_STEP: Final[int] = 80
+VOWEL_INSTRUMENT: Final[int] = 124  # Telefone (GM 124)
+VOWEL_DEFAULT_PITCH: Final[int] = 60
+ASCII_SIZE: Final[int] = 128
+
+
+class CharClass(IntEnum):
+    """Classe de cada caractere no modo Padrão, igual à tabela de despacho."""
+
+    DEFAULT = 0
+    NOTE = 1
+    VOWEL = 2
+    OCTAVE_UP = 3
+    OCTAVE_DOWN = 4
+    VOLUME = 5
+    RANDOM_NOTE = 6
+    NEWLINE = 7
+    REST = 8
+    BPM_UP = 9
+    SKIP = 10  # 'PM+' consumidos por um 'BPM+'
+
+
+CLASS_BY_KEY: Final[dict[str, CharClass]] = {
+    '+': CharClass.OCTAVE_UP,
+    '-': CharClass.OCTAVE_DOWN,
+    ' ': CharClass.VOLUME,
+    '?': CharClass.RANDOM_NOTE,
+    '\n': CharClass.NEWLINE,
+    ';': CharClass.REST,
+    **{char: CharClass.NOTE for char in 'ABCDEFGH'},
+    **{char: CharClass.VOWEL for char in 'OIU'},
+}
+
+
+def _classify_char(char: str) -> tuple[CharClass, int]:
+    """Classe e altura base de um caractere, como no `StandardParser`."""
+    key = char.upper()
+    char_class = CLASS_BY_KEY.get(key, CharClass.DEFAULT)
+    pitch = 70 if key == 'H' else MIDI_BASE_NOTES.get(key, 60)
+    return char_class, pitch if char_class == CharClass.NOTE else 0
+
+
+def _build_ascii_tables() -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int16]]:
+    classes = np.zeros(ASCII_SIZE, dtype=np.uint8)
+    pitches = np.zeros(ASCII_SIZE, dtype=np.int16)
+    for code in range(ASCII_SIZE):
+        classes[code], pitches[code] = _classify_char(chr(code))
+    return classes, pitches
+
+
+ASCII_CLASSES, ASCII_PITCHES = _build_ascii_tables()
+
+
+class VectorizedStandardParser:
+    """Caminho rápido do `StandardParser` para textos grandes.
+
+    O texto vira um array de code points classificado por tabela; volume,
+    instantes e durações saem de somas acumuladas, `nonzero` e diferenças
+    entre as posições das notas. Só os casos raros (`BPM+`, mudanças de
+    oitava, `?` e quebras de linha) são percorridos um a um, na ordem do
+    parser escalar, para consumir o gerador aleatório da mesma forma.
+    """
+
+    def __init__(self, random_note_choices: tuple[int, ...]) -> None:
+        # Tabela do `?` recebida do parser escalar: os dois sorteiam igual
+        self.random_note_choices = random_note_choices
+
+    def parse_columns(self, text: str, settings: PlaybackSettings) -> EventColumns:
+        context = ParsingContext(settings)
+        classes, base_pitches = self._classify(text)
+        size = len(classes)
+
+        self._mark_bpm_commands(text, classes)
+
+        pitched = (
+            (classes == CharClass.NOTE)
+            | (classes == CharClass.VOWEL)
+            | (classes == CharClass.RANDOM_NOTE)
+        )
+        pitched_so_far = np.cumsum(pitched)
+
+        # Caracteres padrão estendem a última nota, se houver, e avançam o tempo
+        defaults = (classes == CharClass.DEFAULT) & (pitched_so_far > pitched)
+        advances = pitched | (classes == CharClass.REST) | defaults
+        elapsed = np.cumsum(advances, dtype=np.float64)
+        times = elapsed - advances
+
+        volume_table = self._volume_table(context.volume)
+        volume_steps = np.cumsum(classes == CharClass.VOLUME)
+        volumes = volume_table[np.minimum(volume_steps, len(volume_table) - 1)]
+
+        random_notes, instruments = self._draw_random_values(classes, context)
+        base_pitches[classes == CharClass.RANDOM_NOTE] = random_notes
+
+        fixed = (classes == CharClass.NOTE) | (classes == CharClass.RANDOM_NOTE)
+        fixed_positions = np.flatnonzero(fixed)
+        octaves = self._octaves_at(classes, fixed_positions, context.octave)
+        pitches = np.zeros(size, dtype=np.int64)
+        pitches[fixed_positions] = np.clip(
+            base_pitches[fixed_positions] + (octaves - 5) * 12, 0, 127
+        )
+
+        # Vogais repetem a última altura tocada (60 antes de qualquer nota)
+        vowel_positions = np.flatnonzero(classes == CharClass.VOWEL)
+        last_fixed = np.maximum.accumulate(
+            np.where(fixed, np.arange(size, dtype=np.int64), -1)
+        )[vowel_positions]
+        pitches[vowel_positions] = np.where(
+            last_fixed >= 0, pitches[np.maximum(last_fixed, 0)], VOWEL_DEFAULT_PITCH
+        )
+
+        # Duração das notas: 1 + caracteres padrão até a próxima nota
+        pitched_positions = np.flatnonzero(pitched)
+        default_count = np.cumsum(defaults)
+        next_pitched = np.append(pitched_positions, size)[1:]
+        extensions = np.zeros(size, dtype=np.int64)
+        extensions[pitched_positions] = (
+            default_count[next_pitched - 1] - default_count[pitched_positions]
+        )
+
+        columns = self._assemble(
+            classes=classes,
+            times=times,
+            volumes=volumes,
+            pitches=pitches,
+            extensions=extensions,
+            instruments=instruments,
+            bpm=context.bpm,
+        )
+
+        if pitched_positions.size and classes[pitched_positions[0]] == CharClass.VOWEL:
+            columns = self._insert_vowel_instrument(columns, int(pitched_positions[0]))
+
+        return EventColumns.concatenate(self._initial_columns(context), columns)
+
+    def _classify(
+        self, text: str
+    ) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int16]]:
+        codes = np.frombuffer(
+            text.encode('utf-32-le', 'surrogatepass'), dtype='<u4'
+        ).astype(np.int64)
+        ascii_codes = np.minimum(codes, ASCII_SIZE - 1)
+        classes = ASCII_CLASSES[ascii_codes]
+        pitches = ASCII_PITCHES[ascii_codes]
+
+        # Fora do ASCII, `.upper()` ainda pode gerar um comando (ex.: 'ı' -> 'I')
+        non_ascii = np.flatnonzero(codes >= ASCII_SIZE)
+        if non_ascii.size:
+            unique, inverse = np.unique(codes[non_ascii], return_inverse=True)
+            table = [_classify_char(chr(code)) for code in unique.tolist()]
+            classes[non_ascii] = np.array([c for c, _ in table], dtype=np.uint8)[
+                inverse
+            ]
+            pitches[non_ascii] = np.array([p for _, p in table], dtype=np.int16)[
+                inverse
+            ]
+        return classes, pitches
+
+    def _mark_bpm_commands(self, text: str, classes: npt.NDArray[np.uint8]) -> None:
+        for match in BPM_UP_REGEX.finditer(text):
+            classes[match.start()] = CharClass.BPM_UP
+            classes[match.start() + 1 : match.end()] = CharClass.SKIP
+
+    def _volume_table(self, volume: int) -> npt.NDArray[np.int16]:
+        """Volume após 0, 1, 2... espaços, até saturar."""
+        table = [volume]
+        while True:
+            doubled = table[-1] * 2
+            next_volume = min(127, doubled) if doubled > 0 else 127
+            if next_volume == table[-1]:
+                break
+            table.append(next_volume)
+        return np.array(table, dtype=np.int16)
+
+    def _octaves_at(
+        self,
+        classes: npt.NDArray[np.uint8],
+        positions: npt.NDArray[np.int64],
+        octave: int,
+    ) -> npt.NDArray[np.int64]:
+        """Oitava vigente nas posições dadas (varredura com saturação em 0..10)."""
+        changes = np.flatnonzero(
+            (classes == CharClass.OCTAVE_UP) | (classes == CharClass.OCTAVE_DOWN)
+        )
+        values = [octave]
+        for char_class in classes[changes].tolist():
+            if char_class == CharClass.OCTAVE_UP:
+                octave = min(octave + 1, 10)
+            else:
+                octave = max(octave - 1, 0)
+            values.append(octave)
+        return np.array(values, dtype=np.int64)[np.searchsorted(changes, positions)]
+
+    def _draw_random_values(
+        self, classes: npt.NDArray[np.uint8], context: ParsingContext
+    ) -> tuple[list[int], list[int]]:
+        """Sorteia notas de `?` e instrumentos de quebras de linha, em ordem."""
+        rare = np.flatnonzero(
+            (classes == CharClass.RANDOM_NOTE) | (classes == CharClass.NEWLINE)
+        )
+        choices = self.random_note_choices
+        notes: list[int] = []
+        instruments: list[int] = []
+        for char_class in classes[rare].tolist():
+            if char_class == CharClass.RANDOM_NOTE:
+                notes.append(context.random.choice(choices))
+            else:
+                instruments.append(context.random.randint(0, 127))
+        return notes, instruments
+
+    def _assemble(
+        self,
+        classes: npt.NDArray[np.uint8],
+        times: npt.NDArray[np.float64],
+        volumes: npt.NDArray[np.int16],
+        pitches: npt.NDArray[np.int64],
+        extensions: npt.NDArray[np.int64],
+        instruments: list[int],
+        bpm: int,
+    ) -> EventColumns:
+        kind_by_class = np.full(len(CharClass), 255, dtype=np.uint8)
+        kind_by_class[[CharClass.NOTE, CharClass.VOWEL, CharClass.RANDOM_NOTE]] = (
+            EventKind.NOTE
+        )
+        kind_by_class[CharClass.REST] = EventKind.REST
+        kind_by_class[CharClass.NEWLINE] = EventKind.INSTRUMENT
+        kind_by_class[CharClass.BPM_UP] = EventKind.TEMPO
+
+        event_kinds = kind_by_class[classes]
+        positions = np.flatnonzero(event_kinds != 255)
+        kinds = event_kinds[positions]
+        notes = kinds == EventKind.NOTE
+
+        columns = EventColumns.empty(len(positions))
+        columns.kind[:] = kinds
+        columns.time[:] = times[positions]
+        columns.source_index[:] = positions
+        columns.source_length[:] = 1
+        columns.source_length[notes] += extensions[positions[notes]]
+        columns.source_length[kinds == EventKind.TEMPO] = len('BPM+')
+        columns.duration[notes] = 1.0 + extensions[positions[notes]]
+        columns.duration[kinds == EventKind.REST] = 1.0
+        columns.pitch[notes] = pitches[positions[notes]]
+        columns.volume[notes] = volumes[positions[notes]]
+        columns.value[kinds == EventKind.INSTRUMENT] = instruments
+        tempos = kinds == EventKind.TEMPO
+        columns.value[tempos] = bpm + BPM_STEP * np.arange(
+            1, np.count_nonzero(tempos) + 1
+        )
+        return columns
+
+    def _insert_vowel_instrument(
+        self, columns: EventColumns, position: int
+    ) -> EventColumns:
+        """Vogal antes de qualquer nota troca para o telefone (GM 124)."""
+        index = int(np.searchsorted(columns.source_index, position))
+        instrument = EventColumns.empty(1)
+        instrument.kind[0] = EventKind.INSTRUMENT
+        instrument.time[0] = columns.time[index]
+        instrument.value[0] = VOWEL_INSTRUMENT
+        instrument.source_index[0] = position
+        head = columns.slice(0, index)
+        tail = columns.slice(index, len(columns))
+        return EventColumns.concatenate(head, instrument, tail)
+
+    def _initial_columns(self, context: ParsingContext) -> EventColumns:
+        columns = EventColumns.empty(2)
+        columns.kind[:] = (EventKind.TEMPO, EventKind.INSTRUMENT)
+        columns.value[:] = (context.bpm, context.instrument_id)
+        return columns
@@ -0,0 +1,103 @@
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from domain.events import MusicalEvent, TempoEvent
+
+DEFAULT_BPM: Final[float] = 120.0
+
+
+class TempoMap:
+    """Mapa de tempo pré-calculado para converter batidas em segundos e vice-versa.
+
+    Construído em uma única passada sobre os `TempoEvent`s, armazena o instante
+    (em batidas e em segundos) de cada mudança de andamento.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[MusicalEvent],
+        initial_bpm: float = DEFAULT_BPM,
+    ) -> None:
+        beats: list[float] = [0.0]
+        seconds: list[float] = [0.0]
+        seconds_per_beat: list[float] = [self._seconds_per_beat(initial_bpm)]
+
+        tempo_events = sorted(
+            (event for event in events if isinstance(event, TempoEvent)),
+            key=lambda event: event.time,
+        )
+
+        for event in tempo_events:
+            spb = self._seconds_per_beat(event.bpm)
+            if event.time <= beats[-1]:
+                seconds_per_beat[-1] = spb
+                continue
+
+            seconds.append(
+                seconds[-1] + (event.time - beats[-1]) * seconds_per_beat[-1]
+            )
+            beats.append(event.time)
+            seconds_per_beat.append(spb)
+
+        self._beats: list[float] = beats
+        self._seconds: list[float] = seconds
+        self._spb: list[float] = seconds_per_beat
+
+        self._beats_array: npt.NDArray[np.float64] = np.array(beats, dtype=np.float64)
+        self._seconds_array: npt.NDArray[np.float64] = np.array(
+            seconds, dtype=np.float64
+        )
+        self._spb_array: npt.NDArray[np.float64] = np.array(
+            seconds_per_beat, dtype=np.float64
+        )
+
+    @staticmethod
+    def _seconds_per_beat(bpm: float) -> float:
+        """Aplica as mesmas salvaguardas do player: BPM inválido vira 120."""
+        safe_bpm = float(bpm) if bpm > 0 else DEFAULT_BPM
+        return 60.0 / max(1.0, safe_bpm)
+
+    def bpm_at(self, beat: float) -> float:
+        """Retorna o andamento vigente na batida informada."""
+        return 60.0 / self._spb[self._segment_for_beat(beat)]
+
+    def seconds_at(self, beat: float) -> float:
+        """Converte uma posição em batidas para segundos desde o início."""
+        i = self._segment_for_beat(beat)
+        return self._seconds[i] + (beat - self._beats[i]) * self._spb[i]
+
+    def beat_at(self, seconds: float) -> float:
+        """Converte um instante em segundos para a posição em batidas."""
+        i = max(0, bisect_right(self._seconds, seconds) - 1)
+        return self._beats[i] + (seconds - self._seconds[i]) / self._spb[i]
+
+    def duration_seconds(self, start: float, duration: float) -> float:
+        """Duração em segundos de um intervalo, considerando mudanças no meio dele."""
+        return self.seconds_at(start + duration) - self.seconds_at(start)
+
+    def seconds_column(self, beats: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Converte um lote de posições em batidas para segundos de uma só vez."""
+        positions = np.asarray(beats, dtype=np.float64)
+        idx = np.searchsorted(self._beats_array, positions, side='right') - 1
+        np.clip(idx, 0, None, out=idx)
+        return (
+            self._seconds_array[idx]
+            + (positions - self._beats_array[idx]) * self._spb_array[idx]
+        )
+
+    def beats_column(self, seconds: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Converte um lote de instantes em segundos para batidas."""
+        instants = np.asarray(seconds, dtype=np.float64)
+        idx = np.searchsorted(self._seconds_array, instants, side='right') - 1
+        np.clip(idx, 0, None, out=idx)
+        return (
+            self._beats_array[idx]
+            + (instants - self._seconds_array[idx]) / self._spb_array[idx]
+        )
+
+    def _segment_for_beat(self, beat: float) -> int:
+        return max(0, bisect_right(self._beats, beat) - 1)
@@ -0,0 +1,152 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Final
+
+import numpy as np
+
+from domain.columns import EventColumns, EventKind
+from domain.events import MusicalEvent
+
+MIDI_MIN: Final[int] = 0
+MIDI_MAX: Final[int] = 127
+
+
+def transpose(columns: EventColumns, semitones: int) -> None:
+    """Transpõe as notas no lugar, limitando as alturas à faixa MIDI."""
+    if semitones == 0:
+        return
+    notes = columns.mask(EventKind.NOTE, EventKind.SPECIFIC_NOTE)
+    columns.pitch[notes] = np.clip(columns.pitch[notes] + semitones, MIDI_MIN, MIDI_MAX)
+
+
+def scale_tempo(columns: EventColumns, factor: float) -> None:
+    """Multiplica todos os BPMs pelo fator (mínimo de 1 BPM)."""
+    if factor == 1.0:
+        return
+    tempos = columns.kind == EventKind.TEMPO
+    columns.value[tempos] = np.maximum(
+        np.rint(columns.value[tempos] * factor), 1
+    ).astype(np.int32)
+
+
+def scale_time(columns: EventColumns, factor: float) -> None:
+    """Estica ou comprime a linha do tempo, escalando instantes e durações."""
+    if factor == 1.0:
+        return
+    if factor <= 0:
+        raise ValueError('O fator de escala de tempo deve ser positivo.')
+    columns.time *= factor
+    columns.duration *= factor
+
+
+def scale_duration(columns: EventColumns, factor: float) -> None:
+    """Escala apenas a duração das notas (articulação), sem mover os ataques."""
+    if factor == 1.0:
+        return
+    if factor <= 0:
+        raise ValueError('O fator de duração deve ser positivo.')
+    notes = columns.mask(EventKind.NOTE, EventKind.SPECIFIC_NOTE)
+    columns.duration[notes] *= factor
+
+
+def scale_velocity(columns: EventColumns, factor: float) -> None:
+    """Multiplica as intensidades das notas, limitando à faixa MIDI."""
+    if factor == 1.0:
+        return
+    notes = columns.mask(EventKind.NOTE, EventKind.SPECIFIC_NOTE)
+    columns.volume[notes] = np.clip(
+        np.rint(columns.volume[notes] * factor), MIDI_MIN, MIDI_MAX
+    ).astype(np.int16)
+
+
+def apply_velocity_curve(columns: EventColumns, gamma: float) -> None:
+    """Aplica uma curva exponencial às intensidades (gamma < 1 realça notas fracas).
+
+    A curva é pré-calculada como tabela de 128 posições e aplicada por indexação.
+    """
+    if gamma == 1.0:
+        return
+    if gamma <= 0:
+        raise ValueError('O expoente da curva de intensidade deve ser positivo.')
+    curve = np.rint(
+        MIDI_MAX * (np.arange(MIDI_MAX + 1, dtype=np.float64) / MIDI_MAX) ** gamma
+    ).astype(np.int16)
+    notes = columns.mask(EventKind.NOTE, EventKind.SPECIFIC_NOTE)
+    columns.volume[notes] = curve[np.clip(columns.volume[notes], MIDI_MIN, MIDI_MAX)]
+
+
+def set_program(columns: EventColumns, program: int) -> None:
+    """Faz todos os eventos de instrumento usarem o mesmo programa."""
+    rows = columns.mask(EventKind.INSTRUMENT, EventKind.SPECIFIC_NOTE)
+    columns.value[rows] = max(MIDI_MIN, min(program, MIDI_MAX))
+
+
+def substitute_programs(columns: EventColumns, programs: Mapping[int, int]) -> None:
+    """Troca programas de instrumento segundo o mapeamento origem -> destino."""
+    if not programs:
+        return
+    lookup = np.arange(MIDI_MAX + 1, dtype=np.int32)
+    for source, target in programs.items():
+        if not (MIDI_MIN <= source <= MIDI_MAX and MIDI_MIN <= target <= MIDI_MAX):
+            raise ValueError(
+                f'Programas devem estar entre {MIDI_MIN} e {MIDI_MAX}: '
+                f'{source} -> {target}'
+            )
+        lookup[source] = target
+
+    rows = columns.mask(EventKind.INSTRUMENT, EventKind.SPECIFIC_NOTE)
+    columns.value[rows] = lookup[np.clip(columns.value[rows], MIDI_MIN, MIDI_MAX)]
+
+
+@dataclass(frozen=True)
+class ScoreTransform:
+    """Conjunto de transformações baratas aplicadas sobre as colunas de eventos."""
+
+    transpose: int = 0
+    tempo_scale: float = 1.0
+    time_scale: float = 1.0
+    duration_scale: float = 1.0
+    velocity_scale: float = 1.0
+    velocity_curve: float = 1.0
+    program: int | None = None
+    programs: Mapping[int, int] = field(default_factory=dict)
+
+    @property
+    def is_identity(self) -> bool:
+        return self == ScoreTransform()
+
+    def apply(self, columns: EventColumns) -> None:
+        """Aplica as transformações no lugar."""
+        transpose(columns, self.transpose)
+        scale_tempo(columns, self.tempo_scale)
+        scale_time(columns, self.time_scale)
+        scale_duration(columns, self.duration_scale)
+        scale_velocity(columns, self.velocity_scale)
+        apply_velocity_curve(columns, self.velocity_curve)
+        substitute_programs(columns, self.programs)
+        if self.program is not None:
+            set_program(columns, self.program)
+
+    def apply_to_score(
+        self, score: list[MusicalEvent] | EventColumns
+    ) -> list[MusicalEvent] | EventColumns:
+        """Transforma eventos ou colunas, mantendo a forma recebida.
+
+        Colunas são copiadas antes, pois podem estar mapeadas do disco ou
+        compartilhadas com o cache de partituras compiladas.
+        """
+        if isinstance(score, list):
+            return self.apply_to_events(score)
+        if self.is_identity:
+            return score
+        columns = score.copy()
+        self.apply(columns)
+        return columns
+
+    def apply_to_events(self, events: list[MusicalEvent]) -> list[MusicalEvent]:
+        """Converte os eventos para colunas, transforma e devolve novos eventos."""
+        if self.is_identity:
+            return events
+        columns = EventColumns.from_events(events)
+        self.apply(columns)
+        return columns.to_events()
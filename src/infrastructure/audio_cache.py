@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import astuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from domain.events import MusicalEvent
+from infrastructure.disk_cache import evict_least_recently_used
+from infrastructure.synth_options import SynthSettings
+
+if TYPE_CHECKING:
+    from domain.columns import EventColumns
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = '.wav'
+# Uma partitura só é renderizada quando volta a ser pedida: textos editados
+# ou tocados uma única vez não pagam a renderização
+RENDER_AFTER_REQUESTS: Final[int] = 2
+MAX_TRACKED_MISSES: Final[int] = 1024
+
+
+class RenderCache:
+    """Cache em disco de áudio pré-renderizado, com remoção LRU por tamanho.
+
+    A chave combina o resumo das colunas de eventos, o resumo do SoundFont, o
+    banco de presets e os parâmetros do sintetizador. A data de modificação
+    dos arquivos é usada como marca de último uso. Uma chave só é
+    renderizada a partir do segundo pedido sem cache, e renderizações
+    maiores que o próprio limite do cache são recusadas.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory: Path = directory
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._misses: dict[str, int] = {}  # Em ordem de último pedido
+        self._soundfont_digests: dict[tuple[str, int, int], str] = {}
+
+    def key_for(
+        self,
+        score: 'list[MusicalEvent] | EventColumns',
+        soundfont_path: Path,
+        synth_settings: SynthSettings,
+        bank: int = 0,
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(self._score_digest(score).encode())
+        digest.update(self._soundfont_digest(soundfont_path).encode())
+        digest.update(f'bank={bank}'.encode())
+        digest.update(repr(astuple(synth_settings)).encode())
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Path | None:
+        """Retorna o arquivo em cache e o marca como usado recentemente."""
+        path = self._path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def should_render(self, key: str) -> bool:
+        """Registra um pedido sem cache; só vale renderizar na repetição."""
+        with self._lock:
+            count = self._misses.pop(key, 0) + 1
+            self._misses[key] = count
+            if len(self._misses) > MAX_TRACKED_MISSES:
+                del self._misses[next(iter(self._misses))]
+        return count >= RENDER_AFTER_REQUESTS
+
+    def store(self, key: str, render: Callable[[Path], None]) -> Path | None:
+        """Renderiza para um arquivo temporário e o publica atomicamente."""
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+
+        final_path = self._path_for(key)
+        tmp_path = final_path.with_name(
+            f'{final_path.name}.{threading.get_ident()}.tmp'
+        )
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            render(tmp_path)
+            tmp_path.replace(final_path)
+        except Exception:
+            logger.exception('Falha ao renderizar o áudio para o cache')
+            tmp_path.unlink(missing_ok=True)
+            return None
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+                self._misses.pop(key, None)
+
+        self._evict()
+        return final_path
+
+    def store_in_background(
+        self,
+        key: str,
+        render: Callable[[Path], None],
+        estimate_bytes: Callable[[], int] | None = None,
+    ) -> None:
+        """Renderiza em outra thread, onde também roda a estimativa de tamanho."""
+        if self.lookup(key) is not None:
+            return
+        threading.Thread(
+            target=self._store_if_fits, args=(key, render, estimate_bytes), daemon=True
+        ).start()
+
+    def _store_if_fits(
+        self,
+        key: str,
+        render: Callable[[Path], None],
+        estimate_bytes: Callable[[], int] | None,
+    ) -> None:
+        if estimate_bytes is not None and estimate_bytes() > self.max_bytes:
+            return
+        self.store(key, render)
+
+    def _evict(self) -> None:
+        evict_least_recently_used(self.directory, CACHE_SUFFIX, self.max_bytes)
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f'{key}{CACHE_SUFFIX}'
+
+    def _score_digest(self, score: 'list[MusicalEvent] | EventColumns') -> str:
+        """Resumo dos buffers das colunas, sem percorrer evento por evento."""
+        from domain.columns import EventColumns
+
+        columns = EventColumns.from_events(score) if isinstance(score, list) else score
+        digest = hashlib.sha256()
+        for name in EventColumns.__dataclass_fields__:
+            array = getattr(columns, name)
+            digest.update(f'{name}:{array.dtype.str}:'.encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def _soundfont_digest(self, soundfont_path: Path) -> str:
+        """Resumo do conteúdo do SoundFont, memorizado por caminho/tamanho/mtime."""
+        stat = soundfont_path.stat()
+        signature = (str(soundfont_path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+        cached = self._soundfont_digests.get(signature)
+        if cached is None:
+            with soundfont_path.open('rb') as sf_file:
+                cached = hashlib.file_digest(sf_file, 'sha256').hexdigest()
+            self._soundfont_digests[signature] = cached
+        return cached
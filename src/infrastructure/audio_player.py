@@ -1,28 +1,38 @@
 import logging
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
 from pathlib import Path
-from typing import override
+from typing import Final, override
 
 import fluidsynth
 from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
 
-from domain.events import (
-    InstrumentEvent,
-    MusicalEvent,
-    NoteEvent,
-    SpecificNoteEvent,
-    TempoEvent,
-)
+from domain.events import MusicalEvent
 from domain.models import PlaybackSettings
+from infrastructure.fluidsynth_backend import FluidSynthBackend
+from infrastructure.output_backend import OutputBackend
+from infrastructure.playback_metrics import PlaybackMetrics
+from infrastructure.synth_options import (
+    DEFAULT_LOOKAHEAD_SECONDS,
+    SchedulingMode,
+    SynthSettings,
+)
+from infrastructure.synth_schedule import SynthCommand, SynthMessage, SynthScheduler
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SEQUENCER_TICKS_PER_SECOND: Final[int] = 1000
+SEQUENCER_START_DELAY_SECONDS: Final[float] = 0.05
+
 
 class FluidSynthPlayer(threading.Thread):
-    """Executa a música em tempo real usando fluidsynth em uma thread separada."""
+    """Executa a música em tempo real em uma thread separada.
+
+    Por padrão sintetiza com o FluidSynth; outro `OutputBackend` (como uma
+    porta MIDI externa) recebe a mesma agenda, disparada pela própria thread.
+    """
 
     def __init__(
         self,
@@ -31,164 +41,197 @@ class FluidSynthPlayer(threading.Thread):
         settings: PlaybackSettings,
         on_finished_callback: Callable[[], None] | None = None,
         on_progress_callback: Callable[[int, int], None] | None = None,
+        synth_settings: SynthSettings | None = None,
+        scheduling_mode: SchedulingMode = SchedulingMode.SEQUENCER,
+        lookahead_seconds: float = DEFAULT_LOOKAHEAD_SECONDS,
+        metrics: PlaybackMetrics | None = None,
+        backend: OutputBackend | None = None,
     ) -> None:
         super().__init__()
-        self.fs: fluidsynth.Synth = fluidsynth.Synth()
+        self.synth_settings: SynthSettings = synth_settings or SynthSettings()
+        self.backend: OutputBackend = backend or FluidSynthBackend(
+            soundfont_path, self.synth_settings, metrics
+        )
         self.soundfont_path: Path = soundfont_path
         self.events: list[MusicalEvent] = events
         self.settings: PlaybackSettings = settings
         self._stop_request: threading.Event = threading.Event()
         self.stop_callback: Callable[[], None] | None = on_finished_callback
         self.progress_callback: Callable[[int, int], None] | None = on_progress_callback
-        self.timers: list[threading.Timer] = []
+        self.scheduling_mode: SchedulingMode = scheduling_mode
+        self.lookahead_seconds: float = lookahead_seconds
+        self._pending_callbacks: deque[SynthMessage] = deque()
+        self.metrics: PlaybackMetrics | None = metrics
+        self._wall_start: float = 0.0
+        self._start_tick: int = 0
+        # Comandos de outras threads só valem entre `open` e `close` do backend
+        self._backend_lock: threading.Lock = threading.Lock()
+        self._backend_open: bool = False
 
     @override
     def run(self) -> None:
-        self._initialize_fluidsynth()
+        self.backend.open()
+        with self._backend_lock:
+            self._backend_open = True
 
-        channel = 0
-        current_bpm = float(self.settings.bpm)
-        if current_bpm <= 0:
-            current_bpm = 120.0
+        schedule: list[SynthMessage] = self._build_schedule()
 
-        current_instrument_id = self._configure_initial_instrument(channel)
-        previous_event_time = 0.0
+        # O sequenciador do FluidSynth só alimenta o sintetizador interno
+        if self.scheduling_mode == SchedulingMode.SEQUENCER and isinstance(
+            self.backend, FluidSynthBackend
+        ):
+            self._run_sequenced(schedule, self.backend.synth)
+        else:
+            self._run_timed(schedule)
 
-        for event in self.events:
-            if self._stop_request.is_set():
-                break
+        with self._backend_lock:
+            self._backend_open = False
+            self.backend.close()
+        if self.metrics:
+            self.metrics.dump()
+        _ = GLib.idle_add(self.notify_stop_main_thread)
 
-            event_time = event.time
-            self._wait_time(event_time, previous_event_time, current_bpm)
+    def _build_schedule(self) -> list[SynthMessage]:
+        return SynthScheduler().build(self.events, self.settings)
 
-            if self.progress_callback:
-                GLib.idle_add(
-                    self.progress_callback, event.source_index, event.source_length
-                )
+    def _run_timed(self, schedule: list[SynthMessage]) -> None:
+        """Dispara cada comando a partir de esperas na própria thread."""
+        self._wall_start = time.perf_counter()
 
+        for message in schedule:
             if self._stop_request.is_set():
                 break
 
-            current_bpm, current_instrument_id = self._process_event(
-                event,
-                channel,
-                current_bpm,
-                current_instrument_id,
-            )
-
-            previous_event_time = event_time
-
-        if self._stop_request.is_set():
-            for timer in self.timers:
-                timer.cancel()
-        else:
-            for timer in self.timers:
-                timer.join()
+            self._wait_until(self._wall_start + message.seconds)
 
-        self.fs.delete()
-        _ = GLib.idle_add(self.notify_stop_main_thread)
-
-    def _initialize_fluidsynth(self) -> None:
-        self.fs.start()
-        self.fs.sfload(str(self.soundfont_path))
-
-    def _configure_initial_instrument(self, channel: int) -> int:
-        instrument_id = -1
-        for event in self.events:
-            if isinstance(event, InstrumentEvent):
-                instrument_id = event.instrument_id
+            if self._stop_request.is_set():
                 break
 
-        if instrument_id == -1:
-            instrument_id = self.settings.instrument_id
+            if self.metrics:
+                self._measure(message, time.perf_counter() - self._wall_start)
+            self._process_message(message)
 
-        self.fs.program_change(chan=channel, prg=instrument_id)
-        return instrument_id
-
-    def _wait_time(
-        self,
-        current_time: float,
-        previous_time: float,
-        bpm: float,
+    def _run_sequenced(
+        self, schedule: list[SynthMessage], synth: fluidsynth.Synth
     ) -> None:
-        beat_delta = current_time - previous_time
-        safe_bpm = max(1.0, bpm)
-        if beat_delta > 0:
-            wait_seconds = (60.0 / safe_bpm) * beat_delta
-            time.sleep(wait_seconds)
-
-    def _process_event(
-        self,
-        event: MusicalEvent,
-        channel: int,
-        current_bpm: float,
-        current_instrument_id: int,
-    ) -> tuple[float, int]:
-        if isinstance(event, TempoEvent):
-            new_bpm = float(event.bpm)
-            return (new_bpm if new_bpm > 0 else 120.0), current_instrument_id
-
-        if isinstance(event, InstrumentEvent):
-            self.fs.program_change(chan=channel, prg=event.instrument_id)
-            return current_bpm, event.instrument_id
-
-        if isinstance(event, NoteEvent):
-            self._play_note(channel=channel, event=event, current_bpm=current_bpm)
-
-        elif isinstance(event, SpecificNoteEvent):
-            self._play_specific_note(
-                channel=channel,
-                event=event,
-                current_bpm=current_bpm,
-                original_instrument=current_instrument_id,
+        """Envia a agenda em blocos ao sequenciador do FluidSynth.
+
+        O sequenciador avança junto com as amostras do sintetizador, então as
+        notas saem no tempo exato; a thread só reabastece a janela à frente.
+        Trocas de programa e marcadores viram eventos de timer, executados em
+        ordem pelo callback do cliente. Com métricas, ataques e desligamentos
+        também ganham timers, e os atrasos são medidos no relógio do próprio
+        sequenciador, que é o que dispara as notas.
+        """
+        sequencer = fluidsynth.Sequencer(
+            time_scale=SEQUENCER_TICKS_PER_SECOND, use_system_timer=False
+        )
+        try:
+            synth_id = sequencer.register_fluidsynth(synth)
+            client_id = sequencer.register_client(
+                'txt2midi', self._on_sequencer_callback
             )
+            start_tick = sequencer.get_tick() + round(
+                SEQUENCER_START_DELAY_SECONDS * SEQUENCER_TICKS_PER_SECOND
+            )
+            self._start_tick = start_tick
 
-        return current_bpm, current_instrument_id
-
-    def _play_note(
-        self,
-        channel: int,
-        event: NoteEvent,
-        current_bpm: float,
-    ) -> None:
-        safe_bpm = max(1.0, current_bpm)
-        duration_sec = (60.0 / safe_bpm) * event.duration
+            cursor = 0
+            end_seconds = schedule[-1].seconds if schedule else 0.0
+            refill_interval = max(self.lookahead_seconds / 2, 0.01)
 
-        self.fs.noteon(chan=channel, key=event.pitch, vel=event.volume)
+            while not self._stop_request.is_set():
+                now = (sequencer.get_tick() - start_tick) / SEQUENCER_TICKS_PER_SECOND
+                if cursor >= len(schedule) and now >= end_seconds:
+                    break
 
-        self.timers = [t for t in self.timers if t.is_alive()]
+                horizon = now + self.lookahead_seconds
+                while cursor < len(schedule) and schedule[cursor].seconds <= horizon:
+                    self._send_to_sequencer(
+                        sequencer, schedule[cursor], start_tick, synth_id, client_id
+                    )
+                    cursor += 1
 
-        timer = threading.Timer(
-            duration_sec,
-            self.fs.noteoff,
-            args=[channel, event.pitch],
-        )
-        self.timers.append(timer)
-        timer.start()
+                _ = self._stop_request.wait(timeout=refill_interval)
+        finally:
+            sequencer.delete()
 
-    def _play_specific_note(
+    def _send_to_sequencer(
         self,
-        channel: int,
-        event: SpecificNoteEvent,
-        current_bpm: float,
-        original_instrument: int,
+        sequencer: fluidsynth.Sequencer,
+        message: SynthMessage,
+        start_tick: int,
+        synth_id: int,
+        client_id: int,
     ) -> None:
-        safe_bpm = max(1.0, current_bpm)
-        duration_sec = (60.0 / safe_bpm) * event.duration
-
-        self.fs.program_change(channel, event.instrument_id)
-        self.fs.noteon(channel, event.pitch, event.volume)
-        self.fs.program_change(channel, original_instrument)
-
-        self.timers = [t for t in self.timers if t.is_alive()]
-
-        timer = threading.Timer(
-            duration_sec,
-            self.fs.noteoff,
-            args=[channel, event.pitch],
-        )
-        self.timers.append(timer)
-        timer.start()
+        tick = start_tick + round(message.seconds * SEQUENCER_TICKS_PER_SECOND)
+        match message.command:
+            case SynthCommand.NOTE_ON:
+                sequencer.note_on(
+                    tick, message.channel, message.data1, message.data2, dest=synth_id
+                )
+            case SynthCommand.NOTE_OFF:
+                sequencer.note_off(tick, message.channel, message.data1, dest=synth_id)
+        if self.metrics or message.command in (
+            SynthCommand.PROGRAM,
+            SynthCommand.MARKER,
+        ):
+            # O sequenciador entrega os timers na ordem em que foram agendados
+            self._pending_callbacks.append(message)
+            sequencer.timer(tick, dest=client_id)
+
+    def _on_sequencer_callback(
+        self, time_tick: int, _event: object, _sequencer: object, _data: object
+    ) -> None:
+        if not self._pending_callbacks:
+            return
+        message = self._pending_callbacks.popleft()
+        if self.metrics:
+            self._measure(
+                message, (time_tick - self._start_tick) / SEQUENCER_TICKS_PER_SECOND
+            )
+        if message.command in (SynthCommand.PROGRAM, SynthCommand.MARKER):
+            # Notas já foram entregues ao sintetizador pelo próprio sequenciador
+            self._process_message(message)
+
+    def _measure(self, message: SynthMessage, elapsed: float) -> None:
+        """Registra o atraso do marcador ou conta a nota no momento da entrega.
+
+        `elapsed` é o tempo decorrido desde o início da agenda, no relógio que
+        de fato dispara o comando.
+        """
+        assert self.metrics is not None
+        match message.command:
+            case SynthCommand.MARKER:
+                self.metrics.record_event_delta(message.seconds, elapsed)
+            case SynthCommand.NOTE_ON:
+                self.metrics.record_note_on(time.perf_counter())
+            case SynthCommand.NOTE_OFF:
+                self.metrics.record_note_off()
+
+    def _wait_until(self, deadline: float) -> None:
+        """Aguarda até o instante absoluto, evitando acúmulo de atrasos."""
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            _ = self._stop_request.wait(timeout=remaining)
+
+    def _process_message(self, message: SynthMessage) -> None:
+        match message.command:
+            case SynthCommand.MARKER:
+                if self.progress_callback:
+                    GLib.idle_add(
+                        self.progress_callback,
+                        message.source_index,
+                        message.source_length,
+                    )
+            case SynthCommand.PROGRAM:
+                self.backend.program_change(
+                    message.channel, message.data1, message.data2
+                )
+            case SynthCommand.NOTE_ON:
+                self.backend.note_on(message.channel, message.data1, message.data2)
+            case SynthCommand.NOTE_OFF:
+                self.backend.note_off(message.channel, message.data1)
 
     def stop(self) -> None:
         """Sinalizar a thread para parar."""
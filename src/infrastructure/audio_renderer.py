@@ -0,0 +1,124 @@
+import io
+import wave
+from pathlib import Path
+from typing import BinaryIO, Final
+
+import fluidsynth
+
+from domain.events import MusicalEvent
+from domain.models import PlaybackSettings
+from infrastructure.synth_options import SynthSettings
+from infrastructure.synth_schedule import SynthCommand, SynthMessage, SynthScheduler
+
+RENDER_BLOCK_FRAMES: Final[int] = 4096
+RELEASE_TAIL_SECONDS: Final[float] = 1.0
+WAVE_CHANNELS: Final[int] = 2
+WAVE_SAMPLE_BYTES: Final[int] = 2
+WAVE_HEADER_BYTES: Final[int] = 44
+
+# Opções do FluidSynth que não alteram o áudio gerado. Com o carregamento
+# dinâmico, `sfload` lê só os cabeçalhos e as amostras de cada preset são
+# carregadas quando um canal passa a usá-lo.
+SYNTH_OPTIONS: Final[dict[str, int]] = {'synth.dynamic-sample-loading': 1}
+
+
+def create_synth(synth_settings: SynthSettings) -> fluidsynth.Synth:
+    return fluidsynth.Synth(
+        gain=synth_settings.gain,
+        samplerate=synth_settings.sample_rate,
+        **SYNTH_OPTIONS,
+    )
+
+
+class OfflineRenderer:
+    """Renderiza a agenda de eventos para um arquivo WAV sem driver de áudio."""
+
+    def __init__(self, synth_settings: SynthSettings | None = None) -> None:
+        self.synth_settings: SynthSettings = synth_settings or SynthSettings()
+        self.scheduler: SynthScheduler = SynthScheduler()
+
+    def estimate_bytes(
+        self, events: list[MusicalEvent], settings: PlaybackSettings
+    ) -> int:
+        """Tamanho do WAV que `render` gravaria, sem sintetizar nada."""
+        schedule = self.scheduler.build(events, settings)
+        seconds = (schedule[-1].seconds if schedule else 0.0) + RELEASE_TAIL_SECONDS
+        frames = round(seconds * self.synth_settings.sample_rate)
+        return WAVE_HEADER_BYTES + frames * WAVE_CHANNELS * WAVE_SAMPLE_BYTES
+
+    def render(
+        self,
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        soundfont_path: Path,
+        output_path: Path,
+    ) -> None:
+        """Sintetiza a música inteira e grava o PCM 16 bits estéreo em disco."""
+        with output_path.open('wb') as output_file:
+            self._render_wave(events, settings, soundfont_path, output_file)
+
+    def render_to_bytes(
+        self,
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        soundfont_path: Path,
+    ) -> bytes:
+        """Sintetiza a música inteira e devolve o WAV em memória."""
+        buffer = io.BytesIO()
+        self._render_wave(events, settings, soundfont_path, buffer)
+        return buffer.getvalue()
+
+    def _render_wave(
+        self,
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        soundfont_path: Path,
+        output_file: BinaryIO,
+    ) -> None:
+        schedule: list[SynthMessage] = self.scheduler.build(events, settings)
+        rate = self.synth_settings.sample_rate
+
+        fs = create_synth(self.synth_settings)
+        try:
+            fs.sfload(str(soundfont_path))
+
+            with wave.open(output_file, 'wb') as output:
+                output.setnchannels(WAVE_CHANNELS)
+                output.setsampwidth(WAVE_SAMPLE_BYTES)
+                output.setframerate(rate)
+
+                cursor = 0
+                for message in schedule:
+                    target = round(message.seconds * rate)
+                    cursor = self._write_frames(fs, output, cursor, target)
+                    self._dispatch(fs, message)
+
+                tail = cursor + round(RELEASE_TAIL_SECONDS * rate)
+                self._write_frames(fs, output, cursor, tail)
+        finally:
+            fs.delete()
+
+    def _write_frames(
+        self,
+        fs: fluidsynth.Synth,
+        output: wave.Wave_write,
+        cursor: int,
+        target: int,
+    ) -> int:
+        while cursor < target:
+            frames = min(RENDER_BLOCK_FRAMES, target - cursor)
+            output.writeframesraw(fs.get_samples(frames).tobytes())
+            cursor += frames
+        return cursor
+
+    def _dispatch(self, fs: fluidsynth.Synth, message: SynthMessage) -> None:
+        match message.command:
+            case SynthCommand.PROGRAM:
+                fs.bank_select(message.channel, message.data2)
+                fs.program_change(message.channel, message.data1)
+            case SynthCommand.NOTE_ON:
+                fs.noteon(message.channel, message.data1, message.data2)
+            case SynthCommand.NOTE_OFF:
+                fs.noteoff(message.channel, message.data1)
+            case SynthCommand.MARKER:
+                pass
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import override
+
+import gi
+from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
+
+from domain.events import MusicalEvent
+from domain.models import PlaybackSettings
+from infrastructure.playback_metrics import PlaybackMetrics
+from infrastructure.synth_schedule import SynthCommand, SynthScheduler
+
+
+class CachedAudioPlayer(threading.Thread):
+    """Reproduz um arquivo pré-renderizado via GStreamer, sem sintetizar notas.
+
+    Os marcadores da agenda continuam sendo emitidos no tempo certo para manter
+    o destaque do texto sincronizado; a agenda é montada na própria thread.
+    O GStreamer só é carregado e inicializado ao criar o primeiro player, e a
+    thread dorme no barramento até o próximo marcador, o fim do arquivo ou
+    um pedido de parada.
+    """
+
+    def __init__(
+        self,
+        audio_path: Path,
+        events: list[MusicalEvent],
+        settings: PlaybackSettings,
+        on_finished_callback: Callable[[], None] | None = None,
+        on_progress_callback: Callable[[int, int], None] | None = None,
+        metrics: PlaybackMetrics | None = None,
+    ) -> None:
+        super().__init__()
+        gi.require_version(namespace='Gst', version='1.0')
+        from gi.repository import Gst  # pyright: ignore[reportMissingModuleSource]
+
+        Gst.init(None)
+        self.audio_path: Path = audio_path
+        self.events: list[MusicalEvent] = events
+        self.settings: PlaybackSettings = settings
+        self._pipeline: Gst.Element = Gst.ElementFactory.make('playbin', None)
+        self._pipeline.set_property('uri', audio_path.resolve().as_uri())
+        self._bus: Gst.Bus = self._pipeline.get_bus()
+        # Fim do arquivo, erro ou o pedido de parada postado por `stop`
+        self._end_messages: Gst.MessageType = (
+            Gst.MessageType.EOS | Gst.MessageType.ERROR | Gst.MessageType.APPLICATION
+        )
+        self._ended: bool = False
+        self.stop_callback: Callable[[], None] | None = on_finished_callback
+        self.progress_callback: Callable[[int, int], None] | None = on_progress_callback
+        self.metrics: PlaybackMetrics | None = metrics
+
+    @staticmethod
+    def is_available() -> bool:
+        """Verifica se o GStreamer 1.0 está instalado, sem inicializá-lo."""
+        try:
+            gi.require_version(namespace='Gst', version='1.0')
+        except ValueError:
+            return False
+        return True
+
+    @override
+    def run(self) -> None:
+        from gi.repository import Gst  # pyright: ignore[reportMissingModuleSource]
+
+        schedule = SynthScheduler().build(self.events, self.settings)
+        markers = [
+            message for message in schedule if message.command == SynthCommand.MARKER
+        ]
+
+        self._pipeline.set_state(Gst.State.PLAYING)
+        start_time = time.perf_counter()
+
+        for marker in markers:
+            if self._wait_for_end(start_time + marker.seconds - time.perf_counter()):
+                break
+            if self.metrics:
+                self.metrics.record_event_delta(
+                    marker.seconds, time.perf_counter() - start_time
+                )
+            if self.progress_callback:
+                GLib.idle_add(
+                    self.progress_callback, marker.source_index, marker.source_length
+                )
+
+        self._wait_for_end(None)
+        self._pipeline.set_state(Gst.State.NULL)
+        if self.metrics:
+            self.metrics.dump()
+        _ = GLib.idle_add(self.notify_stop_main_thread)
+
+    def _wait_for_end(self, timeout: float | None) -> bool:
+        """Bloqueia no barramento por até `timeout` segundos (sem limite se None).
+
+        Retorna verdadeiro se a reprodução acabou ou foi interrompida.
+        """
+        from gi.repository import Gst  # pyright: ignore[reportMissingModuleSource]
+
+        if not self._ended:
+            nanoseconds = (
+                Gst.CLOCK_TIME_NONE
+                if timeout is None
+                else max(0, int(timeout * Gst.SECOND))
+            )
+            message = self._bus.timed_pop_filtered(nanoseconds, self._end_messages)
+            self._ended = message is not None
+        return self._ended
+
+    def stop(self) -> None:
+        """Sinalizar a thread para parar."""
+        from gi.repository import Gst  # pyright: ignore[reportMissingModuleSource]
+
+        self._bus.post(
+            Gst.Message.new_application(None, Gst.Structure.new_empty('stop'))
+        )
+
+    def notify_stop_main_thread(self) -> None:
+        """Notificar a thread principal que a música terminou."""
+        if self.stop_callback:
+            self.stop_callback()
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Final, NamedTuple
+
+MIDI_CHANNEL_COUNT: Final[int] = 16
+PERCUSSION_CHANNEL: Final[int] = 9  # Canal 10 na numeração MIDI
+
+
+class ChannelAssignment(NamedTuple):
+    channel: int
+    needs_program_change: bool
+
+
+class ChannelAllocator:
+    """Associa cada par (voz, instrumento) a um canal MIDI próprio.
+
+    O canal de percussão é ignorado. Quando todos os canais estão ocupados, só
+    um canal em silêncio no instante da nota recebe nova troca de programa, o
+    usado há mais tempo primeiro. Se todos ainda soam, a nota divide um canal
+    sem trocá-lo, de preferência um que já toque o mesmo instrumento.
+    """
+
+    def __init__(self) -> None:
+        self._free_channels: list[int] = [
+            channel
+            for channel in range(MIDI_CHANNEL_COUNT)
+            if channel != PERCUSSION_CHANNEL
+        ]
+        self._channels: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._programs: dict[int, int] = {}
+        self._releases: dict[int, float] = {}  # Último note-off de cada canal
+
+    def channel_for(
+        self, instrument_id: int, voice: int = 0, start: float = 0.0
+    ) -> ChannelAssignment:
+        key = (voice, instrument_id)
+        channel = self._channels.get(key)
+        if channel is not None:
+            self._channels.move_to_end(key)
+            return ChannelAssignment(channel=channel, needs_program_change=False)
+
+        if self._free_channels:
+            channel = self._free_channels.pop(0)
+        else:
+            channel = self._take_silent_channel(start)
+            if channel is None:
+                channel = self._shared_channel(instrument_id)
+                return ChannelAssignment(channel=channel, needs_program_change=False)
+
+        self._channels[key] = channel
+        self._programs[channel] = instrument_id
+        return ChannelAssignment(channel=channel, needs_program_change=True)
+
+    def note_off(self, channel: int, seconds: float) -> None:
+        """Registra até quando o canal tem notas soando."""
+        if seconds > self._releases.get(channel, 0.0):
+            self._releases[channel] = seconds
+
+    def _take_silent_channel(self, start: float) -> int | None:
+        for key, channel in self._channels.items():
+            if self._releases.get(channel, 0.0) <= start:
+                del self._channels[key]
+                return channel
+        return None
+
+    def _shared_channel(self, instrument_id: int) -> int:
+        for channel, program in self._programs.items():
+            if program == instrument_id:
+                return channel
+        return next(iter(self._channels.values()))
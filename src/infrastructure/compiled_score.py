@@ -0,0 +1,190 @@
+import contextlib
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Callable
+from dataclasses import astuple
+from pathlib import Path
+from typing import Final
+
+import numpy as np
+
+from config import COMPILED_SCORE_MIN_CHARS
+from domain.columns import EventColumns
+from domain.models import PlaybackSettings
+from domain.parser import ParsingMode
+from infrastructure.disk_cache import evict_least_recently_used
+
+logger = logging.getLogger(__name__)
+
+COMPILED_SCORE_MAGIC: Final[bytes] = b'T2MSCORE'
+COMPILED_SCORE_VERSION: Final[int] = 1
+COMPILED_SCORE_SUFFIX: Final[str] = '.t2ms'
+
+# magic, versão, nº de colunas, reservado, chave (SHA-256), nº de linhas
+HEADER: Final[struct.Struct] = struct.Struct('<8sHHI32sQ')
+COLUMN_ALIGNMENT: Final[int] = 8
+
+# Ordem e tipos das colunas no arquivo; mudar exige nova versão do formato
+COLUMN_LAYOUT: Final[tuple[tuple[str, np.dtype], ...]] = (
+    ('kind', np.dtype('<u1')),
+    ('time', np.dtype('<f8')),
+    ('duration', np.dtype('<f8')),
+    ('pitch', np.dtype('<i2')),
+    ('volume', np.dtype('<i2')),
+    ('value', np.dtype('<i4')),
+    ('source_index', np.dtype('<i8')),
+    ('source_length', np.dtype('<i4')),
+    ('voice', np.dtype('<i2')),
+)
+
+
+def is_compilable(text: str, settings: PlaybackSettings, mode: ParsingMode) -> bool:
+    """Só vale compilar textos grandes com resultado determinístico.
+
+    O modo Padrão sem semente sorteia notas e instrumentos a cada análise,
+    e guardar um sorteio mudaria o comportamento da reprodução.
+    """
+    if len(text) < COMPILED_SCORE_MIN_CHARS:
+        return False
+    return mode == ParsingMode.MML or settings.seed is not None
+
+
+def score_key(text: str, settings: PlaybackSettings, mode: ParsingMode) -> bytes:
+    """Resumo SHA-256 do texto, do modo e das configurações iniciais."""
+    digest = hashlib.sha256()
+    digest.update(f'{COMPILED_SCORE_VERSION}\0{mode}\0'.encode())
+    digest.update(repr(astuple(settings)).encode())
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+def sidecar_path(source_path: Path) -> Path:
+    """Arquivo compilado gravado ao lado do texto (ex.: `musica.txt.t2ms`)."""
+    return source_path.with_name(source_path.name + COMPILED_SCORE_SUFFIX)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+
+
+def write_compiled_score(path: Path, key: bytes, columns: EventColumns) -> None:
+    """Grava as colunas em um arquivo temporário e o publica atomicamente."""
+    tmp_path = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+    try:
+        with tmp_path.open('wb') as output:
+            output.write(
+                HEADER.pack(
+                    COMPILED_SCORE_MAGIC,
+                    COMPILED_SCORE_VERSION,
+                    len(COLUMN_LAYOUT),
+                    0,
+                    key,
+                    len(columns),
+                )
+            )
+            offset = HEADER.size
+            for name, dtype in COLUMN_LAYOUT:
+                padding = _aligned(offset) - offset
+                output.write(b'\0' * padding)
+                data = np.ascontiguousarray(getattr(columns, name), dtype=dtype)
+                output.write(memoryview(data).cast('B'))
+                offset += padding + data.nbytes
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_compiled_score(path: Path, key: bytes) -> EventColumns | None:
+    """Mapeia o arquivo em memória e devolve colunas somente leitura.
+
+    Os arrays apontam direto para o mapeamento, sem cópia: o custo não
+    depende do tamanho da partitura. Retorna `None` se o arquivo não
+    existir, for de outra versão ou corresponder a outro texto.
+    """
+    try:
+        with path.open('rb') as source:
+            buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # Ausente ou vazio
+        return None
+
+    if len(buffer) < HEADER.size:
+        return None
+    magic, version, column_count, _reserved, stored_key, rows = HEADER.unpack_from(
+        buffer
+    )
+    if (
+        magic != COMPILED_SCORE_MAGIC
+        or version != COMPILED_SCORE_VERSION
+        or column_count != len(COLUMN_LAYOUT)
+        or stored_key != key
+    ):
+        return None
+
+    arrays: dict[str, np.ndarray] = {}
+    offset = HEADER.size
+    for name, dtype in COLUMN_LAYOUT:
+        offset = _aligned(offset)
+        if offset + rows * dtype.itemsize > len(buffer):
+            logger.warning('Partitura compilada truncada: %s', path)
+            return None
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+    return EventColumns(**arrays)
+
+
+class CompiledScoreCache:
+    """Cache em disco de partituras compiladas, com remoção LRU por tamanho.
+
+    Cada arquivo é nomeado pela chave do texto; a data de modificação marca
+    o último uso, como no `RenderCache`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory: Path = directory
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: set[bytes] = set()
+
+    def lookup(self, key: bytes) -> EventColumns | None:
+        path = self._path_for(key)
+        columns = read_compiled_score(path, key)
+        if columns is not None:
+            # Removido por uma limpeza concorrente: o mapeamento continua válido
+            with contextlib.suppress(OSError):
+                os.utime(path)
+        return columns
+
+    def store(self, key: bytes, compile_columns: Callable[[], EventColumns]) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_compiled_score(self._path_for(key), key, compile_columns())
+        except Exception:
+            logger.exception('Falha ao gravar a partitura compilada no cache')
+            return
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+        self._evict()
+
+    def store_in_background(
+        self, key: bytes, compile_columns: Callable[[], EventColumns]
+    ) -> None:
+        threading.Thread(
+            target=self.store, args=(key, compile_columns), daemon=True
+        ).start()
+
+    def _evict(self) -> None:
+        evict_least_recently_used(self.directory, COMPILED_SCORE_SUFFIX, self.max_bytes)
+
+    def _path_for(self, key: bytes) -> Path:
+        return self.directory / f'{key.hex()}{COMPILED_SCORE_SUFFIX}'
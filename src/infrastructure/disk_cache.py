@@ -0,0 +1,23 @@
+from pathlib import Path
+
+
+def evict_least_recently_used(directory: Path, suffix: str, max_bytes: int) -> None:
+    """Remove os arquivos menos usados até respeitar o limite de tamanho.
+
+    A data de modificação marca o último uso. Arquivos removidos por outra
+    thread durante a varredura são ignorados.
+    """
+    entries: list[tuple[float, int, Path]] = []
+    for path in directory.glob(f'*{suffix}'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _mtime, size, _path in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,57 @@
+import time
+from pathlib import Path
+from typing import override
+
+import fluidsynth
+
+from infrastructure.audio_renderer import create_synth
+from infrastructure.output_backend import OutputBackend
+from infrastructure.playback_metrics import PlaybackMetrics
+from infrastructure.synth_options import SynthSettings
+
+
+class FluidSynthBackend(OutputBackend):
+    """Sintetiza o áudio no próprio processo com o FluidSynth."""
+
+    def __init__(
+        self,
+        soundfont_path: Path,
+        synth_settings: SynthSettings | None = None,
+        metrics: PlaybackMetrics | None = None,
+    ) -> None:
+        self.soundfont_path: Path = soundfont_path
+        self.synth_settings: SynthSettings = synth_settings or SynthSettings()
+        self.metrics: PlaybackMetrics | None = metrics
+        self.synth: fluidsynth.Synth = create_synth(self.synth_settings)
+
+    @override
+    def open(self) -> None:
+        started_at = time.perf_counter()
+        self.synth.start()
+        loading_at = time.perf_counter()
+        self.synth.sfload(str(self.soundfont_path))
+
+        if self.metrics:
+            self.metrics.record_synth_start(loading_at - started_at)
+            self.metrics.record_soundfont_load(time.perf_counter() - loading_at)
+
+    @override
+    def program_change(self, channel: int, program: int, bank: int = 0) -> None:
+        self.synth.bank_select(chan=channel, bank=bank)
+        self.synth.program_change(chan=channel, prg=program)
+
+    @override
+    def control_change(self, channel: int, control: int, value: int) -> None:
+        self.synth.cc(chan=channel, ctrl=control, val=value)
+
+    @override
+    def note_on(self, channel: int, key: int, velocity: int) -> None:
+        self.synth.noteon(chan=channel, key=key, vel=velocity)
+
+    @override
+    def note_off(self, channel: int, key: int) -> None:
+        self.synth.noteoff(chan=channel, key=key)
+
+    @override
+    def close(self) -> None:
+        self.synth.delete()
@@ -0,0 +1,174 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Final, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+MAX_DOTS: Final[int] = 2
+
+
+@dataclass(frozen=True)
+class QuantizeGrid:
+    """Grade de quantização, em divisões da semínima.
+
+    Com `triplets`, a grade também inclui as tercinas da divisão (três no
+    espaço de duas). A unidade interna é a menor fração comum às duas
+    grades: 1/(3·divisões) de semínima com tercinas, 1/divisões sem.
+    """
+
+    divisions: int = 4  # 4 = semicolcheias
+    triplets: bool = True
+
+    def __post_init__(self) -> None:
+        if self.divisions < 1:
+            raise ValueError('A grade precisa de ao menos uma divisão por tempo')
+
+    @property
+    def units_per_beat(self) -> int:
+        return self.divisions * 3 if self.triplets else self.divisions
+
+    @property
+    def straight_step(self) -> int:
+        return 3 if self.triplets else 1
+
+    @property
+    def triplet_step(self) -> int:
+        return 2
+
+
+class QuantizedNote(NamedTuple):
+    """Nota pronta para o MML: pausas que a antecedem e seu comprimento."""
+
+    source_position: int  # Posição da nota na lista recebida
+    rests: tuple[str, ...]  # Comprimentos das pausas (ex.: '8', '16.')
+    length: str
+
+
+class ImportQuantizer:
+    """Encaixa notas importadas na grade e escolhe os comprimentos MML.
+
+    Inícios e fins são arredondados para a grade em posições absolutas, e
+    as pausas cobrem exatamente o que falta entre o que já foi escrito e o
+    próximo início; assim um comprimento de nota aproximado é compensado
+    pela pausa seguinte e os erros não se acumulam ao longo da peça. A
+    busca do comprimento usa bisseção sobre uma tabela ordenada de todas as
+    durações que o MML representa com um número e até dois pontos.
+    """
+
+    def __init__(self, grid: QuantizeGrid | None = None) -> None:
+        self.grid: QuantizeGrid = grid or QuantizeGrid()
+        self._durations: list[int]
+        self._lengths: list[str]
+        self._durations, self._lengths = self._build_length_table()
+        # Durações se repetem muito numa peça: cada valor é resolvido uma vez
+        self._nearest_cache: dict[int, tuple[int, str]] = {}
+        self._exact_cache: dict[int, tuple[str, ...]] = {}
+
+    def _build_length_table(self) -> tuple[list[int], list[str]]:
+        """Durações (em unidades da grade) exatas na sintaxe `n` e `n.`/`n..`."""
+        units_per_beat = self.grid.units_per_beat
+        best: dict[int, str] = {}
+        for length in range(1, 4 * units_per_beat + 1):
+            for dots in range(MAX_DOTS + 1):
+                units = Fraction(4 * units_per_beat, length) * (
+                    2 - Fraction(1, 2**dots)
+                )
+                if units.denominator != 1:
+                    continue
+                text = f'{length}{"." * dots}'
+                current = best.get(units.numerator)
+                if current is None or len(text) < len(current):
+                    best[units.numerator] = text
+        durations = sorted(best)
+        return durations, [best[units] for units in durations]
+
+    def snap(
+        self, ticks: npt.NDArray[np.int64], ticks_per_beat: int
+    ) -> npt.NDArray[np.int64]:
+        """Posições em unidades da grade, no ponto mais próximo das duas grades."""
+        units = ticks.astype(np.float64) * (self.grid.units_per_beat / ticks_per_beat)
+        straight = np.rint(units / self.grid.straight_step) * self.grid.straight_step
+        if not self.grid.triplets:
+            return straight.astype(np.int64)
+        triplet = np.rint(units / self.grid.triplet_step) * self.grid.triplet_step
+        closer = np.abs(triplet - units) < np.abs(straight - units)
+        return np.where(closer, triplet, straight).astype(np.int64)
+
+    def nearest_length(self, units: int) -> tuple[int, str]:
+        """Comprimento representável mais próximo de `units` (mínimo de uma unidade)."""
+        if (cached := self._nearest_cache.get(units)) is not None:
+            return cached
+        position = bisect_left(self._durations, units)
+        # Passou do maior comprimento, ou o vizinho de baixo está tão perto quanto
+        if position == len(self._durations) or (
+            position > 0
+            and units - self._durations[position - 1]
+            <= self._durations[position] - units
+        ):
+            position -= 1
+        nearest = self._durations[position], self._lengths[position]
+        self._nearest_cache[units] = nearest
+        return nearest
+
+    def exact_lengths(self, units: int) -> tuple[str, ...]:
+        """Decompõe `units` em comprimentos que somam exatamente esse valor.
+
+        Serve às pausas, que podem ser repetidas sem mudar o que se ouve; a
+        tabela contém a unidade, então a decomposição sempre fecha.
+        """
+        if (cached := self._exact_cache.get(units)) is not None:
+            return cached
+        parts: list[str] = []
+        remaining = units
+        while remaining > 0:
+            position = bisect_right(self._durations, remaining) - 1
+            parts.append(self._lengths[position])
+            remaining -= self._durations[position]
+        self._exact_cache[units] = tuple(parts)
+        return self._exact_cache[units]
+
+    def floor_length(self, units: int) -> tuple[int, str]:
+        """Maior comprimento representável que não passa de `units`."""
+        position = bisect_right(self._durations, units) - 1
+        return self._durations[position], self._lengths[position]
+
+    def quantize(
+        self,
+        start_ticks: npt.NDArray[np.int64],
+        end_ticks: npt.NDArray[np.int64],
+        ticks_per_beat: int,
+    ) -> list[QuantizedNote]:
+        """Quantiza uma linha monofônica já ordenada.
+
+        Notas que caem no mesmo ponto da grade que a anterior são
+        descartadas, para que a linha continue monofônica. Uma nota nunca
+        invade o início da seguinte, então todo início sai exatamente no
+        ponto da grade e a diferença fica com as pausas.
+        """
+        if not len(start_ticks):
+            return []
+        starts = self.snap(start_ticks, ticks_per_beat)
+        ends = self.snap(end_ticks, ticks_per_beat)
+        kept = np.flatnonzero(np.diff(starts, prepend=-1) > 0)
+        starts, ends = starts[kept], ends[kept]
+        rooms = np.append(np.diff(starts), np.iinfo(np.int64).max)
+        targets = np.clip(ends - starts, 1, rooms)
+
+        result: list[QuantizedNote] = []
+        written = 0  # Unidades já escritas no texto
+        for source_position, start, target, room in zip(
+            kept.tolist(),
+            starts.tolist(),
+            targets.tolist(),
+            rooms.tolist(),
+            strict=True,
+        ):
+            rests = self.exact_lengths(start - written) if start > written else ()
+            units, length = self.nearest_length(target)
+            if units > room:
+                units, length = self.floor_length(room)
+            written = start + units
+            result.append(QuantizedNote(source_position, rests, length))
+        return result
@@ -1,78 +1,156 @@
 import logging
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO, Final
 
-from midiutil import MIDIFile
+import numpy as np
+import numpy.typing as npt
 
-from domain.events import (
-    InstrumentEvent,
-    MusicalEvent,
-    NoteEvent,
-    SpecificNoteEvent,
-    TempoEvent,
+from domain.columns import EventColumns, EventKind
+from domain.events import MusicalEvent
+from infrastructure.channel_allocator import MIDI_CHANNEL_COUNT, PERCUSSION_CHANNEL
+from infrastructure.smf_writer import (
+    END_OF_TRACK,
+    TrackMessages,
+    encode_track,
+    header_chunk,
+    note_messages,
+    program_messages,
+    sort_track,
+    tempo_messages,
+    to_ticks,
+    track_chunk_header,
+    track_size,
 )
 
 logger = logging.getLogger(__name__)
 
+# Canais melódicos disponíveis para as vozes (o canal 10 é de percussão)
+VOICE_CHANNELS: Final[tuple[int, ...]] = tuple(
+    channel for channel in range(MIDI_CHANNEL_COUNT) if channel != PERCUSSION_CHANNEL
+)
+
+type Score = list[MusicalEvent] | EventColumns
+
 
 class MIDIExporter:
-    """Gera e salva um arquivo MIDI a partir da lista de eventos."""
+    """Gera um arquivo MIDI (SMF formato 1) a partir da lista de eventos.
 
-    def save(
-        self,
-        events: list[MusicalEvent],
-        file_path: Path,
-    ) -> None:
-        """Criar o objeto `MIDIFile` e o salvar no disco."""
-        midi = MIDIFile(1, deinterleave=False)
-
-        track = 0
-        channel = 0
-        initial_tempo_defined = False
-        initial_instrument_defined = False
-
-        for event in events:
-            if isinstance(event, TempoEvent) and not initial_tempo_defined:
-                midi.addTempo(
-                    track=track,
-                    time=event.time,
-                    tempo=event.bpm,
-                )
-                initial_tempo_defined = True
-
-            elif isinstance(event, InstrumentEvent) and not initial_instrument_defined:
-                midi.addProgramChange(
-                    tracknum=track,
-                    channel=channel,
-                    time=event.time,
-                    program=event.instrument_id,
-                )
-                initial_instrument_defined = True
-
-            elif isinstance(event, (NoteEvent, SpecificNoteEvent)):
-                midi.addNote(
-                    track=track,
-                    channel=channel,
-                    pitch=event.pitch,
-                    time=event.time,
-                    duration=event.duration,
-                    volume=event.volume,
-                )
-
-            # Mudanças de tempo/instrumento no meio da música
-            if isinstance(event, TempoEvent) and initial_tempo_defined:
-                midi.addTempo(
-                    track=track,
-                    time=event.time,
-                    tempo=event.bpm,
-                )
-
-            if isinstance(event, InstrumentEvent) and initial_instrument_defined:
-                midi.addProgramChange(
-                    tracknum=track,
-                    channel=channel,
-                    time=event.time,
-                    program=event.instrument_id,
-                )
+    A primeira trilha guarda os tempos e cada voz vira uma trilha própria,
+    tocada em um canal próprio. O arquivo é produzido trilha a trilha, de
+    modo que cada bloco pode ser escrito no destino assim que fica pronto.
+    """
 
+    def save(self, events: Score, file_path: Path) -> None:
+        """Grava o arquivo MIDI no disco."""
         with file_path.open('wb') as output_file:
-            midi.writeFile(output_file)
+            self.write(events, output_file)
+
+    def write(self, events: Score, stream: BinaryIO) -> int:
+        """Escreve o arquivo em qualquer fluxo binário e retorna o total de bytes.
+
+        Serve para sockets, compressores ou pipes: nada além da trilha em
+        codificação fica em memória.
+        """
+        written = 0
+        for chunk in self.iter_chunks(events):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def to_bytes(self, events: Score) -> bytes:
+        """Gera o arquivo MIDI em memória, sem passar pelo disco."""
+        return b''.join(self.iter_chunks(events))
+
+    def to_memoryview(self, events: Score) -> memoryview:
+        """Gera o arquivo em um único buffer e devolve uma visão dele.
+
+        Os tamanhos das trilhas saem antes da codificação, então cada corpo é
+        gravado uma única vez, já na sua posição final do buffer.
+        """
+        tracks = list(self._iter_tracks(self._as_columns(events)))
+        sizes = [track_size(messages) for messages in tracks]
+        header = header_chunk(len(tracks))
+        chunk_overhead = len(track_chunk_header(0)) + len(END_OF_TRACK)
+        buffer = np.empty(
+            len(header) + sum(sizes) + chunk_overhead * len(tracks), dtype=np.uint8
+        )
+
+        offset = self._put(buffer, 0, header)
+        for messages, size in zip(tracks, sizes, strict=True):
+            offset = self._put(buffer, offset, track_chunk_header(size))
+            encode_track(messages, out=buffer[offset : offset + size])
+            offset = self._put(buffer, offset + size, END_OF_TRACK)
+        return memoryview(buffer)
+
+    def iter_chunks(self, events: Score) -> Iterator[bytes | memoryview]:
+        """Gera o cabeçalho e as trilhas, em ordem, à medida que são codificados."""
+        columns = self._as_columns(events)
+        yield header_chunk(self._voice_count(columns) + 1)
+        for messages in self._iter_tracks(columns):
+            yield from self._track_chunks(messages)
+
+    @staticmethod
+    def _as_columns(events: Score) -> EventColumns:
+        if isinstance(events, EventColumns):
+            return events
+        return EventColumns.from_events(events)
+
+    @staticmethod
+    def _voice_count(columns: EventColumns) -> int:
+        return int(columns.voice.max(initial=0)) + 1
+
+    def _iter_tracks(self, columns: EventColumns) -> Iterator[TrackMessages]:
+        """Mensagens ordenadas da trilha de tempos e de cada voz, uma por vez."""
+        insertion = np.arange(len(columns), dtype=np.int64)
+        ticks = to_ticks(columns.time)
+
+        tempos = np.flatnonzero(columns.kind == EventKind.TEMPO)
+        yield sort_track(
+            tempo_messages(ticks[tempos], columns.value[tempos], insertion[tempos])
+        )
+
+        for voice in range(self._voice_count(columns)):
+            yield sort_track(self._voice_messages(columns, ticks, insertion, voice))
+
+    def _voice_messages(
+        self,
+        columns: EventColumns,
+        ticks: npt.NDArray[np.int64],
+        insertion: npt.NDArray[np.int64],
+        voice: int,
+    ) -> TrackMessages:
+        channel = VOICE_CHANNELS[voice % len(VOICE_CHANNELS)]
+        in_voice = columns.voice == voice
+
+        programs = np.flatnonzero(in_voice & (columns.kind == EventKind.INSTRUMENT))
+        notes = np.flatnonzero(
+            in_voice & columns.mask(EventKind.NOTE, EventKind.SPECIFIC_NOTE)
+        )
+        return TrackMessages.concatenate(
+            program_messages(
+                ticks[programs], channel, columns.value[programs], insertion[programs]
+            ),
+            note_messages(
+                ticks[notes],
+                # O fim vem do tempo final, não da duração truncada: assim uma
+                # nota termina no mesmo tick em que a seguinte começa
+                to_ticks(columns.time[notes] + columns.duration[notes]) - ticks[notes],
+                channel,
+                columns.pitch[notes],
+                columns.volume[notes],
+                insertion[notes],
+            ),
+        )
+
+    def _track_chunks(self, messages: TrackMessages) -> Iterator[bytes | memoryview]:
+        body = encode_track(messages)
+        yield track_chunk_header(len(body))
+        yield memoryview(body)
+        yield END_OF_TRACK
+
+    @staticmethod
+    def _put(buffer: npt.NDArray[np.uint8], offset: int, chunk: bytes) -> int:
+        end = offset + len(chunk)
+        buffer[offset:end] = np.frombuffer(chunk, dtype=np.uint8)
+        return end
@@ -3,11 +3,11 @@ from pathlib import Path
 from typing import Final, NamedTuple
 
 import mido  # pyright: ignore[reportMissingTypeStubs]
+import numpy as np
 
-from config import MIDI_BASE_NOTES
+from domain.mml_writer import MMLWriter
+from infrastructure.import_quantizer import ImportQuantizer, QuantizeGrid
 
-MIN_DURATION_THRESHOLD: Final[float] = 0.01
-DURATION_EPSILON: Final[float] = 1e-5
 DEFAULT_BPM: Final[int] = 120
 
 
@@ -34,13 +34,8 @@ class ConversionResult(NamedTuple):
 class MIDIImporter:
     """Converte arquivos MIDI para o formato de texto da aplicação, forçando monofonia."""
 
-    def __init__(self) -> None:
-        self._pitch_map: dict[int, str] = {
-            v % 12: k for k, v in MIDI_BASE_NOTES.items()
-        }
-        self._duration_lookup: list[tuple[float, int, int]] = (
-            self._build_duration_table()
-        )
+    def __init__(self, grid: QuantizeGrid | None = None) -> None:
+        self.quantizer: ImportQuantizer = ImportQuantizer(grid)
 
     def load(self, filepath: Path) -> ConversionResult:
         """Carrega um arquivo MIDI e retorna o resultado da conversão."""
@@ -162,86 +157,23 @@ class MIDIImporter:
     def _transpile_to_text(
         self, events: list[NoteEvent], tpb: int, init_inst: int, init_vol: int
     ) -> str:
-        """Converte eventos limpos para o formato de string específico do domínio."""
-        parts = []
-        curr_ticks = 0
-        curr_octave = 5
-        curr_vol: int = init_vol
-        curr_inst: int = init_inst
-
-        for note in events:
-            gap: int = note.start_ticks - curr_ticks
-            if gap > 0:
-                rest_str: str = self._format_duration(char='R', beats=gap / tpb)
-                if rest_str:
-                    parts.append(rest_str)
-
-            curr_ticks: int = note.start_ticks
-
-            if note.instrument != curr_inst:
-                parts.append(f'I{note.instrument}')
-                curr_inst: int = note.instrument
-
-            if note.velocity != curr_vol:
-                parts.append(f'V{note.velocity}')
-                curr_vol: int = note.velocity
-
-            target_octave: int = note.pitch // 12
-            diff: int = target_octave - curr_octave
-            if diff == 1:
-                parts.append('>')
-            elif diff == -1:
-                parts.append('<')
-            elif diff != 0:
-                parts.append(f'O{target_octave}')
-            curr_octave: int = target_octave
-
-            pitch_class: int = note.pitch % 12
-            char: str | None = self._pitch_map.get(pitch_class)
-
-            if not char:
-                prev_pitch: int = (pitch_class - 1) % 12
-                base: str = self._pitch_map.get(prev_pitch, 'C')
-                char = f'{base}#'
-
-            duration_str: str = self._format_duration(
-                char, beats=note.duration_ticks / tpb
-            )
-            parts.append(duration_str)
-
-            curr_ticks += note.duration_ticks
-
-        return ' '.join(parts)
-
-    def _build_duration_table(self) -> list[tuple[float, int, int]]:
-        """Cria uma tabela de consulta para durações de notas padrão."""
-        table = []
-        base_lengths: list[int] = [1, 2, 4, 8, 16, 32, 64]
-
-        for length in base_lengths:
-            base_dur: float = 4.0 / length
-            table.append((base_dur, length, 0))
-            table.append((base_dur * 1.5, length, 1))
-            table.append((base_dur * 1.75, length, 2))
+        """Converte eventos limpos para o formato de string específico do domínio.
 
-        return table
-
-    def _format_duration(self, char: str, beats: float) -> str:
-        """Encontra a duração padrão mais próxima usando a tabela de consulta."""
-        if beats <= MIN_DURATION_THRESHOLD:
-            return ''
-
-        best_match: tuple[int, int] = (0, 0)
-        min_error: float = float('inf')
-
-        for dur, length, dots in self._duration_lookup:
-            error: float = abs(dur - beats)
-            if error < min_error:
-                min_error = error
-                best_match = (length, dots)
-
-                if error < DURATION_EPSILON:
-                    break
-
-        length, dots = best_match
-        return f'{char}{length}{"." * dots}'
+        Inícios e durações passam pelo quantizador, que os encaixa na grade
+        e escolhe os comprimentos MML; o `MMLWriter` compacta o texto.
+        """
+        writer = MMLWriter(volume=init_vol, instrument=init_inst)
+        quantized = self.quantizer.quantize(
+            start_ticks=np.array([note.start_ticks for note in events], np.int64),
+            end_ticks=np.array([note.end_ticks for note in events], np.int64),
+            ticks_per_beat=tpb,
+        )
+        for index, rests, length in quantized:
+            note = events[index]
+            for rest in rests:
+                writer.add_rest(rest)
+            writer.set_instrument(note.instrument)
+            writer.set_volume(note.velocity)
+            writer.add_note(note.pitch, length)
+
+        return writer.text()
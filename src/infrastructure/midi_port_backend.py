@@ -0,0 +1,77 @@
+import logging
+from typing import Final, override
+
+import mido
+
+from infrastructure.output_backend import OutputBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT_NAME: Final[str] = 'txt2midi'
+
+
+def available_output_ports() -> list[str]:
+    """Portas MIDI de saída visíveis (requer o backend `python-rtmidi`)."""
+    # As funções de porta são criadas em tempo de execução pelo backend do mido
+    return mido.get_output_names()  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class MidiPortBackend(OutputBackend):
+    """Envia os comandos em tempo real para uma porta MIDI externa.
+
+    Se já existir uma porta de saída com o nome informado (um sintetizador ou
+    DAW), conecta-se a ela; caso contrário cria uma porta virtual (no Linux,
+    um cliente do sequenciador ALSA) à qual outros programas podem se ligar.
+    Nenhum áudio é sintetizado no processo.
+    """
+
+    def __init__(self, port_name: str = DEFAULT_PORT_NAME) -> None:
+        self.port_name: str = port_name
+        self.port: mido.ports.BaseOutput | None = None
+
+    @override
+    def open(self) -> None:
+        port: mido.ports.BaseOutput
+        if self.port_name in available_output_ports():
+            port = mido.open_output(self.port_name)  # pyright: ignore[reportAttributeAccessIssue]
+        else:
+            port = mido.open_output(self.port_name, virtual=True)  # pyright: ignore[reportAttributeAccessIssue]
+        logger.info('Saída MIDI: %s', port.name)
+        self.port = port
+
+    @override
+    def program_change(self, channel: int, program: int, bank: int = 0) -> None:
+        # Seleção de banco: MSB (controle 0) e LSB (controle 32)
+        self.control_change(channel, 0, bank >> 7)
+        self.control_change(channel, 32, bank & 0x7F)
+        self._send(mido.Message('program_change', channel=channel, program=program))
+
+    @override
+    def control_change(self, channel: int, control: int, value: int) -> None:
+        self._send(
+            mido.Message(
+                'control_change', channel=channel, control=control, value=value
+            )
+        )
+
+    @override
+    def note_on(self, channel: int, key: int, velocity: int) -> None:
+        self._send(
+            mido.Message('note_on', channel=channel, note=key, velocity=velocity)
+        )
+
+    @override
+    def note_off(self, channel: int, key: int) -> None:
+        self._send(mido.Message('note_off', channel=channel, note=key))
+
+    @override
+    def close(self) -> None:
+        if self.port is None:
+            return
+        self.port.reset()  # All Notes Off e Reset All Controllers em cada canal
+        self.port.close()
+        self.port = None
+
+    def _send(self, message: mido.Message) -> None:
+        if self.port is not None:
+            self.port.send(message)
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+
+
+class OutputBackend(ABC):
+    """Destino dos comandos da agenda: sintetizador interno ou porta MIDI."""
+
+    @abstractmethod
+    def open(self) -> None:
+        """Prepara o destino antes do primeiro comando."""
+
+    @abstractmethod
+    def program_change(self, channel: int, program: int, bank: int = 0) -> None: ...
+
+    @abstractmethod
+    def control_change(self, channel: int, control: int, value: int) -> None: ...
+
+    @abstractmethod
+    def note_on(self, channel: int, key: int, velocity: int) -> None: ...
+
+    @abstractmethod
+    def note_off(self, channel: int, key: int) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Silencia as notas pendentes e libera o destino."""
@@ -0,0 +1,199 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Final, Self
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENV_VAR: Final[str] = 'TXT2MIDI_METRICS'
+
+# Limites superiores (ms) dos baldes do histograma de atraso por evento;
+# os negativos contam eventos adiantados
+DELTA_BUCKETS_MS: Final[tuple[float, ...]] = (
+    -10.0,
+    -1.0,
+    -0.1,
+    0.1,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    20.0,
+    50.0,
+    100.0,
+    math.inf,
+)
+
+
+class MetricsFormat(StrEnum):
+    """Formatos de saída do relatório de métricas."""
+
+    JSON = 'json'
+    TEXT = 'text'
+
+
+class PlaybackMetrics:
+    """Coletor opcional de latência e jitter da reprodução.
+
+    Registra a duração do parsing, do carregamento do SoundFont e da
+    inicialização do sintetizador, o tempo até a primeira nota, o histograma
+    de atraso com sinal (real - agendado) por evento e o pico de notas
+    soando, contado à medida que ataques e desligamentos são entregues.
+    """
+
+    def __init__(
+        self,
+        output_path: Path | None = None,
+        output_format: MetricsFormat = MetricsFormat.JSON,
+    ) -> None:
+        self.output_path: Path | None = output_path
+        self.output_format: MetricsFormat = output_format
+        self._lock: threading.Lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_environment(cls) -> Self | None:
+        """Ativa as métricas se `TXT2MIDI_METRICS` apontar para um arquivo."""
+        value = os.environ.get(METRICS_ENV_VAR)
+        if not value:
+            return None
+        path = Path(value)
+        output_format = (
+            MetricsFormat.JSON if path.suffix == '.json' else MetricsFormat.TEXT
+        )
+        return cls(output_path=path, output_format=output_format)
+
+    def reset(self) -> None:
+        self.requested_at: float = time.perf_counter()
+        self.parse_seconds: float | None = None
+        self.synth_start_seconds: float | None = None
+        self.soundfont_load_seconds: float | None = None
+        self.time_to_first_note_seconds: float | None = None
+        self.active_notes: int = 0
+        self.peak_active_notes: int | None = None  # Sem notas entregues: não medido
+        self.delta_buckets: list[int] = [0] * len(DELTA_BUCKETS_MS)
+        self.delta_count: int = 0
+        self.delta_sum_ms: float = 0.0
+        self.delta_sum_squares_ms: float = 0.0
+        self.delta_min_ms: float = math.inf
+        self.delta_max_ms: float = -math.inf
+
+    def start(self) -> None:
+        """Marca o pedido de reprodução, início de todas as medições."""
+        self.reset()
+
+    def record_parse(self, seconds: float) -> None:
+        self.parse_seconds = seconds
+
+    def record_synth_start(self, seconds: float) -> None:
+        self.synth_start_seconds = seconds
+
+    def record_soundfont_load(self, seconds: float) -> None:
+        self.soundfont_load_seconds = seconds
+
+    def record_first_note(self, at: float) -> None:
+        """Registra o instante (perf_counter) da primeira nota, se ainda não houver."""
+        if self.time_to_first_note_seconds is None:
+            self.time_to_first_note_seconds = at - self.requested_at
+
+    def record_event_delta(self, scheduled: float, actual: float) -> None:
+        """Registra o atraso de um evento, ambos em segundos desde o início.
+
+        O sinal é mantido: eventos adiantados entram como atrasos negativos.
+        """
+        delta_ms = (actual - scheduled) * 1000.0
+        with self._lock:
+            self.delta_buckets[bisect_left(DELTA_BUCKETS_MS, delta_ms)] += 1
+            self.delta_count += 1
+            self.delta_sum_ms += delta_ms
+            self.delta_sum_squares_ms += delta_ms * delta_ms
+            self.delta_min_ms = min(self.delta_min_ms, delta_ms)
+            self.delta_max_ms = max(self.delta_max_ms, delta_ms)
+
+    def record_note_on(self, at: float) -> None:
+        """Conta um ataque entregue ao destino no instante `at` (perf_counter)."""
+        self.record_first_note(at)
+        with self._lock:
+            self.active_notes += 1
+            self.peak_active_notes = max(self.peak_active_notes or 0, self.active_notes)
+
+    def record_note_off(self) -> None:
+        with self._lock:
+            self.active_notes = max(0, self.active_notes - 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'parse_seconds': self.parse_seconds,
+            'synth_start_seconds': self.synth_start_seconds,
+            'soundfont_load_seconds': self.soundfont_load_seconds,
+            'time_to_first_note_seconds': self.time_to_first_note_seconds,
+            'peak_active_notes': self.peak_active_notes,
+            'event_delta_ms': {
+                'count': self.delta_count,
+                'mean': self._delta_mean(),
+                'stddev': self._delta_stddev(),
+                'min': self.delta_min_ms if self.delta_count else 0.0,
+                'max': self.delta_max_ms if self.delta_count else 0.0,
+                'histogram': {
+                    self._bucket_label(limit): count
+                    for limit, count in zip(
+                        DELTA_BUCKETS_MS, self.delta_buckets, strict=True
+                    )
+                },
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_text(self) -> str:
+        data = self.to_dict()
+        deltas = data.pop('event_delta_ms')
+        lines = [f'{name}: {self._format_value(value)}' for name, value in data.items()]
+        lines.append(
+            f'event_delta_ms: count={deltas["count"]} '
+            f'mean={deltas["mean"]:.3f} stddev={deltas["stddev"]:.3f} '
+            f'min={deltas["min"]:.3f} max={deltas["max"]:.3f}'
+        )
+        lines.extend(
+            f'  {label:>8}: {count}' for label, count in deltas['histogram'].items()
+        )
+        return '\n'.join(lines)
+
+    def dump(self) -> None:
+        """Grava o relatório no arquivo configurado ou o envia ao log."""
+        report = (
+            self.to_json()
+            if self.output_format == MetricsFormat.JSON
+            else self.to_text()
+        )
+        if self.output_path is None:
+            logger.info('Métricas de reprodução:\n%s', report)
+            return
+        self.output_path.write_text(report + '\n', encoding='utf-8')
+
+    def _delta_mean(self) -> float:
+        return self.delta_sum_ms / self.delta_count if self.delta_count else 0.0
+
+    def _delta_stddev(self) -> float:
+        """Desvio-padrão dos atrasos: o jitter propriamente dito."""
+        if not self.delta_count:
+            return 0.0
+        mean = self._delta_mean()
+        variance = self.delta_sum_squares_ms / self.delta_count - mean * mean
+        return math.sqrt(max(0.0, variance))
+
+    @staticmethod
+    def _bucket_label(limit: float) -> str:
+        return f'<={limit:g}' if math.isfinite(limit) else f'>{DELTA_BUCKETS_MS[-2]:g}'
+
+    @staticmethod
+    def _format_value(value: object) -> str:
+        return f'{value:.6f}' if isinstance(value, float) else str(value)
@@ -0,0 +1,142 @@
+import heapq
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, override
+
+from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
+
+from domain.events import MusicalEvent
+from domain.models import PlaybackSettings
+from infrastructure.audio_player import FluidSynthPlayer
+from infrastructure.channel_allocator import MIDI_CHANNEL_COUNT
+from infrastructure.playback_metrics import PlaybackMetrics
+from infrastructure.synth_options import (
+    DEFAULT_LOOKAHEAD_SECONDS,
+    SchedulingMode,
+    SynthSettings,
+)
+from infrastructure.synth_schedule import SynthCommand, SynthMessage, SynthScheduler
+
+# O sintetizador é criado com 256 canais: 16 blocos de 16 canais MIDI
+MAX_MIXER_STREAMS: Final[int] = 16
+CHANNEL_VOLUME_CONTROL: Final[int] = 7
+DEFAULT_CHANNEL_VOLUME: Final[int] = 100
+MAX_CHANNEL_VOLUME: Final[int] = 127
+
+
+@dataclass
+class MixerStream:
+    """Uma partitura no mixer, com nível, mudo e solo ajustáveis ao vivo."""
+
+    events: list[MusicalEvent]
+    settings: PlaybackSettings
+    gain: float = 1.0
+    muted: bool = False
+    solo: bool = False
+    on_progress_callback: Callable[[int, int], None] | None = None
+
+
+class PlaybackMixer(FluidSynthPlayer):
+    """Toca várias partituras ao mesmo tempo em um único sintetizador.
+
+    Cada stream ocupa um bloco próprio de 16 canais, então alocações de
+    canal e trocas de programa de um stream não interferem nos outros. As
+    agendas são intercaladas e disparadas pela mesma thread, com um só
+    driver de áudio e um só carregamento do SoundFont. Ganho, mudo e solo
+    agem sobre o volume dos canais (controle 7) e valem na hora, inclusive
+    para notas que já estão soando; antes do início e depois do fim da
+    reprodução só atualizam o estado do stream.
+    """
+
+    def __init__(
+        self,
+        soundfont_path: Path,
+        streams: list[MixerStream],
+        on_finished_callback: Callable[[], None] | None = None,
+        synth_settings: SynthSettings | None = None,
+        scheduling_mode: SchedulingMode = SchedulingMode.SEQUENCER,
+        lookahead_seconds: float = DEFAULT_LOOKAHEAD_SECONDS,
+        metrics: PlaybackMetrics | None = None,
+    ) -> None:
+        if len(streams) > MAX_MIXER_STREAMS:
+            raise ValueError(f'O mixer aceita até {MAX_MIXER_STREAMS} partituras')
+        super().__init__(
+            soundfont_path=soundfont_path,
+            events=[],
+            settings=PlaybackSettings(),
+            on_finished_callback=on_finished_callback,
+            synth_settings=synth_settings,
+            scheduling_mode=scheduling_mode,
+            lookahead_seconds=lookahead_seconds,
+            metrics=metrics,
+        )
+        self.streams: list[MixerStream] = streams
+
+    def set_gain(self, index: int, gain: float) -> None:
+        self.streams[index].gain = max(gain, 0.0)
+        self._apply_levels()
+
+    def set_muted(self, index: int, muted: bool) -> None:
+        self.streams[index].muted = muted
+        self._apply_levels()
+
+    def set_solo(self, index: int, solo: bool) -> None:
+        self.streams[index].solo = solo
+        self._apply_levels()
+
+    @override
+    def _build_schedule(self) -> list[SynthMessage]:
+        # Chamado com o backend já aberto: aplica os níveis iniciais
+        self._apply_levels()
+
+        scheduler = SynthScheduler()
+        schedules = [
+            self._offset_channels(
+                scheduler.build(stream.events, stream.settings),
+                index * MIDI_CHANNEL_COUNT,
+            )
+            for index, stream in enumerate(self.streams)
+        ]
+        return list(heapq.merge(*schedules, key=lambda message: message.seconds))
+
+    def _offset_channels(
+        self, schedule: list[SynthMessage], base_channel: int
+    ) -> list[SynthMessage]:
+        """Move a agenda para o bloco de canais do stream.
+
+        Os marcadores também recebem o canal base, que identifica o stream
+        na hora de reportar o progresso.
+        """
+        return [
+            message._replace(channel=message.channel + base_channel)
+            for message in schedule
+        ]
+
+    def _channel_volume(self, stream: MixerStream) -> int:
+        soloing = any(other.solo for other in self.streams)
+        if stream.muted or (soloing and not stream.solo):
+            return 0
+        return min(round(DEFAULT_CHANNEL_VOLUME * stream.gain), MAX_CHANNEL_VOLUME)
+
+    def _apply_levels(self) -> None:
+        with self._backend_lock:
+            if not self._backend_open:
+                return
+            for index, stream in enumerate(self.streams):
+                volume = self._channel_volume(stream)
+                base_channel = index * MIDI_CHANNEL_COUNT
+                for channel in range(base_channel, base_channel + MIDI_CHANNEL_COUNT):
+                    self.backend.control_change(channel, CHANNEL_VOLUME_CONTROL, volume)
+
+    @override
+    def _process_message(self, message: SynthMessage) -> None:
+        if message.command == SynthCommand.MARKER:
+            stream = self.streams[message.channel // MIDI_CHANNEL_COUNT]
+            if stream.on_progress_callback:
+                GLib.idle_add(
+                    stream.on_progress_callback,
+                    message.source_index,
+                    message.source_length,
+                )
+        super()._process_message(message)
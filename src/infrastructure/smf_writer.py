@@ -0,0 +1,210 @@
+import struct
+from typing import Final, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+TICKS_PER_QUARTER: Final[int] = 960
+SMF_FORMAT: Final[int] = 1
+END_OF_TRACK: Final[bytes] = b'\x00\xff\x2f\x00'
+
+NOTE_OFF_STATUS: Final[int] = 0x80
+NOTE_ON_STATUS: Final[int] = 0x90
+PROGRAM_CHANGE_STATUS: Final[int] = 0xC0
+SET_TEMPO_META: Final[bytes] = b'\xff\x51\x03'
+
+# Desempate entre eventos no mesmo tick (o mesmo critério do `midiutil`):
+# troca de programa, depois desligamentos e, por fim, ataques e tempos.
+PROGRAM_ORDER: Final[int] = 1
+NOTE_OFF_ORDER: Final[int] = 2
+NOTE_ON_ORDER: Final[int] = 3
+TEMPO_ORDER: Final[int] = 3
+
+MAX_MESSAGE_BYTES: Final[int] = 6  # FF 51 03 tt tt tt
+MAX_DELTA_BYTES: Final[int] = 5  # Quantidade de tamanho variável de até 35 bits
+
+
+class TrackMessages(NamedTuple):
+    """Mensagens de uma trilha ainda fora de ordem, uma linha por mensagem.
+
+    `data` guarda os bytes de cada mensagem alinhados à esquerda e `size`
+    quantos deles são válidos; `insertion` desempata eventos simultâneos
+    do mesmo tipo pela ordem em que foram gerados.
+    """
+
+    tick: npt.NDArray[np.int64]
+    order: npt.NDArray[np.int8]
+    insertion: npt.NDArray[np.int64]
+    data: npt.NDArray[np.uint8]
+    size: npt.NDArray[np.int8]
+
+    @classmethod
+    def concatenate(cls, *parts: 'TrackMessages') -> 'TrackMessages':
+        return cls(*(np.concatenate(arrays) for arrays in zip(*parts, strict=True)))
+
+
+def to_ticks(beats: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+    """Converte semínimas em ticks truncando, como `int(beats * divisão)`."""
+    return (beats * TICKS_PER_QUARTER).astype(np.int64)
+
+
+def _messages(
+    tick: npt.NDArray[np.int64],
+    order: int,
+    insertion: npt.NDArray[np.int64],
+    columns: list[npt.ArrayLike],
+) -> TrackMessages:
+    data = np.zeros((len(tick), MAX_MESSAGE_BYTES), dtype=np.uint8)
+    for position, values in enumerate(columns):
+        data[:, position] = values
+    return TrackMessages(
+        tick=tick,
+        order=np.full(len(tick), order, dtype=np.int8),
+        insertion=insertion,
+        data=data,
+        size=np.full(len(tick), len(columns), dtype=np.int8),
+    )
+
+
+def _first_unique(*keys: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """Posições da primeira ocorrência de cada chave, na ordem original.
+
+    Reproduz a remoção de eventos duplicados do `midiutil`, que mantém o
+    evento inserido primeiro.
+    """
+    if len(keys[0]) == 0:
+        return np.zeros(0, dtype=np.int64)
+    _, first = np.unique(np.stack(keys), axis=1, return_index=True)
+    return np.sort(first)
+
+
+def note_messages(
+    tick: npt.NDArray[np.int64],
+    duration_ticks: npt.NDArray[np.int64],
+    channel: int,
+    pitch: npt.NDArray[np.integer],
+    velocity: npt.NDArray[np.integer],
+    insertion: npt.NDArray[np.int64],
+) -> TrackMessages:
+    """Pares de ataque e desligamento; o desligamento repete a intensidade."""
+    pitch = pitch.astype(np.int64)
+    off_tick = tick + duration_ticks
+    on = _first_unique(tick, pitch)
+    off = _first_unique(off_tick, pitch)
+    return TrackMessages.concatenate(
+        _messages(
+            tick[on],
+            NOTE_ON_ORDER,
+            insertion[on],
+            [NOTE_ON_STATUS | channel, pitch[on], velocity[on]],
+        ),
+        _messages(
+            off_tick[off],
+            NOTE_OFF_ORDER,
+            insertion[off],
+            [NOTE_OFF_STATUS | channel, pitch[off], velocity[off]],
+        ),
+    )
+
+
+def program_messages(
+    tick: npt.NDArray[np.int64],
+    channel: int,
+    program: npt.NDArray[np.integer],
+    insertion: npt.NDArray[np.int64],
+) -> TrackMessages:
+    unique = _first_unique(tick, program.astype(np.int64))
+    return _messages(
+        tick[unique],
+        PROGRAM_ORDER,
+        insertion[unique],
+        [PROGRAM_CHANGE_STATUS | channel, program[unique]],
+    )
+
+
+def tempo_messages(
+    tick: npt.NDArray[np.int64],
+    bpm: npt.NDArray[np.integer],
+    insertion: npt.NDArray[np.int64],
+) -> TrackMessages:
+    """Mudanças de tempo em microssegundos por semínima (24 bits)."""
+    microseconds = (60_000_000 / bpm).astype(np.int64)
+    unique = _first_unique(tick, microseconds)
+    tempo = microseconds[unique] & 0xFFFFFF
+    return _messages(
+        tick[unique],
+        TEMPO_ORDER,
+        insertion[unique],
+        [*SET_TEMPO_META, tempo >> 16, (tempo >> 8) & 0xFF, tempo & 0xFF],
+    )
+
+
+def sort_track(messages: TrackMessages) -> TrackMessages:
+    """Ordena por tick, tipo de mensagem e ordem de inserção."""
+    sort = np.lexsort((messages.insertion, messages.order, messages.tick))
+    return TrackMessages(
+        tick=messages.tick[sort],
+        order=messages.order[sort],
+        insertion=messages.insertion[sort],
+        data=messages.data[sort],
+        size=messages.size[sort],
+    )
+
+
+def _delta_sizes(
+    messages: TrackMessages,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int8]]:
+    delta = np.diff(messages.tick, prepend=0)
+    delta_size = np.ones(len(delta), dtype=np.int8)
+    for group in range(1, MAX_DELTA_BYTES):
+        delta_size += delta >= (1 << (7 * group))
+    return delta, delta_size
+
+
+def track_size(messages: TrackMessages) -> int:
+    """Tamanho do corpo de uma trilha já ordenada, sem codificá-la."""
+    _, delta_size = _delta_sizes(messages)
+    return int(delta_size.sum(dtype=np.int64) + messages.size.sum(dtype=np.int64))
+
+
+def encode_track(
+    messages: TrackMessages, out: npt.NDArray[np.uint8] | None = None
+) -> npt.NDArray[np.uint8]:
+    """Gera o corpo de uma trilha já ordenada (sem cabeçalho e fim).
+
+    Os deltas em quantidade de tamanho variável e os bytes das mensagens
+    são montados em uma matriz de largura fixa; uma máscara recolhe só os
+    bytes válidos de cada linha, em ordem, sem laço em Python. Com `out`
+    (de `track_size` bytes), o corpo é gravado direto nele.
+    """
+    delta, delta_size = _delta_sizes(messages)
+
+    width = MAX_DELTA_BYTES + MAX_MESSAGE_BYTES
+    rows = np.zeros((len(delta), width), dtype=np.uint8)
+    for position in range(MAX_DELTA_BYTES):
+        # Byte `position` da quantidade: grupo de 7 bits mais significativo primeiro
+        group = (delta_size - 1 - position).astype(np.int64)
+        present = group >= 0
+        value = (delta >> (7 * np.maximum(group, 0))) & 0x7F
+        value |= np.where(group > 0, 0x80, 0)
+        rows[:, position] = np.where(present, value, 0)
+
+    # Encosta a mensagem logo após os bytes do delta de cada linha
+    columns = np.arange(width)
+    source = columns[None, :] - delta_size[:, None]
+    in_message = (source >= 0) & (source < messages.size[:, None])
+    message_bytes = np.take_along_axis(
+        messages.data, np.clip(source, 0, MAX_MESSAGE_BYTES - 1), axis=1
+    )
+    rows = np.where(in_message, message_bytes, rows)
+
+    valid = columns[None, :] < (delta_size + messages.size)[:, None]
+    return np.compress(valid.ravel(), rows.ravel(), out=out)
+
+
+def header_chunk(track_count: int) -> bytes:
+    return b'MThd' + struct.pack('>LHHH', 6, SMF_FORMAT, track_count, TICKS_PER_QUARTER)
+
+
+def track_chunk_header(body_size: int) -> bytes:
+    return b'MTrk' + struct.pack('>L', body_size + len(END_OF_TRACK))
@@ -0,0 +1,112 @@
+import mmap
+import struct
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from config import INSTRUMENTS
+from domain.name_index import NameIndex
+
+RIFF_HEADER: Final[struct.Struct] = struct.Struct('<4sI4s')
+CHUNK_HEADER: Final[struct.Struct] = struct.Struct('<4sI')
+# Nome, preset, banco, índice da bag, biblioteca, gênero e morfologia
+PRESET_HEADER: Final[struct.Struct] = struct.Struct('<20sHHHIII')
+
+PRESET_CACHE_SIZE: Final[int] = 8
+
+type PresetKey = tuple[int, int]  # (banco, preset)
+
+
+class SoundFontPreset(NamedTuple):
+    bank: int
+    preset: int
+    name: str
+
+    @property
+    def key(self) -> PresetKey:
+        return (self.bank, self.preset)
+
+    @property
+    def label(self) -> str:
+        """Rótulo único na lista (nomes podem se repetir entre bancos)."""
+        return f'{self.bank:03d}:{self.preset:03d} {self.name}'
+
+
+# Lista usada quando o SoundFont não pode ser lido
+GENERAL_MIDI_PRESETS: Final[tuple[SoundFontPreset, ...]] = tuple(
+    SoundFontPreset(0, instrument_id, name) for instrument_id, name in INSTRUMENTS
+)
+
+
+def _chunks(
+    buffer: mmap.mmap, start: int, end: int
+) -> Iterator[tuple[bytes, int, int]]:
+    """Chunks RIFF entre `start` e `end`: (id, início dos dados, tamanho)."""
+    offset = start
+    while offset + CHUNK_HEADER.size <= end:
+        chunk_id, size = CHUNK_HEADER.unpack_from(buffer, offset)
+        data = offset + CHUNK_HEADER.size
+        if data + size > end:
+            raise ValueError(f'Chunk {chunk_id!r} truncado no SoundFont')
+        yield chunk_id, data, size
+        offset = data + size + (size & 1)  # Chunks são alinhados em 2 bytes
+
+
+def _parse_preset_headers(data: bytes) -> tuple[SoundFontPreset, ...]:
+    # O último registro ("EOP") só marca o fim da lista
+    records = len(data) // PRESET_HEADER.size - 1
+    presets = (
+        SoundFontPreset(
+            bank=bank,
+            preset=preset,
+            name=raw_name.split(b'\0', 1)[0].decode('latin-1').strip(),
+        )
+        for raw_name, preset, bank, *_rest in PRESET_HEADER.iter_unpack(
+            data[: max(records, 0) * PRESET_HEADER.size]
+        )
+    )
+    return tuple(sorted(presets))
+
+
+@lru_cache(maxsize=PRESET_CACHE_SIZE)
+def _read_presets(
+    path: Path, _mtime_ns: int, _size: int
+) -> tuple[SoundFontPreset, ...]:
+    with (
+        path.open('rb') as source,
+        mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        if len(buffer) < RIFF_HEADER.size:
+            raise ValueError(f'Não é um SoundFont 2: {path}')
+        riff, riff_size, form = RIFF_HEADER.unpack_from(buffer)
+        if riff != b'RIFF' or form != b'sfbk':
+            raise ValueError(f'Não é um SoundFont 2: {path}')
+
+        # Os dados das amostras (`sdta`) são pulados sem serem lidos
+        end = min(len(buffer), CHUNK_HEADER.size + riff_size)
+        for chunk_id, data, size in _chunks(buffer, RIFF_HEADER.size, end):
+            if chunk_id != b'LIST' or buffer[data : data + 4] != b'pdta':
+                continue
+            for sub_id, sub_data, sub_size in _chunks(buffer, data + 4, data + size):
+                if sub_id == b'phdr':
+                    return _parse_preset_headers(buffer[sub_data : sub_data + sub_size])
+    raise ValueError(f'SoundFont sem cabeçalhos de preset: {path}')
+
+
+def read_presets(path: Path) -> tuple[SoundFontPreset, ...]:
+    """Lista os presets do SoundFont sem carregar as amostras.
+
+    Lê apenas os cabeçalhos `phdr` do chunk `pdta` através de um
+    mapeamento em memória. O resultado fica em cache por arquivo e é
+    invalidado quando o arquivo muda. Lança `OSError` ou `ValueError`
+    se o arquivo não puder ser lido como SoundFont 2.
+    """
+    stat = path.stat()
+    return _read_presets(path.resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+def preset_index(
+    presets: tuple[SoundFontPreset, ...],
+) -> NameIndex[PresetKey]:
+    return NameIndex((preset.key, preset.label) for preset in presets)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Final
+
+DEFAULT_LOOKAHEAD_SECONDS: Final[float] = 0.5
+
+
+class SchedulingMode(StrEnum):
+    """Como os comandos chegam ao sintetizador."""
+
+    PYTHON = 'python'  # Cada comando é disparado por uma espera em Python
+    SEQUENCER = 'sequencer'  # Comandos são agendados em lote no sequenciador
+
+
+@dataclass(frozen=True)
+class SynthSettings:
+    """Parâmetros do sintetizador que influenciam o áudio gerado."""
+
+    sample_rate: int = 44100
+    gain: float = 0.2
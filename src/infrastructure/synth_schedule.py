@@ -0,0 +1,126 @@
+import heapq
+from enum import IntEnum
+from typing import NamedTuple
+
+from domain.events import (
+    InstrumentEvent,
+    MusicalEvent,
+    NoteEvent,
+    SpecificNoteEvent,
+)
+from domain.models import PlaybackSettings
+from domain.tempo import TempoMap
+from infrastructure.channel_allocator import ChannelAllocator
+
+
+class SynthCommand(IntEnum):
+    """Comandos enviados ao sintetizador."""
+
+    NOTE_OFF = 0
+    PROGRAM = 1
+    NOTE_ON = 2
+    MARKER = 3
+
+
+class SynthMessage(NamedTuple):
+    """Comando de sintetizador com instante absoluto em segundos.
+
+    Em trocas de programa, `data1` é o preset e `data2` o banco.
+    """
+
+    seconds: float
+    command: SynthCommand
+    channel: int
+    data1: int = 0
+    data2: int = 0
+    source_index: int = 0
+    source_length: int = 0
+
+
+class SynthScheduler:
+    """Converte a lista de eventos em uma agenda de comandos em segundos.
+
+    A mesma agenda alimenta a reprodução em tempo real e a renderização
+    offline, garantindo que ambas soem iguais. Cada instrumento de cada voz
+    recebe seu próprio canal; um canal só troca de programa em silêncio, para
+    não mudar o timbre de notas que ainda soam.
+    """
+
+    def build(
+        self, events: list[MusicalEvent], settings: PlaybackSettings
+    ) -> list[SynthMessage]:
+        tempo_map = TempoMap(events, initial_bpm=settings.bpm)
+        event_seconds = tempo_map.seconds_column([event.time for event in events])
+
+        allocator = ChannelAllocator()
+        current_instruments = self._initial_instruments(events, settings)
+        timeline: list[SynthMessage] = []
+        note_offs: list[SynthMessage] = []
+
+        for event, start in zip(events, event_seconds.tolist(), strict=True):
+            timeline.append(
+                SynthMessage(
+                    start,
+                    SynthCommand.MARKER,
+                    0,
+                    source_index=event.source_index,
+                    source_length=event.source_length,
+                )
+            )
+
+            if isinstance(event, InstrumentEvent):
+                current_instruments[event.voice] = event.instrument_id
+                continue
+
+            if not isinstance(event, (NoteEvent, SpecificNoteEvent)):
+                continue
+
+            instrument_id = (
+                event.instrument_id
+                if isinstance(event, SpecificNoteEvent)
+                else current_instruments.get(event.voice, settings.instrument_id)
+            )
+            channel, needs_program_change = allocator.channel_for(
+                instrument_id, event.voice, start
+            )
+            if needs_program_change:
+                timeline.append(
+                    SynthMessage(
+                        start,
+                        SynthCommand.PROGRAM,
+                        channel,
+                        instrument_id,
+                        settings.bank,
+                    )
+                )
+
+            timeline.append(
+                SynthMessage(
+                    start, SynthCommand.NOTE_ON, channel, event.pitch, event.volume
+                )
+            )
+
+            end = start + tempo_map.duration_seconds(event.time, event.duration)
+            allocator.note_off(channel, end)
+            note_offs.append(
+                SynthMessage(end, SynthCommand.NOTE_OFF, channel, event.pitch)
+            )
+
+        note_offs.sort(key=lambda message: message.seconds)
+
+        # Em empates, os note-offs vêm antes para não cortar notas repetidas.
+        return list(
+            heapq.merge(note_offs, timeline, key=lambda message: message.seconds)
+        )
+
+    def _initial_instruments(
+        self, events: list[MusicalEvent], settings: PlaybackSettings
+    ) -> dict[int, int]:
+        """Primeiro instrumento de cada voz (ou o das configurações)."""
+        instruments: dict[int, int] = {0: settings.instrument_id}
+        seen: set[int] = set()
+        for event in events:
+            if isinstance(event, InstrumentEvent) and event.voice not in seen:
+                instruments[event.voice] = event.instrument_id
+                seen.add(event.voice)
+        return instruments
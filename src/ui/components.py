@@ -1,9 +1,19 @@
+import logging
 from pathlib import Path
 
 import gi
 
-from config import DEFAULT_SOUNDFONT, INSTRUMENTS
+from config import DEFAULT_SOUNDFONT
 from domain.models import PlaybackSettings
+from domain.name_index import NameIndex
+from domain.source_map import SourcePosition, SourceSpan
+from infrastructure.soundfont_presets import (
+    GENERAL_MIDI_PRESETS,
+    PresetKey,
+    SoundFontPreset,
+    preset_index,
+    read_presets,
+)
 
 gi.require_version(namespace='Gtk', version='4.0')
 gi.require_version(namespace='Adw', version='1')
@@ -13,6 +23,8 @@ from gi.repository import Adw, Gdk, GObject, Gtk, GtkSource
 
 GObject.type_ensure(GtkSource.View)
 
+logger = logging.getLogger(__name__)
+
 
 @Gtk.Template(filename='src/ui/blueprints/config_panel.ui')
 class ConfigPanel(Adw.PreferencesGroup):
@@ -34,20 +46,22 @@ class ConfigPanel(Adw.PreferencesGroup):
     def __init__(self) -> None:
         super().__init__()
 
-        self.current_instrument_id: int = 0
+        self.current_preset: PresetKey = GENERAL_MIDI_PRESETS[0].key
         self.current_soundfont_path: Path = DEFAULT_SOUNDFONT
+        self.preset_index: NameIndex[PresetKey] = preset_index(GENERAL_MIDI_PRESETS)
 
         self.soundfont_row.set_subtitle(subtitle=str(DEFAULT_SOUNDFONT))
         self._setup_instrument_list()
-        self._select_instrument_by_name(name=INSTRUMENTS[0][1])
+        self._load_presets(soundfont_path=DEFAULT_SOUNDFONT)
 
         self.row_instrument.connect('activated', self._on_open_instrument_popover)
         self.btn_soundfont.connect('clicked', self._on_select_soundfont)
         self.entry_search.connect('search-changed', self._on_instrument_search_changed)
 
     def _setup_instrument_list(self) -> None:
-        items: list[str] = [nome for _id, nome in INSTRUMENTS]
-        self.model_strings: Gtk.StringList = Gtk.StringList.new(strings=items)
+        self.model_strings: Gtk.StringList = Gtk.StringList.new(
+            strings=list(self.preset_index.names)
+        )
 
         self.filter_instrument: Gtk.StringFilter = Gtk.StringFilter()
         expression: Gtk.PropertyExpression = Gtk.PropertyExpression.new(
@@ -60,9 +74,6 @@ class ConfigPanel(Adw.PreferencesGroup):
         self.model_filter: Gtk.FilterListModel = Gtk.FilterListModel(
             model=self.model_strings, filter=self.filter_instrument
         )
-        _ = self.model_filter.connect(
-            'items-changed', self._on_instrument_filter_changed
-        )
 
         self.model_selection: Gtk.SingleSelection = Gtk.SingleSelection(
             model=self.model_filter
@@ -77,21 +88,28 @@ class ConfigPanel(Adw.PreferencesGroup):
         self.list_instrument.set_factory(factory=factory)
         self.list_instrument.connect('activate', self._on_instrument_list_activate)
 
-    def _on_instrument_filter_changed(
-        self, model: Gtk.FilterListModel, _pos: int, _rm: int, _add: int
-    ) -> None:
-        if model.get_n_items() == 0:
-            self.stack_instrument.set_visible_child_name(name='empty')
-        else:
-            self.stack_instrument.set_visible_child_name(name='list')
-
     def _on_open_instrument_popover(self, _row: Adw.ActionRow) -> None:
         self.entry_search.set_text(text='')
+        self._apply_instrument_search(query='')
+        position: int | None = self.preset_index.position_of(self.current_preset)
+        if position is not None:
+            self.model_selection.set_selected(position=position)
         self.popover_instrument.popup()
         _ = self.entry_search.grab_focus()
 
     def _on_instrument_search_changed(self, entry: Gtk.SearchEntry) -> None:
-        self.filter_instrument.set_search(search=entry.get_text())
+        self._apply_instrument_search(query=entry.get_text())
+
+    def _apply_instrument_search(self, query: str) -> None:
+        if query == (self.filter_instrument.get_search() or ''):
+            return
+
+        # O índice já sabe se há resultados; o filtro só atualiza a lista
+        has_matches: bool = bool(self.preset_index.search(query))
+        self.stack_instrument.set_visible_child_name(
+            name='list' if has_matches else 'empty'
+        )
+        self.filter_instrument.set_search(search=query)
 
     def _on_instrument_list_setup(
         self, _factory: Gtk.SignalListItemFactory, item: Gtk.ListItem
@@ -114,17 +132,45 @@ class ConfigPanel(Adw.PreferencesGroup):
     ) -> None:
         obj: GObject.Object | None = self.model_filter.get_item(position)
         if isinstance(obj, Gtk.StringObject):
-            name: str = obj.get_string()
-            self._select_instrument_by_name(name)
+            key: PresetKey | None = self.preset_index.key_of(obj.get_string())
+            if key is not None:
+                self._select_preset(key=key)
             self.popover_instrument.popdown()
 
-    def _select_instrument_by_name(self, name: str) -> None:
-        self.lbl_instrument_selected.set_label(str=name)
-        for inst_id, inst_name in INSTRUMENTS:
-            if inst_name == name:
-                self.current_instrument_id = inst_id
+    def _load_presets(self, soundfont_path: Path) -> None:
+        """Troca a lista pelos presets reais do SoundFont (ou pelos do GM).
+
+        Só os cabeçalhos são lidos; as amostras ficam para a reprodução.
+        """
+        presets: tuple[SoundFontPreset, ...]
+        try:
+            presets = read_presets(soundfont_path) or GENERAL_MIDI_PRESETS
+        except (OSError, ValueError) as error:
+            logger.warning('Presets indisponíveis em %s: %s', soundfont_path, error)
+            presets = GENERAL_MIDI_PRESETS
+
+        self.preset_index = preset_index(presets)
+        self.filter_instrument.set_search(search='')
+        self.model_strings.splice(
+            position=0,
+            n_removals=self.model_strings.get_n_items(),
+            additions=list(self.preset_index.names),
+        )
+
+        # Mantém o preset atual se o novo SoundFont o tiver
+        _bank, program = self.current_preset
+        for key in (self.current_preset, (0, program), self.preset_index.keys[0]):
+            if self._select_preset(key=key):
                 break
 
+    def _select_preset(self, key: PresetKey) -> bool:
+        label: str | None = self.preset_index.name_of(key)
+        if label is None:
+            return False
+        self.lbl_instrument_selected.set_label(str=label)
+        self.current_preset = key
+        return True
+
     def _on_select_soundfont(self, btn: Gtk.Button) -> None:
         root: Gtk.Root | None = btn.get_root()
         window: Gtk.Window | None = root if isinstance(root, Gtk.Window) else None
@@ -157,6 +203,7 @@ class ConfigPanel(Adw.PreferencesGroup):
                 self.soundfont_row.set_subtitle(
                     subtitle=str(self.current_soundfont_path)
                 )
+                self._load_presets(soundfont_path=self.current_soundfont_path)
         dialog.destroy()
 
     def get_playback_settings(self) -> PlaybackSettings:
@@ -164,7 +211,8 @@ class ConfigPanel(Adw.PreferencesGroup):
             bpm=int(self.spin_bpm.get_value()),
             volume=int(self.spin_volume.get_value()),
             octave=int(self.spin_octave.get_value()),
-            instrument_id=self.current_instrument_id,
+            bank=self.current_preset[0],
+            instrument_id=self.current_preset[1],
         )
 
     def set_volume(self, volume: int) -> None:
@@ -178,11 +226,8 @@ class ConfigPanel(Adw.PreferencesGroup):
         self.spin_bpm.set_value(value=safe_bpm)
 
     def set_instrument(self, instrument_id: int) -> None:
-        instrument_name: str | None = next(
-            (nome for _id, nome in INSTRUMENTS if _id == instrument_id), None
-        )
-        if instrument_name:
-            self._select_instrument_by_name(name=instrument_name)
+        """Seleciona um programa General MIDI (banco 0), como os da importação."""
+        self._select_preset(key=(0, instrument_id))
 
     def get_soundfont_path(self) -> Path:
         return self.current_soundfont_path
@@ -207,6 +252,15 @@ class TextEditor(Adw.PreferencesGroup):
         )
         self.highlight_tag.set_property('foreground', None)
 
+        # Marcas sobrevivem às mudanças do buffer e delimitam o destaque atual
+        start_iter = self.buffer.get_start_iter()
+        self.highlight_start: Gtk.TextMark = self.buffer.create_mark(
+            None, start_iter, True
+        )
+        self.highlight_end: Gtk.TextMark = self.buffer.create_mark(
+            None, start_iter, False
+        )
+
         self.style_manager: Adw.StyleManager = Adw.StyleManager.get_default()
         _ = self.style_manager.connect('notify::dark', self._on_theme_changed)
         self._update_theme()
@@ -253,24 +307,46 @@ class TextEditor(Adw.PreferencesGroup):
     def set_text(self, text: str) -> None:
         self.buffer.set_text(text)
 
-    def highlight_range(self, index: int, length: int) -> None:
-        if length <= 0:
-            return
+    def highlight_span(self, span: SourceSpan) -> None:
+        """Destaca o trecho e rola a tela só se ele sair da área visível.
 
-        start_iter: Gtk.TextIter = self.buffer.get_iter_at_offset(char_offset=index)
-        end_iter: Gtk.TextIter = self.buffer.get_iter_at_offset(
-            char_offset=index + length
-        )
+        As posições chegam em linha e coluna, e apenas o trecho destacado
+        anteriormente perde a marcação, então o custo não cresce com o buffer.
+        """
+        start_iter = self._iter_at(span.start)
+        end_iter = self._iter_at(span.end)
 
         self.buffer.remove_tag(
             tag=self.highlight_tag,
-            start=self.buffer.get_start_iter(),
-            end=self.buffer.get_end_iter(),
+            start=self.buffer.get_iter_at_mark(self.highlight_start),
+            end=self.buffer.get_iter_at_mark(self.highlight_end),
         )
         self.buffer.apply_tag(tag=self.highlight_tag, start=start_iter, end=end_iter)
-
-        _ = self.textview.scroll_to_iter(
-            iter=start_iter, within_margin=0.0, use_align=False, xalign=0.0, yalign=0.0
+        self.buffer.move_mark(self.highlight_start, start_iter)
+        self.buffer.move_mark(self.highlight_end, end_iter)
+
+        if not self._is_visible(start_iter):
+            self.textview.scroll_to_mark(
+                mark=self.highlight_start,
+                within_margin=0.0,
+                use_align=False,
+                xalign=0.0,
+                yalign=0.0,
+            )
+
+    def _iter_at(self, position: SourcePosition) -> Gtk.TextIter:
+        _found, text_iter = self.buffer.get_iter_at_line_offset(
+            line_number=position.line, char_offset=position.column
+        )
+        return text_iter
+
+    def _is_visible(self, text_iter: Gtk.TextIter) -> bool:
+        visible: Gdk.Rectangle = self.textview.get_visible_rect()
+        location: Gdk.Rectangle = self.textview.get_iter_location(iter=text_iter)
+        return (
+            visible.y <= location.y
+            and location.y + location.height <= visible.y + visible.height
+            and visible.x <= location.x <= visible.x + visible.width
         )
 
     def set_editable(self, editable: bool) -> None:
@@ -286,6 +362,7 @@ class EditorPage(Adw.PreferencesPage):
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
+        self.source_path: Path | None = None
 
     def get_text(self) -> str:
         return self.text_editor.get_text()
@@ -3,8 +3,18 @@ from typing import cast, override
 
 import gi
 
-from application.controller import MusicController
+from application.controller import MixTrack, MusicController
+from config import (
+    COMPILED_SCORE_DIR,
+    MIDI_OUTPUT_PORT,
+    RENDER_CACHE_DIR,
+    RENDER_CACHE_ENABLED,
+    RENDER_CACHE_MAX_BYTES,
+)
+from domain.mml_blocks import ExpansionLimitError
 from domain.parser import ParsingMode
+from infrastructure.audio_cache import RenderCache
+from infrastructure.playback_metrics import PlaybackMetrics
 from ui.components import EditorPage
 
 gi.require_version(namespace='Gtk', version='4.0')
@@ -28,7 +38,18 @@ class MainWindow(Adw.ApplicationWindow):
     def __init__(self, app: Adw.Application) -> None:
         super().__init__(application=app)
 
-        self.controller: MusicController = MusicController()
+        self.controller: MusicController = MusicController(
+            render_cache=(
+                RenderCache(
+                    directory=RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MAX_BYTES
+                )
+                if RENDER_CACHE_ENABLED
+                else None
+            ),
+            metrics=PlaybackMetrics.from_environment(),
+            midi_output_port=MIDI_OUTPUT_PORT,
+            compiled_score_dir=COMPILED_SCORE_DIR,
+        )
 
         self.page_standard.text_editor.set_language_id('standard')
         self.page_standard.text_editor.set_text('BPM+ A B C D \n ?')
@@ -40,6 +61,7 @@ class MainWindow(Adw.ApplicationWindow):
         self._add_action(name='import_midi', callback=self._on_import_midi_clicked)
         self._add_action(name='save_txt', callback=self._on_save_txt_clicked)
         self._add_action(name='save_midi', callback=self._on_save_midi_clicked)
+        self._add_action(name='play_all', callback=self._on_play_all_clicked)
 
         self.btn_play.connect('clicked', self._on_play_clicked)
         self.btn_stop.connect('clicked', self._on_stop_clicked)
@@ -64,25 +86,62 @@ class MainWindow(Adw.ApplicationWindow):
         page: EditorPage = self._get_active_page()
         mode: ParsingMode = self._get_active_mode()
 
-        self.controller.play_music(
-            text=page.get_text(),
-            settings=page.get_settings(),
-            mode=mode,
-            soundfont_path=page.get_soundfont_path(),
-            on_finished_callback=self._on_playback_finished,
-            on_progress_callback=page.text_editor.highlight_range,
-        )
+        try:
+            self.controller.play_music(
+                text=page.get_text(),
+                settings=page.get_settings(),
+                mode=mode,
+                soundfont_path=page.get_soundfont_path(),
+                on_finished_callback=self._on_playback_finished,
+                on_progress_callback=page.text_editor.highlight_span,
+                source_path=page.source_path,
+            )
+        except ExpansionLimitError as error:
+            self._show_toast(message=str(error))
+            return
         self.btn_play.set_sensitive(sensitive=False)
         self.btn_stop.set_sensitive(sensitive=True)
         page.text_editor.set_editable(editable=False)
 
+    def _on_play_all_clicked(
+        self, _action: Gio.SimpleAction, _param: GLib.Variant
+    ) -> None:
+        """Toca as abas Padrão e MML juntas, cada uma em seus canais."""
+        pages: list[tuple[EditorPage, ParsingMode]] = [
+            (self.page_standard, ParsingMode.STANDARD),
+            (self.page_mml, ParsingMode.MML),
+        ]
+        try:
+            self.controller.play_mix(
+                tracks=[
+                    MixTrack(
+                        text=page.get_text(),
+                        settings=page.get_settings(),
+                        mode=mode,
+                        on_progress_callback=page.text_editor.highlight_span,
+                        source_path=page.source_path,
+                    )
+                    for page, mode in pages
+                ],
+                soundfont_path=self._get_active_page().get_soundfont_path(),
+                on_finished_callback=self._on_playback_finished,
+            )
+        except ExpansionLimitError as error:
+            self._show_toast(message=str(error))
+            return
+        self.btn_play.set_sensitive(sensitive=False)
+        self.btn_stop.set_sensitive(sensitive=True)
+        for page, _mode in pages:
+            page.text_editor.set_editable(editable=False)
+
     def _on_stop_clicked(self, _widget: Gtk.Button) -> None:
         self.controller.stop_music()
 
     def _on_playback_finished(self) -> None:
         self.btn_play.set_sensitive(sensitive=True)
         self.btn_stop.set_sensitive(sensitive=False)
-        self._get_active_page().text_editor.set_editable(editable=True)
+        for page in (self.page_standard, self.page_mml):
+            page.text_editor.set_editable(editable=True)
 
     def _run_file_dialog(
         self, title: str, action, filter_name: str, filter_pattern: str, callback
@@ -131,7 +190,9 @@ class MainWindow(Adw.ApplicationWindow):
         ):
             file_path = Path(path)
             content = file_path.read_text(encoding='utf-8')
-            self._get_active_page().text_editor.set_text(text=content)
+            page: EditorPage = self._get_active_page()
+            page.text_editor.set_text(text=content)
+            page.source_path = file_path
             self._show_toast(message=f'Carregado: {file_path.name}')
         dialog.destroy()
 
@@ -160,6 +221,7 @@ class MainWindow(Adw.ApplicationWindow):
             page: EditorPage = self.page_mml
 
             page.text_editor.set_text(text=text)
+            page.source_path = None
             page.config_panel.set_instrument(instrument_id=inst)
             page.config_panel.set_volume(volume=vol)
             page.config_panel.set_bpm(bpm=bpm)
@@ -187,7 +249,16 @@ class MainWindow(Adw.ApplicationWindow):
             and (path := file.get_path())
         ):
             file_path = Path(path)
-            file_path.write_text(self._get_active_page().get_text(), encoding='utf-8')
+            page: EditorPage = self._get_active_page()
+            text = page.get_text()
+            file_path.write_text(text, encoding='utf-8')
+            page.source_path = file_path
+            self.controller.compile_score(
+                text=text,
+                settings=page.get_settings(),
+                mode=self._get_active_mode(),
+                source_path=file_path,
+            )
             self._show_toast(message='Texto salvo.')
         dialog.destroy()
 
@@ -215,13 +286,17 @@ class MainWindow(Adw.ApplicationWindow):
                 file_path = file_path.with_suffix(suffix='.mid')
 
             page: EditorPage = self._get_active_page()
-            self.controller.export_midi(
-                text=page.get_text(),
-                settings=page.get_settings(),
-                mode=self._get_active_mode(),
-                file_path=file_path,
-            )
-            self._show_toast(message='MIDI exportado.')
+            try:
+                self.controller.export_midi(
+                    text=page.get_text(),
+                    settings=page.get_settings(),
+                    mode=self._get_active_mode(),
+                    file_path=file_path,
+                    source_path=page.source_path,
+                )
+                self._show_toast(message='MIDI exportado.')
+            except ExpansionLimitError as error:
+                self._show_toast(message=str(error))
         dialog.destroy()
 
     def _show_toast(self, message: str) -> None:
@@ -238,8 +313,14 @@ class Application(Adw.Application):
     def do_activate(self) -> None:
         if not self.window:
             self.window = MainWindow(app=self)
+            GLib.idle_add(self._warm_up_backends)
         self.window.present()
 
+    def _warm_up_backends(self) -> bool:
+        if self.window:
+            self.window.controller.warm_up()
+        return GLib.SOURCE_REMOVE
+
     @override
     def do_shutdown(self) -> None:
         if self.window and self.window.controller: